@@ -4,16 +4,25 @@ database used under the QCoDeS dataset.
 """
 import shutil
 import tempfile
+import multiprocessing
 import os
 import time
 
 import numpy as np
 
 import qcodes
-from qcodes import ManualParameter
+from qcodes import ManualParameter, load_by_id, load_many, run_catalogue
+from qcodes.dataset.database_extract_runs import extract_runs_into_db
 from qcodes.dataset.measurements import Measurement
-from qcodes.dataset.experiment_container import new_experiment
-from qcodes.dataset.sqlite.database import initialise_database
+from qcodes.dataset.experiment_container import (load_experiment,
+                                                 new_experiment)
+from qcodes.dataset.sqlite.connection import atomic_transaction
+from qcodes.dataset.sqlite.database import (_adapt_array, _convert_array,
+                                            _encode_array_npy, connect,
+                                            connection_pool,
+                                            initialise_database)
+from qcodes.dataset.sqlite.query_helpers import (insert_many_columns,
+                                                 insert_many_values)
 
 
 class Adding5Params:
@@ -41,6 +50,11 @@ class Adding5Params:
         {'n_values': 100, 'n_times': 200, 'paramtype': 'array'},
         {'n_values': 10000, 'n_times': 2, 'paramtype': 'numeric'},
         {'n_values': 100, 'n_times': 200, 'paramtype': 'numeric'},
+        {'n_values': 1000000, 'n_times': 1, 'paramtype': 'numeric'},
+        {'n_values': 10000, 'n_times': 20, 'paramtype': 'numeric',
+         'write_in_background': True},
+        {'n_values': 10000, 'n_times': 20, 'paramtype': 'numeric',
+         'write_in_background': 'process'},
     ]
     # we are less interested in the cpu time used and more interested in
     # the wall clock time used to insert the data so use a timer that measures
@@ -87,7 +101,8 @@ class Adding5Params:
         self.parameters = [x1, x2, x3, y1, y2]
 
         # Create the Runner context manager
-        self.runner = meas.run()
+        self.runner = meas.run(
+            write_in_background=bench_param.get('write_in_background', False))
 
         # Enter Runner and create DataSaver
         self.datasaver = self.runner.__enter__()
@@ -129,3 +144,1356 @@ class Adding5Params:
         # force writing to database so that it is written before we exit
         # the datasaver context manager
         self.datasaver.flush_data_to_database()
+
+
+class InsertManyRowsVsColumns:
+    """
+    This benchmark compares inserting data into a results table row-wise
+    with :func:`insert_many_values` to inserting the same data column-wise
+    with :func:`insert_many_columns`.
+    """
+
+    number = 1
+    repeat = 8
+
+    params = [
+        {'n_values': 10000, 'n_columns': 5},
+        {'n_values': 1000000, 'n_columns': 5},
+    ]
+    timer = time.perf_counter
+
+    def __init__(self):
+        self.columns = list()
+        self.rows = list()
+        self.names = list()
+        self.conn = None
+        self.tmpdir = None
+
+    def setup(self, bench_param):
+        self.tmpdir = tempfile.mkdtemp()
+        self.conn = connect(os.path.join(self.tmpdir, 'temp.db'))
+
+        self.names = [f'x{i}' for i in range(bench_param['n_columns'])]
+        column_defs = ','.join(f'{name} numeric' for name in self.names)
+        atomic_transaction(self.conn,
+                           f'CREATE TABLE "results" ('
+                           f'id INTEGER PRIMARY KEY, {column_defs})')
+
+        self.columns = [np.random.rand(bench_param['n_values'])
+                        for _ in self.names]
+        self.rows = [list(row) for row in zip(*self.columns)]
+
+    def teardown(self, bench_param):
+        if self.conn:
+            self.conn.close()
+            self.conn = None
+
+        if self.tmpdir:
+            shutil.rmtree(self.tmpdir)
+            self.tmpdir = None
+
+        self.columns = list()
+        self.rows = list()
+
+    def time_insert_many_values(self, bench_param):
+        """Inserting data given as rows"""
+        insert_many_values(self.conn, 'results', self.names, self.rows)
+
+    def time_insert_many_columns(self, bench_param):
+        """Inserting data given as columns"""
+        insert_many_columns(self.conn, 'results', self.names, self.columns)
+
+
+class ConvertArrayCells:
+    """
+    This benchmark measures how much time it takes to decode array cells as
+    read from the database, comparing the compact array format to the .npy
+    format written by older versions of QCoDeS.
+    """
+
+    params = [100, 10000]
+    param_names = ['n_points']
+
+    def setup(self, n_points):
+        spectra = [np.random.rand(n_points) for _ in range(1000)]
+        self.blobs = [bytes(_adapt_array(spectrum)) for spectrum in spectra]
+        self.npy_blobs = [_encode_array_npy(spectrum) for spectrum in spectra]
+
+    def time_convert_array(self, n_points):
+        for blob in self.blobs:
+            _convert_array(blob)
+
+    def time_convert_npy_array(self, n_points):
+        for blob in self.npy_blobs:
+            _convert_array(blob)
+
+
+class InsertStrategies:
+    """
+    This benchmark compares the strategies for inserting many rows of
+    values into a results table: multi-row INSERT statements ('values')
+    and executing a prepared single-row INSERT statement for every row
+    ('executemany').
+    """
+
+    number = 1
+    repeat = 8
+
+    params = [[5, 50], ['values', 'executemany']]
+    param_names = ['n_columns', 'strategy']
+    timer = time.perf_counter
+
+    n_values = 100000
+
+    def __init__(self):
+        self.columns = list()
+        self.rows = list()
+        self.names = list()
+        self.conn = None
+        self.tmpdir = None
+
+    def setup(self, n_columns, strategy):
+        self.tmpdir = tempfile.mkdtemp()
+        self.conn = connect(os.path.join(self.tmpdir, 'temp.db'))
+
+        self.names = [f'x{i}' for i in range(n_columns)]
+        column_defs = ','.join(f'{name} numeric' for name in self.names)
+        atomic_transaction(self.conn,
+                           f'CREATE TABLE "results" ('
+                           f'id INTEGER PRIMARY KEY, {column_defs})')
+
+        self.columns = [np.random.rand(self.n_values) for _ in self.names]
+        self.rows = [list(row) for row in zip(*self.columns)]
+
+    def teardown(self, n_columns, strategy):
+        if self.conn:
+            self.conn.close()
+            self.conn = None
+
+        if self.tmpdir:
+            shutil.rmtree(self.tmpdir)
+            self.tmpdir = None
+
+        self.columns = list()
+        self.rows = list()
+
+    def time_insert_rows(self, n_columns, strategy):
+        """Inserting data given as rows"""
+        insert_many_values(self.conn, 'results', self.names, self.rows,
+                           strategy=strategy)
+
+    def time_insert_columns(self, n_columns, strategy):
+        """Inserting data given as columns"""
+        insert_many_columns(self.conn, 'results', self.names, self.columns,
+                            strategy=strategy)
+
+
+class AddResultOverhead:
+    """
+    This benchmark measures the per-call overhead of adding single points
+    of data with ``DataSaver.add_result`` compared to an appender prepared
+    with ``DataSaver.prepare``. The data is only written to the database
+    after the timed loop.
+    """
+
+    number = 1
+    repeat = 8
+
+    params = [1000, 10000]
+    param_names = ['n_points']
+    timer = time.perf_counter
+
+    def __init__(self):
+        self.parameters = list()
+        self.experiment = None
+        self.runner = None
+        self.datasaver = None
+        self.tmpdir = None
+
+    def setup(self, n_points):
+        self.tmpdir = tempfile.mkdtemp()
+        qcodes.config["core"]["db_location"] = os.path.join(self.tmpdir,
+                                                            'temp.db')
+        qcodes.config["core"]["db_debug"] = False
+        initialise_database()
+
+        self.experiment = new_experiment("test-experiment",
+                                         sample_name="test-sample")
+
+        meas = Measurement(self.experiment)
+        meas.write_period = 1e6
+
+        x = ManualParameter('x')
+        y = ManualParameter('y')
+        z = ManualParameter('z')
+
+        meas.register_parameter(x)
+        meas.register_parameter(y, setpoints=[x])
+        meas.register_parameter(z, setpoints=[x])
+
+        self.parameters = [x, y, z]
+
+        self.runner = meas.run()
+        self.datasaver = self.runner.__enter__()
+
+    def teardown(self, n_points):
+        if self.runner:
+            self.runner.__exit__(None, None, None)
+            self.runner = None
+            self.datasaver = None
+
+        if self.experiment:
+            self.experiment.conn.close()
+            self.experiment = None
+
+        if self.tmpdir:
+            shutil.rmtree(self.tmpdir)
+            self.tmpdir = None
+
+        self.parameters = list()
+
+    def time_add_result(self, n_points):
+        """Adding single points with add_result"""
+        x, y, z = self.parameters
+        for i in range(n_points):
+            self.datasaver.add_result((x, i), (y, 2.0 * i), (z, 3.0 * i))
+
+    def time_prepared_appender(self, n_points):
+        """Adding single points with a prepared appender"""
+        append = self.datasaver.prepare(*self.parameters)
+        for i in range(n_points):
+            append(i, 2.0 * i, 3.0 * i)
+
+
+class FlushShapedResults:
+    """
+    This benchmark measures flushing single points of data to the database
+    with and without the shape of the measurement being known. If the shape
+    is known, the points are collected in pre-allocated buffers and flushed
+    as columns rather than as one dict per point.
+    """
+
+    number = 1
+    repeat = 8
+
+    params = [[10000, 100000], [False, True]]
+    param_names = ['n_points', 'shaped']
+    timer = time.perf_counter
+
+    def __init__(self):
+        self.experiment = None
+        self.runner = None
+        self.datasaver = None
+        self.tmpdir = None
+
+    def setup(self, n_points, shaped):
+        self.tmpdir = tempfile.mkdtemp()
+        qcodes.config["core"]["db_location"] = os.path.join(self.tmpdir,
+                                                            'temp.db')
+        qcodes.config["core"]["db_debug"] = False
+        initialise_database()
+
+        self.experiment = new_experiment("test-experiment",
+                                         sample_name="test-sample")
+
+        meas = Measurement(self.experiment)
+        meas.write_period = 1e6
+
+        x = ManualParameter('x')
+        y = ManualParameter('y')
+
+        meas.register_parameter(x)
+        meas.register_parameter(y, setpoints=[x])
+        if shaped:
+            meas.set_shapes({'y': (n_points,)})
+
+        self.runner = meas.run()
+        self.datasaver = self.runner.__enter__()
+        append = self.datasaver.prepare(x, y)
+        for i in range(n_points):
+            append(i, 2.0 * i)
+
+    def teardown(self, n_points, shaped):
+        if self.runner:
+            self.runner.__exit__(None, None, None)
+            self.runner = None
+            self.datasaver = None
+
+        if self.experiment:
+            self.experiment.conn.close()
+            self.experiment = None
+
+        if self.tmpdir:
+            shutil.rmtree(self.tmpdir)
+            self.tmpdir = None
+
+    def time_flush(self, n_points, shaped):
+        """Flushing the points to the database"""
+        self.datasaver.flush_data_to_database()
+
+
+class AddStandaloneArrays:
+    """
+    This benchmark measures adding an array of values for a standalone
+    parameter with ``DataSaver.add_result`` and writing it to the database.
+    """
+
+    number = 1
+    repeat = 8
+
+    params = [['numeric', 'complex', 'text'], [1000, 100000]]
+    param_names = ['paramtype', 'n_values']
+    timer = time.perf_counter
+
+    def __init__(self):
+        self.values = None
+        self.experiment = None
+        self.runner = None
+        self.datasaver = None
+        self.tmpdir = None
+
+    def setup(self, paramtype, n_values):
+        self.tmpdir = tempfile.mkdtemp()
+        qcodes.config["core"]["db_location"] = os.path.join(self.tmpdir,
+                                                            'temp.db')
+        qcodes.config["core"]["db_debug"] = False
+        initialise_database()
+
+        self.experiment = new_experiment("test-experiment",
+                                         sample_name="test-sample")
+
+        meas = Measurement(self.experiment)
+        meas.register_custom_parameter('standalone', paramtype=paramtype)
+
+        values = np.random.rand(n_values)
+        if paramtype == 'complex':
+            values = values + 1j * values
+        elif paramtype == 'text':
+            values = values.astype(str)
+        self.values = values
+
+        self.runner = meas.run()
+        self.datasaver = self.runner.__enter__()
+
+    def teardown(self, paramtype, n_values):
+        if self.runner:
+            self.runner.__exit__(None, None, None)
+            self.runner = None
+            self.datasaver = None
+
+        if self.experiment:
+            self.experiment.conn.close()
+            self.experiment = None
+
+        if self.tmpdir:
+            shutil.rmtree(self.tmpdir)
+            self.tmpdir = None
+
+        self.values = None
+
+    def time_add_and_flush(self, paramtype, n_values):
+        """Adding the array of values and writing it to the database"""
+        self.datasaver.add_result(('standalone', self.values))
+        self.datasaver.flush_data_to_database()
+
+
+class CompressedArrays:
+    """
+    This benchmark compares the codecs that parameters of type 'array' can
+    be stored with in terms of the size of the database file and the time
+    it takes to write and read the data.
+    """
+
+    number = 1
+    repeat = 4
+
+    params = [[None, 'zlib', 'shuffle+zlib', 'delta+shuffle+zlib', 'lzma']]
+    param_names = ['codec']
+    timer = time.perf_counter
+
+    n_spectra = 100
+    spectrum_size = 10000
+
+    def __init__(self):
+        self.spectra = None
+        self.experiment = None
+        self.dataset = None
+        self.tmpdir = None
+
+    def setup(self, codec):
+        self.tmpdir = tempfile.mkdtemp()
+        qcodes.config["core"]["db_location"] = os.path.join(self.tmpdir,
+                                                            'temp.db')
+        qcodes.config["core"]["db_debug"] = False
+        initialise_database()
+
+        self.experiment = new_experiment("test-experiment",
+                                         sample_name="test-sample")
+
+        # spectra as measured with a 14 bit digitizer
+        freqs = np.linspace(0, 50, self.spectrum_size)
+        self.spectra = [
+            np.round(4000 * np.sinc(freqs - 25 + i / self.n_spectra)
+                     + np.random.normal(0, 10, self.spectrum_size))
+            for i in range(self.n_spectra)]
+
+        self.dataset = self._write(codec)
+
+    def teardown(self, codec):
+        if self.experiment:
+            self.experiment.conn.close()
+            self.experiment = None
+
+        if self.tmpdir:
+            shutil.rmtree(self.tmpdir)
+            self.tmpdir = None
+
+        self.dataset = None
+        self.spectra = None
+
+    def _write(self, codec):
+        meas = Measurement(self.experiment)
+        meas.register_custom_parameter('spectrum', paramtype='array',
+                                       codec=codec)
+        with meas.run() as datasaver:
+            for spectrum in self.spectra:
+                datasaver.add_result(('spectrum', spectrum))
+        return datasaver.dataset
+
+    def time_write(self, codec):
+        """Writing the spectra to the database"""
+        self._write(codec)
+
+    def time_read(self, codec):
+        """Reading the spectra from the database"""
+        self.dataset.get_parameter_data()
+
+    def track_size(self, codec):
+        """The number of bytes the spectra take up in the database"""
+        return atomic_transaction(
+            self.dataset.conn,
+            f'SELECT sum(length(spectrum)) FROM "{self.dataset.table_name}"'
+        ).fetchone()[0]
+
+    track_size.unit = 'bytes'
+
+
+class LiveCachePolling:
+    """
+    This benchmark emulates live plotting of a run without a known shape:
+    a number of points is added and flushed to the database before the
+    cache of the dataset is polled for new data, 1000 times in a row.
+    """
+
+    number = 1
+    repeat = 4
+
+    params = [[10, 100]]
+    param_names = ['points_per_poll']
+    timer = time.perf_counter
+
+    n_polls = 1000
+
+    def __init__(self):
+        self.experiment = None
+        self.runner = None
+        self.datasaver = None
+        self.tmpdir = None
+
+    def setup(self, points_per_poll):
+        self.tmpdir = tempfile.mkdtemp()
+        qcodes.config["core"]["db_location"] = os.path.join(self.tmpdir,
+                                                            'temp.db')
+        qcodes.config["core"]["db_debug"] = False
+        initialise_database()
+
+        self.experiment = new_experiment("test-experiment",
+                                         sample_name="test-sample")
+
+        meas = Measurement(self.experiment)
+        meas.register_custom_parameter('x')
+        meas.register_custom_parameter('y', setpoints=('x',))
+
+        self.runner = meas.run()
+        self.datasaver = self.runner.__enter__()
+
+    def teardown(self, points_per_poll):
+        if self.runner:
+            self.runner.__exit__(None, None, None)
+            self.runner = None
+            self.datasaver = None
+
+        if self.experiment:
+            self.experiment.conn.close()
+            self.experiment = None
+
+        if self.tmpdir:
+            shutil.rmtree(self.tmpdir)
+            self.tmpdir = None
+
+    def _poll_session(self, points_per_poll):
+        x = np.arange(points_per_poll)
+        for i in range(self.n_polls):
+            self.datasaver.add_result(('x', x), ('y', x + i))
+            self.datasaver.flush_data_to_database()
+            self.datasaver.dataset.cache.data()
+
+    def time_poll_session(self, points_per_poll):
+        """Adding, flushing and polling the points"""
+        self._poll_session(points_per_poll)
+
+    def peakmem_poll_session(self, points_per_poll):
+        """Adding, flushing and polling the points"""
+        self._poll_session(points_per_poll)
+
+
+class GetParameterData:
+    """
+    This benchmark measures loading the data of a parameter tree of
+    scalar parameters with ``DataSet.get_parameter_data``.
+    """
+
+    number = 1
+    repeat = 4
+
+    params = [['numeric', 'complex', 'text'], [10000, 1000000]]
+    param_names = ['paramtype', 'n_rows']
+    timer = time.perf_counter
+
+    def __init__(self):
+        self.experiment = None
+        self.dataset = None
+        self.tmpdir = None
+
+    def setup(self, paramtype, n_rows):
+        self.tmpdir = tempfile.mkdtemp()
+        qcodes.config["core"]["db_location"] = os.path.join(self.tmpdir,
+                                                            'temp.db')
+        qcodes.config["core"]["db_debug"] = False
+        initialise_database()
+
+        self.experiment = new_experiment("test-experiment",
+                                         sample_name="test-sample")
+
+        meas = Measurement(self.experiment)
+        meas.register_custom_parameter('x')
+        meas.register_custom_parameter('y', paramtype=paramtype,
+                                       setpoints=('x',))
+
+        x = np.random.rand(n_rows)
+        y = x
+        if paramtype == 'complex':
+            y = x + 1j * x
+        elif paramtype == 'text':
+            y = x.astype(str)
+
+        with meas.run() as datasaver:
+            datasaver.add_result(('x', x), ('y', y))
+        self.dataset = datasaver.dataset
+
+    def teardown(self, paramtype, n_rows):
+        if self.experiment:
+            self.experiment.conn.close()
+            self.experiment = None
+
+        if self.tmpdir:
+            shutil.rmtree(self.tmpdir)
+            self.tmpdir = None
+
+        self.dataset = None
+
+    def time_get_parameter_data(self, paramtype, n_rows):
+        """Loading the data of the parameter tree"""
+        self.dataset.get_parameter_data()
+
+
+class GetArrayParameterData:
+    """
+    This benchmark measures loading the data of a parameter tree of an
+    array parameter with an array setpoint and three scalar setpoints, as
+    stored for ArrayParameters and ParameterWithSetpoints, with
+    ``DataSet.get_parameter_data``.
+    """
+
+    number = 1
+    repeat = 4
+
+    params = [10000, 100000]
+    param_names = ['n_rows']
+    timer = time.perf_counter
+
+    array_length = 10
+
+    def __init__(self):
+        self.experiment = None
+        self.dataset = None
+        self.tmpdir = None
+
+    def setup(self, n_rows):
+        self.tmpdir = tempfile.mkdtemp()
+        qcodes.config["core"]["db_location"] = os.path.join(self.tmpdir,
+                                                            'temp.db')
+        qcodes.config["core"]["db_debug"] = False
+        initialise_database()
+
+        self.experiment = new_experiment("test-experiment",
+                                         sample_name="test-sample")
+
+        meas = Measurement(self.experiment)
+        meas.register_custom_parameter('x')
+        meas.register_custom_parameter('label', paramtype='text')
+        meas.register_custom_parameter('phase', paramtype='complex')
+        meas.register_custom_parameter('f', paramtype='array')
+        meas.register_custom_parameter(
+            'spectrum', paramtype='array',
+            setpoints=('x', 'label', 'phase', 'f'))
+
+        f = np.arange(self.array_length, dtype=float)
+        results = [{'x': float(i), 'label': f'label {i % 10}',
+                    'phase': complex(i, 1), 'f': f,
+                    'spectrum': np.random.rand(self.array_length)}
+                   for i in range(n_rows)]
+        with meas.run() as datasaver:
+            datasaver.dataset.add_results(results)
+        self.dataset = datasaver.dataset
+
+    def teardown(self, n_rows):
+        if self.experiment:
+            self.experiment.conn.close()
+            self.experiment = None
+
+        if self.tmpdir:
+            shutil.rmtree(self.tmpdir)
+            self.tmpdir = None
+
+        self.dataset = None
+
+    def time_get_parameter_data(self, n_rows):
+        """Loading the data of the parameter tree"""
+        self.dataset.get_parameter_data()
+
+
+class GetZoomedParameterData:
+    """
+    This benchmark measures loading a window of a large 2D map with
+    ``DataSet.get_parameter_data`` by ranges of the setpoints, with and
+    without an index on the outer setpoint, and loading a decimated map.
+    """
+
+    number = 1
+    repeat = 4
+
+    params = [[False, True]]
+    param_names = ['with_index']
+    timer = time.perf_counter
+
+    n_x = 1000
+    n_y = 1000
+
+    def __init__(self):
+        self.experiment = None
+        self.dataset = None
+        self.tmpdir = None
+
+    def setup(self, with_index):
+        self.tmpdir = tempfile.mkdtemp()
+        qcodes.config["core"]["db_location"] = os.path.join(self.tmpdir,
+                                                            'temp.db')
+        qcodes.config["core"]["db_debug"] = False
+        initialise_database()
+
+        self.experiment = new_experiment("test-experiment",
+                                         sample_name="test-sample")
+
+        meas = Measurement(self.experiment)
+        meas.register_custom_parameter('x')
+        meas.register_custom_parameter('y')
+        meas.register_custom_parameter('z', setpoints=('x', 'y'))
+
+        y = np.arange(self.n_y, dtype=float)
+        with meas.run() as datasaver:
+            for x in range(self.n_x):
+                datasaver.add_result(('x', np.full(self.n_y, float(x))),
+                                     ('y', y), ('z', x * y))
+        self.dataset = datasaver.dataset
+        if with_index:
+            self.dataset.create_index('x')
+
+    def teardown(self, with_index):
+        if self.experiment:
+            self.experiment.conn.close()
+            self.experiment = None
+
+        if self.tmpdir:
+            shutil.rmtree(self.tmpdir)
+            self.tmpdir = None
+
+        self.dataset = None
+
+    def time_get_zoomed_window(self, with_index):
+        """Loading a window of 1 % of the map"""
+        self.dataset.get_parameter_data(
+            'z', ranges={'x': (450, 459), 'y': (0, 999)})
+
+    def time_get_decimated_map(self, with_index):
+        """Loading every 100th point of the map"""
+        self.dataset.get_parameter_data('z', stride=100)
+
+
+class GetMaterialisedParameterData:
+    """
+    This benchmark measures loading the data of a completed dataset with
+    ``DataSet.get_parameter_data`` and through the cache of a freshly
+    loaded dataset, from the database and from materialised columns.
+    """
+
+    number = 1
+    repeat = 4
+
+    params = [[False, True]]
+    param_names = ['materialised']
+    timer = time.perf_counter
+
+    n_rows = 1000000
+
+    def __init__(self):
+        self.experiment = None
+        self.dataset = None
+        self.tmpdir = None
+
+    def setup(self, materialised):
+        self.tmpdir = tempfile.mkdtemp()
+        qcodes.config["core"]["db_location"] = os.path.join(self.tmpdir,
+                                                            'temp.db')
+        qcodes.config["core"]["db_debug"] = False
+        initialise_database()
+
+        self.experiment = new_experiment("test-experiment",
+                                         sample_name="test-sample")
+
+        meas = Measurement(self.experiment)
+        meas.register_custom_parameter('x')
+        meas.register_custom_parameter('y', setpoints=('x',))
+
+        x = np.random.rand(self.n_rows)
+        with meas.run() as datasaver:
+            datasaver.add_result(('x', x), ('y', x))
+        self.dataset = datasaver.dataset
+        if materialised:
+            self.dataset.materialise_columns()
+
+    def teardown(self, materialised):
+        if self.experiment:
+            self.experiment.conn.close()
+            self.experiment = None
+
+        if self.tmpdir:
+            shutil.rmtree(self.tmpdir)
+            self.tmpdir = None
+
+        self.dataset = None
+
+    def time_get_parameter_data(self, materialised):
+        """Loading the data of the parameter tree"""
+        self.dataset.get_parameter_data()
+
+    def time_load_cache(self, materialised):
+        """Loading the data into the cache of a freshly loaded dataset"""
+        load_by_id(self.dataset.run_id).cache.data()
+
+
+class LoadCompletedRunAgain:
+    """
+    This benchmark measures loading the data of a completed run that has
+    been loaded before with another ``DataSet`` object, with and without
+    the cache of the data of completed runs that is shared by all datasets.
+    """
+
+    number = 1
+    repeat = 4
+
+    params = [[False, True]]
+    param_names = ['shared_cache']
+    timer = time.perf_counter
+
+    n_rows = 1000000
+
+    def __init__(self):
+        self.experiment = None
+        self.run_id = None
+        self.tmpdir = None
+        self.max_bytes = None
+
+    def setup(self, shared_cache):
+        self.tmpdir = tempfile.mkdtemp()
+        qcodes.config["core"]["db_location"] = os.path.join(self.tmpdir,
+                                                            'temp.db')
+        qcodes.config["core"]["db_debug"] = False
+        self.max_bytes = qcodes.config["dataset"]["shared_cache_max_bytes"]
+        if not shared_cache:
+            qcodes.config["dataset"]["shared_cache_max_bytes"] = 0
+        initialise_database()
+
+        self.experiment = new_experiment("test-experiment",
+                                         sample_name="test-sample")
+
+        meas = Measurement(self.experiment)
+        meas.register_custom_parameter('x')
+        meas.register_custom_parameter('y', setpoints=('x',))
+
+        x = np.random.rand(self.n_rows)
+        with meas.run() as datasaver:
+            datasaver.add_result(('x', x), ('y', x))
+        self.run_id = datasaver.run_id
+        load_by_id(self.run_id).get_parameter_data()
+
+    def teardown(self, shared_cache):
+        qcodes.config["dataset"]["shared_cache_max_bytes"] = self.max_bytes
+        if self.experiment:
+            self.experiment.conn.close()
+            self.experiment = None
+
+        if self.tmpdir:
+            shutil.rmtree(self.tmpdir)
+            self.tmpdir = None
+
+    def time_get_parameter_data(self, shared_cache):
+        """Loading the data of the run with a new dataset"""
+        load_by_id(self.run_id).get_parameter_data()
+
+    def time_load_cache(self, shared_cache):
+        """Loading the cache of a new dataset of the run"""
+        load_by_id(self.run_id).cache.data()
+
+
+class LoadManyRuns:
+    """
+    This benchmark measures loading the data of many runs with a serial
+    loop of ``load_by_id(...).get_parameter_data()`` calls and with
+    ``load_many``.
+    """
+
+    number = 1
+    repeat = 4
+
+    params = [['serial', 'load_many']]
+    param_names = ['loader']
+    timer = time.perf_counter
+
+    n_runs = 50
+    n_rows = 20000
+
+    def __init__(self):
+        self.experiment = None
+        self.run_ids = None
+        self.tmpdir = None
+
+    def setup(self, loader):
+        self.tmpdir = tempfile.mkdtemp()
+        qcodes.config["core"]["db_location"] = os.path.join(self.tmpdir,
+                                                            'temp.db')
+        qcodes.config["core"]["db_debug"] = False
+        initialise_database()
+
+        self.experiment = new_experiment("test-experiment",
+                                         sample_name="test-sample")
+
+        meas = Measurement(self.experiment)
+        meas.register_custom_parameter('x')
+        meas.register_custom_parameter('y', paramtype='complex',
+                                       setpoints=('x',))
+
+        self.run_ids = []
+        for _ in range(self.n_runs):
+            x = np.random.rand(self.n_rows)
+            with meas.run() as datasaver:
+                datasaver.add_result(('x', x), ('y', x + 1j * x))
+            self.run_ids.append(datasaver.run_id)
+
+    def teardown(self, loader):
+        if self.experiment:
+            self.experiment.conn.close()
+            self.experiment = None
+
+        if self.tmpdir:
+            shutil.rmtree(self.tmpdir)
+            self.tmpdir = None
+
+    def time_load_runs(self, loader):
+        """Loading the data of all runs"""
+        if loader == 'serial':
+            for run_id in self.run_ids:
+                load_by_id(run_id).get_parameter_data()
+        else:
+            load_many(self.run_ids)
+
+
+class ListRuns:
+    """
+    This benchmark measures listing the runs of a database with many runs,
+    by loading their datasets with ``Experiment.data_sets`` and with the
+    lightweight ``run_catalogue``, and printing the experiment.
+    """
+
+    number = 1
+    repeat = 4
+
+    params = [['data_sets', 'run_catalogue', 'repr']]
+    param_names = ['listing']
+    timer = time.perf_counter
+
+    n_runs = 1000
+
+    def __init__(self):
+        self.experiment = None
+        self.tmpdir = None
+
+    def setup(self, listing):
+        self.tmpdir = tempfile.mkdtemp()
+        qcodes.config["core"]["db_location"] = os.path.join(self.tmpdir,
+                                                            'temp.db')
+        qcodes.config["core"]["db_debug"] = False
+        initialise_database()
+
+        self.experiment = new_experiment("test-experiment",
+                                         sample_name="test-sample")
+
+        meas = Measurement(self.experiment)
+        meas.register_custom_parameter('x')
+        meas.register_custom_parameter('y', setpoints=('x',))
+
+        for _ in range(self.n_runs):
+            with meas.run() as datasaver:
+                datasaver.add_result(('x', np.arange(10)),
+                                     ('y', np.arange(10)))
+
+    def teardown(self, listing):
+        if self.experiment:
+            self.experiment.conn.close()
+            self.experiment = None
+
+        if self.tmpdir:
+            shutil.rmtree(self.tmpdir)
+            self.tmpdir = None
+
+    def time_list_runs(self, listing):
+        """Listing the runs of the experiment"""
+        if listing == 'data_sets':
+            self.experiment.data_sets()
+        elif listing == 'run_catalogue':
+            run_catalogue(exp_id=self.experiment.exp_id,
+                          conn=self.experiment.conn)
+        else:
+            repr(self.experiment)
+
+
+class RepeatedLoadById:
+    """
+    This benchmark measures loading the same run again and again with
+    ``load_by_id``, with the connections of the connection pool and with a
+    new connection for every load, like ``load_by_id`` used to make.
+    """
+
+    number = 1
+    repeat = 4
+
+    params = [['pooled', 'new_connection']]
+    param_names = ['connection']
+    timer = time.perf_counter
+
+    n_loads = 200
+
+    def __init__(self):
+        self.experiment = None
+        self.run_id = None
+        self.tmpdir = None
+
+    def setup(self, connection):
+        self.tmpdir = tempfile.mkdtemp()
+        qcodes.config["core"]["db_location"] = os.path.join(self.tmpdir,
+                                                            'temp.db')
+        qcodes.config["core"]["db_debug"] = False
+        initialise_database()
+
+        self.experiment = new_experiment("test-experiment",
+                                         sample_name="test-sample")
+
+        meas = Measurement(self.experiment)
+        meas.register_custom_parameter('x')
+        meas.register_custom_parameter('y', setpoints=('x',))
+
+        with meas.run() as datasaver:
+            datasaver.add_result(('x', np.arange(10)), ('y', np.arange(10)))
+        self.run_id = datasaver.run_id
+
+    def teardown(self, connection):
+        if self.experiment:
+            self.experiment.conn.close()
+            self.experiment = None
+        connection_pool.close_all()
+
+        if self.tmpdir:
+            shutil.rmtree(self.tmpdir)
+            self.tmpdir = None
+
+    def time_load_by_id(self, connection):
+        """Loading the run repeatedly"""
+        for _ in range(self.n_loads):
+            if connection == 'pooled':
+                load_by_id(self.run_id)
+            else:
+                conn = connect(qcodes.config["core"]["db_location"])
+                load_by_id(self.run_id, conn=conn)
+                conn.close()
+
+
+class WriteThroughputPerProfile:
+    """
+    This benchmark measures the throughput of writing data to the database
+    in many small transactions, as during a high-rate acquisition, with the
+    sqlite pragma profiles of the config.
+    """
+
+    number = 1
+    repeat = 4
+
+    params = [['default', 'acquisition', 'analysis', 'archive']]
+    param_names = ['profile']
+    timer = time.perf_counter
+
+    n_flushes = 500
+    points_per_flush = 100
+
+    def __init__(self):
+        self.experiment = None
+        self.runner = None
+        self.datasaver = None
+        self.tmpdir = None
+        self.profile = None
+
+    def setup(self, profile):
+        self.profile = qcodes.config["dataset"]["sqlite_profile"]
+        qcodes.config["dataset"]["sqlite_profile"] = profile
+
+        self.tmpdir = tempfile.mkdtemp()
+        qcodes.config["core"]["db_location"] = os.path.join(self.tmpdir,
+                                                            'temp.db')
+        qcodes.config["core"]["db_debug"] = False
+        initialise_database()
+
+        self.experiment = new_experiment("test-experiment",
+                                         sample_name="test-sample")
+
+        meas = Measurement(self.experiment)
+        meas.write_period = 1e6
+        meas.register_custom_parameter('x')
+        meas.register_custom_parameter('y', setpoints=('x',))
+
+        self.runner = meas.run()
+        self.datasaver = self.runner.__enter__()
+
+    def teardown(self, profile):
+        if self.runner:
+            self.runner.__exit__(None, None, None)
+            self.runner = None
+            self.datasaver = None
+
+        if self.experiment:
+            self.experiment.conn.close()
+            self.experiment = None
+        connection_pool.close_all()
+
+        if self.tmpdir:
+            shutil.rmtree(self.tmpdir)
+            self.tmpdir = None
+
+        qcodes.config["dataset"]["sqlite_profile"] = self.profile
+
+    def time_write(self, profile):
+        """Writing the data in a transaction per flush"""
+        x = np.arange(self.points_per_flush, dtype=float)
+        for _ in range(self.n_flushes):
+            self.datasaver.add_result(('x', x), ('y', x))
+            self.datasaver.flush_data_to_database()
+
+
+class ExtractRuns:
+    """
+    This benchmark measures extracting many runs into another database file
+    with ``extract_runs_into_db``, in a single transaction and in batches.
+    """
+
+    number = 1
+    repeat = 4
+
+    params = [[None, 50]]
+    param_names = ['batch_size']
+    timer = time.perf_counter
+
+    n_runs = 200
+    n_points = 1000
+
+    def __init__(self):
+        self.tmpdir = None
+        self.source_path = None
+        self.target_path = None
+
+    def setup(self, batch_size):
+        self.tmpdir = tempfile.mkdtemp()
+        self.source_path = os.path.join(self.tmpdir, 'source.db')
+        self.target_path = os.path.join(self.tmpdir, 'target.db')
+        qcodes.config["core"]["db_location"] = self.source_path
+        qcodes.config["core"]["db_debug"] = False
+        initialise_database()
+
+        experiment = new_experiment("test-experiment",
+                                    sample_name="test-sample")
+
+        meas = Measurement(experiment)
+        meas.register_custom_parameter('x')
+        meas.register_custom_parameter('y', setpoints=('x',))
+
+        x = np.arange(self.n_points, dtype=float)
+        for _ in range(self.n_runs):
+            with meas.run() as datasaver:
+                datasaver.add_result(('x', x), ('y', x))
+        experiment.conn.close()
+        connection_pool.close_all()
+
+    def teardown(self, batch_size):
+        if self.tmpdir:
+            shutil.rmtree(self.tmpdir)
+            self.tmpdir = None
+
+    def time_extract_runs(self, batch_size):
+        """Extracting all runs into an empty database file"""
+        extract_runs_into_db(self.source_path, self.target_path,
+                             *range(1, self.n_runs + 1),
+                             batch_size=batch_size)
+
+
+def _write_concurrently(path_to_db, exp_id, result_shards, lock, barrier,
+                        n_flushes, points_per_flush):
+    """
+    Write the data of a measurement in many small transactions at the same
+    time as the other processes of :class:`ConcurrentWriters`
+    """
+    qcodes.config["core"]["db_location"] = path_to_db
+    qcodes.config["core"]["db_debug"] = False
+    qcodes.config["dataset"]["result_shards"] = result_shards
+
+    meas = Measurement(load_experiment(exp_id))
+    meas.write_period = 1e6
+    meas.register_custom_parameter('x')
+    meas.register_custom_parameter('y', setpoints=('x',))
+
+    x = np.arange(points_per_flush, dtype=float)
+    runner = meas.run()
+    # only the writing of the data is done concurrently, the runs are
+    # started and completed one by one
+    with lock:
+        datasaver = runner.__enter__()
+    barrier.wait()
+    for _ in range(n_flushes):
+        datasaver.add_result(('x', x), ('y', x))
+        datasaver.flush_data_to_database()
+    barrier.wait()
+    with lock:
+        runner.__exit__(None, None, None)
+
+
+class ConcurrentWriters:
+    """
+    This benchmark measures the time that measurements running concurrently
+    in processes take to write their data in many small transactions, with
+    the results tables in the database file and in result shards.
+    """
+
+    number = 1
+    repeat = 4
+
+    params = [[False, True]]
+    param_names = ['result_shards']
+    timer = time.perf_counter
+
+    n_writers = 4
+    n_flushes = 200
+    points_per_flush = 100
+
+    def __init__(self):
+        self.tmpdir = None
+        self.lock = None
+        self.barrier = None
+        self.processes = []
+
+    def setup(self, result_shards):
+        self.tmpdir = tempfile.mkdtemp()
+        path_to_db = os.path.join(self.tmpdir, 'temp.db')
+        qcodes.config["core"]["db_location"] = path_to_db
+        qcodes.config["core"]["db_debug"] = False
+        initialise_database()
+
+        experiment = new_experiment("test-experiment",
+                                    sample_name="test-sample")
+        experiment.conn.close()
+        connection_pool.close_all()
+
+        context = multiprocessing.get_context('spawn')
+        self.lock = context.Lock()
+        self.barrier = context.Barrier(self.n_writers + 1)
+        self.processes = [
+            context.Process(target=_write_concurrently,
+                            args=(path_to_db, experiment.exp_id,
+                                  result_shards, self.lock, self.barrier,
+                                  self.n_flushes, self.points_per_flush))
+            for _ in range(self.n_writers)]
+        for process in self.processes:
+            process.start()
+
+    def teardown(self, result_shards):
+        for process in self.processes:
+            process.join()
+        self.processes = []
+
+        if self.tmpdir:
+            shutil.rmtree(self.tmpdir)
+            self.tmpdir = None
+
+    def time_concurrent_writers(self, result_shards):
+        """Writing the data of measurements running in processes"""
+        # wait for the processes to start writing, and to finish writing
+        self.barrier.wait()
+        self.barrier.wait()
+
+
+class WriteDataToTextFile:
+    """
+    This benchmark measures exporting a large dataset to a text file with
+    ``DataSet.write_data_to_text_file``, which streams the data in chunks.
+    """
+
+    number = 1
+    repeat = 2
+
+    timer = time.perf_counter
+
+    n_rows = 1000000
+
+    def __init__(self):
+        self.experiment = None
+        self.dataset = None
+        self.tmpdir = None
+
+    def setup(self):
+        self.tmpdir = tempfile.mkdtemp()
+        qcodes.config["core"]["db_location"] = os.path.join(self.tmpdir,
+                                                            'temp.db')
+        qcodes.config["core"]["db_debug"] = False
+        initialise_database()
+
+        self.experiment = new_experiment("test-experiment",
+                                         sample_name="test-sample")
+
+        meas = Measurement(self.experiment)
+        meas.register_custom_parameter('x')
+        meas.register_custom_parameter('y', setpoints=('x',))
+
+        x = np.random.rand(self.n_rows)
+        with meas.run() as datasaver:
+            datasaver.add_result(('x', x), ('y', x))
+        self.dataset = datasaver.dataset
+
+    def teardown(self):
+        if self.experiment:
+            self.experiment.conn.close()
+            self.experiment = None
+
+        if self.tmpdir:
+            shutil.rmtree(self.tmpdir)
+            self.tmpdir = None
+
+        self.dataset = None
+
+    def time_write_data_to_text_file(self):
+        """Exporting the dataset to a text file"""
+        self.dataset.write_data_to_text_file(self.tmpdir)
+
+    def peakmem_write_data_to_text_file(self):
+        """Exporting the dataset to a text file"""
+        self.dataset.write_data_to_text_file(self.tmpdir)
+
+
+class ConvertShapedMap:
+    """
+    This benchmark measures converting the cache of a completed 2D map,
+    measured with shapes, to pandas DataFrames and to an xarray Dataset.
+    """
+
+    number = 1
+    repeat = 2
+
+    params = [['pandas', 'xarray']]
+    param_names = ['target']
+    timer = time.perf_counter
+
+    n_points = 2000
+
+    def __init__(self):
+        self.experiment = None
+        self.dataset = None
+        self.tmpdir = None
+
+    def setup(self, target):
+        if target == 'xarray':
+            try:
+                import xarray  # noqa F401
+            except ImportError:
+                raise NotImplementedError('xarray is not installed')
+
+        self.tmpdir = tempfile.mkdtemp()
+        qcodes.config["core"]["db_location"] = os.path.join(self.tmpdir,
+                                                            'temp.db')
+        qcodes.config["core"]["db_debug"] = False
+        initialise_database()
+
+        self.experiment = new_experiment("test-experiment",
+                                         sample_name="test-sample")
+
+        meas = Measurement(self.experiment)
+        meas.register_custom_parameter('x')
+        meas.register_custom_parameter('y')
+        meas.register_custom_parameter('z', setpoints=('x', 'y'))
+        meas.set_shapes({'z': (self.n_points, self.n_points)})
+
+        y = np.linspace(-1, 1, self.n_points)
+        with meas.run() as datasaver:
+            for x in np.linspace(0, 1, self.n_points):
+                datasaver.add_result(('x', np.full(self.n_points, x)),
+                                     ('y', y), ('z', x * y))
+        self.dataset = datasaver.dataset
+        self.dataset.cache.data()
+
+    def teardown(self, target):
+        if self.experiment:
+            self.experiment.conn.close()
+            self.experiment = None
+
+        if self.tmpdir:
+            shutil.rmtree(self.tmpdir)
+            self.tmpdir = None
+
+        self.dataset = None
+
+    def _convert(self, target):
+        if target == 'pandas':
+            self.dataset.cache.to_pandas()
+        else:
+            self.dataset.cache.to_xarray_dataset()
+
+    def time_convert(self, target):
+        """Converting the cached map"""
+        self._convert(target)
+
+    def peakmem_convert(self, target):
+        """Converting the cached map"""
+        self._convert(target)
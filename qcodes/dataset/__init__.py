@@ -4,10 +4,11 @@ and from disk
 """
 from .measurements import Measurement
 from .data_set import new_data_set, load_by_counter, load_by_id,  \
-    load_by_run_spec, load_by_guid
+    load_by_run_spec, load_by_guid, load_many
 from .experiment_container import new_experiment, load_experiment,  \
     load_experiment_by_name, load_last_experiment, experiments,  \
     load_or_create_experiment
+from .catalogue import run_catalogue
 from .sqlite.settings import SQLiteSettings
 from .descriptions.param_spec import ParamSpec
 from .sqlite.database import initialise_database
@@ -0,0 +1,118 @@
+"""
+This module contains the codecs that the values of parameters of type
+'array' can be compressed with before they are stored in the database.
+
+A codec is given as a string of the names of the filters to apply to the
+data followed by the name of the compressor, separated by ``+``, e.g.
+``'shuffle+zlib'``. The filters rearrange the data such that it compresses
+better and are applied in the given order. The available filters are:
+
+- ``'delta'``: store the difference between consecutive elements instead
+  of the elements themselves. The difference is computed on the bit
+  patterns of the elements, so the filter is lossless for all dtypes.
+- ``'shuffle'``: store the first byte of all elements, then the second byte
+  of all elements and so on.
+
+The available compressors are ``'zlib'`` and ``'lzma'`` from the standard
+library.
+"""
+import lzma
+import zlib
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+
+_Compressor = Tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]
+_Filter = Callable[[bytes, int], bytes]
+
+COMPRESSORS: Dict[str, _Compressor] = {
+    'zlib': (zlib.compress, zlib.decompress),
+    'lzma': (lzma.compress, lzma.decompress),
+}
+
+
+def _delta_units(data: bytes, itemsize: int) -> np.ndarray:
+    """
+    View the data as a 2D array of unsigned integers with one row per
+    element, using the widest integer that the itemsize is a multiple of
+    """
+    width = max(w for w in (8, 4, 2, 1) if itemsize % w == 0)
+    units = np.frombuffer(data, dtype=f'<u{width}')
+    return units.reshape(-1, itemsize // width)
+
+
+def _delta_encode(data: bytes, itemsize: int) -> bytes:
+    units = _delta_units(data, itemsize)
+    deltas = units.copy()
+    deltas[1:] -= units[:-1]
+    return deltas.tobytes()
+
+
+def _delta_decode(data: bytes, itemsize: int) -> bytes:
+    units = _delta_units(data, itemsize)
+    return np.cumsum(units, axis=0, dtype=units.dtype).tobytes()
+
+
+def _shuffle(data: bytes, itemsize: int) -> bytes:
+    elements = np.frombuffer(data, dtype=np.uint8).reshape(-1, itemsize)
+    return elements.T.tobytes()
+
+
+def _unshuffle(data: bytes, itemsize: int) -> bytes:
+    planes = np.frombuffer(data, dtype=np.uint8).reshape(itemsize, -1)
+    return planes.T.tobytes()
+
+
+FILTERS: Dict[str, Tuple[_Filter, _Filter]] = {
+    'delta': (_delta_encode, _delta_decode),
+    'shuffle': (_shuffle, _unshuffle),
+}
+
+
+def _parse_codec(codec: str) -> Tuple[List[str], str]:
+    *filters, compressor = codec.split('+')
+    if compressor not in COMPRESSORS:
+        raise ValueError(f'Invalid codec {codec!r}. The codec must end with '
+                         f'one of the compressors {tuple(COMPRESSORS)}.')
+    for name in filters:
+        if name not in FILTERS:
+            raise ValueError(f'Invalid codec {codec!r}. Unknown filter '
+                             f'{name!r}, the available filters are '
+                             f'{tuple(FILTERS)}.')
+    if len(set(filters)) != len(filters):
+        raise ValueError(f'Invalid codec {codec!r}. Each filter may only be '
+                         f'applied once.')
+    return filters, compressor
+
+
+def validate_codec(codec: str) -> None:
+    """
+    Raise a ValueError if the given string is not a valid codec
+    """
+    if not isinstance(codec, str):
+        raise ValueError(f'Invalid codec {codec!r}. The codec must be a '
+                         f'string.')
+    _parse_codec(codec)
+
+
+def encode(data: bytes, codec: str, itemsize: int) -> bytes:
+    """
+    Encode the raw data of an array with elements of the given size
+    """
+    filters, compressor = _parse_codec(codec)
+    if itemsize > 0:
+        for name in filters:
+            data = FILTERS[name][0](data, itemsize)
+    return COMPRESSORS[compressor][0](data)
+
+
+def decode(data: bytes, codec: str, itemsize: int) -> bytes:
+    """
+    Decode data encoded with :func:`encode` into the raw data of an array
+    """
+    filters, compressor = _parse_codec(codec)
+    data = COMPRESSORS[compressor][1](data)
+    if itemsize > 0:
+        for name in reversed(filters):
+            data = FILTERS[name][1](data, itemsize)
+    return data
@@ -0,0 +1,124 @@
+"""
+This module contains a lightweight catalogue of the runs in a database. The
+catalogue is read from the runs table of the database with a single query
+(and a few queries for the number of results of the runs), rather than by
+loading a :class:`.DataSet` for every run, which makes listing the runs of
+large databases fast. The :class:`.DataSet` of a run is only loaded when it
+is accessed.
+"""
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from qcodes.dataset.data_set import DataSet, load_by_id
+from qcodes.dataset.sqlite.connection import ConnectionPlus
+from qcodes.dataset.sqlite.database import conn_from_dbpath_or_conn
+from qcodes.dataset.sqlite.queries import (get_result_table_lengths,
+                                           get_run_catalogue)
+
+
+@dataclass(frozen=True)
+class RunRecord:
+    """
+    The metadata of a run as stored in the runs table of the database.
+
+    Attributes:
+        run_id: the run id of the run in the database
+        exp_id: the id of the experiment of the run
+        name: the name of the run
+        guid: the GUID of the run
+        counter: the counter of the run in its experiment
+        captured_run_id: the run id that was assigned to the run when it
+            was captured
+        captured_counter: the counter that was assigned to the run when it
+            was captured
+        parameters: the names of the parameters of the run, separated by
+            commas
+        run_timestamp_raw: the time when the run was started, in seconds
+            since the Epoch, or None if it has not been started
+        completed_timestamp_raw: the time when the run was completed, in
+            seconds since the Epoch, or None if it has not been completed
+        completed: whether the run is completed
+        length: the number of results of the run, as given by ``len`` of
+            its :class:`.DataSet`, or None if it has not been queried
+        conn: the connection to the database of the run
+    """
+    run_id: int
+    exp_id: int
+    name: str
+    guid: str
+    counter: int
+    captured_run_id: int
+    captured_counter: int
+    parameters: str
+    run_timestamp_raw: Optional[float]
+    completed_timestamp_raw: Optional[float]
+    completed: bool
+    length: Optional[int]
+    conn: ConnectionPlus = field(repr=False, compare=False)
+
+    def run_timestamp(self, fmt: str = "%Y-%m-%d %H:%M:%S") -> Optional[str]:
+        """
+        Returns the run timestamp in a human-readable format, see
+        :meth:`.DataSet.run_timestamp`
+        """
+        if self.run_timestamp_raw is None:
+            return None
+        return time.strftime(fmt, time.localtime(self.run_timestamp_raw))
+
+    @property
+    def dataset(self) -> DataSet:
+        """
+        Load the :class:`.DataSet` of the run. A new :class:`.DataSet` is
+        loaded on every access.
+        """
+        return load_by_id(self.run_id, conn=self.conn)
+
+
+def run_catalogue(exp_id: Optional[int] = None,
+                  started_after: Optional[float] = None,
+                  started_before: Optional[float] = None,
+                  with_lengths: bool = True,
+                  conn: Optional[ConnectionPlus] = None) -> List[RunRecord]:
+    """
+    List the runs in the database (the database file from config), ordered
+    by run id, without loading their datasets
+
+    Args:
+        exp_id: the id of the experiment to list the runs of. If None, the
+            runs of all experiments are listed
+        started_after: only list runs that have been started at or after
+            this time (in seconds since the Epoch); ignored if None
+        started_before: only list runs that have been started at or before
+            this time (in seconds since the Epoch); ignored if None
+        with_lengths: whether to query the number of results of the runs.
+            This requires a query per 500 runs; if False, the lengths of
+            the records are None
+        conn: connection to the database. If not supplied, a new connection
+            to the DB file specified in the config is made
+
+    Returns:
+        The records of the runs
+    """
+    conn = conn_from_dbpath_or_conn(conn=conn, path_to_db=None)
+    rows = get_run_catalogue(conn, exp_id=exp_id,
+                             started_after=started_after,
+                             started_before=started_before)
+    lengths = {}
+    if with_lengths:
+        lengths = get_result_table_lengths(
+            conn, [row['result_table_name'] for row in rows])
+    return [RunRecord(run_id=row['run_id'],
+                      exp_id=row['exp_id'],
+                      name=row['name'],
+                      guid=row['guid'],
+                      counter=row['result_counter'],
+                      captured_run_id=row['captured_run_id'],
+                      captured_counter=row['captured_counter'],
+                      parameters=row['parameters'] or '',
+                      run_timestamp_raw=row['run_timestamp'],
+                      completed_timestamp_raw=row['completed_timestamp'],
+                      completed=bool(row['is_completed']),
+                      length=lengths.get(row['result_table_name']),
+                      conn=conn)
+            for row in rows]
@@ -0,0 +1,127 @@
+"""
+This module contains a store of the data of completed runs in files of raw
+numpy columns next to the database file. Reading the data of a run from its
+columns, which are memory mapped, is much faster than reading it from the
+database, but the columns take up additional disk space, so a run is only
+written to the store on request, see :meth:`.DataSet.materialise_columns`.
+
+The columns of a run are stored in a directory named by the GUID of the
+run inside of a directory next to the database file, e.g.
+``experiments.db`` stores its runs in ``experiments_columns/<guid>``. The
+directory of a run holds a directory per parameter tree with a ``.npy`` file
+per parameter, and an ``index.json`` file that lists the parameter trees
+and their parameters. The index file is written last, so the columns of a
+run are only read if writing them has finished.
+"""
+import json
+import logging
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, Mapping, Optional, Sequence
+
+import numpy as np
+
+log = logging.getLogger(__name__)
+
+_INDEX_FILE_NAME = 'index.json'
+_FORMAT_VERSION = 1
+
+
+def columns_path(path_to_db: str, guid: str) -> Path:
+    """
+    Return the path of the directory of the columns of the run with the
+    given GUID in the database file at the given path
+    """
+    if path_to_db in ('', ':memory:'):
+        raise ValueError('The columns of runs in an in-memory database can '
+                         'not be stored.')
+    db_path = Path(path_to_db)
+    return db_path.with_name(f'{db_path.stem}_columns') / guid
+
+
+def write_columns(path: Path,
+                  data: Mapping[str, Mapping[str, np.ndarray]]) -> Path:
+    """
+    Write the data of a run, as returned by
+    :meth:`.DataSet.get_parameter_data`, to the given directory. Parameter
+    trees with values that are not stored in an array of fixed size elements
+    (e.g. text with missing values or arrays of varying length) can not be
+    memory mapped and are skipped.
+
+    Args:
+        path: the directory to write the columns to, see
+            :func:`columns_path`
+        data: the data of the parameter trees by the name of the dependent
+            parameter
+
+    Returns:
+        The path of the directory that the columns have been written to
+    """
+    if path.exists():
+        shutil.rmtree(path)
+    path.mkdir(parents=True)
+
+    trees: Dict[str, Sequence[str]] = {}
+    for tree_name, tree_data in data.items():
+        if any(column.dtype.hasobject for column in tree_data.values()):
+            log.info(f'Not writing the columns of the parameter tree '
+                     f'{tree_name} as it contains values that can not be '
+                     f'memory mapped.')
+            continue
+        # the names of the files can not be derived from the names of the
+        # parameters as these are not necessarily valid file names
+        tree_path = path / str(len(trees))
+        tree_path.mkdir()
+        for column_index, column in enumerate(tree_data.values()):
+            np.save(tree_path / f'{column_index}.npy', column,
+                    allow_pickle=False)
+        trees[tree_name] = list(tree_data)
+
+    index = {'format_version': _FORMAT_VERSION,
+             'trees': [{'name': name, 'parameters': parameters}
+                       for name, parameters in trees.items()]}
+    # write the index to a temporary file first such that a partially
+    # written index is never read
+    tmp_index_path = path / f'{_INDEX_FILE_NAME}.tmp'
+    with open(tmp_index_path, 'w') as index_file:
+        json.dump(index, index_file)
+    os.replace(tmp_index_path, path / _INDEX_FILE_NAME)
+    return path
+
+
+def read_columns(path: Path) -> Optional[Dict[str, Dict[str, np.ndarray]]]:
+    """
+    Read the columns of a run from the given directory as read-only memory
+    mapped arrays. Returns None if no (completely written) columns are found
+    in the directory.
+    """
+    try:
+        with open(path / _INDEX_FILE_NAME) as index_file:
+            index = json.load(index_file)
+    except FileNotFoundError:
+        return None
+    if index.get('format_version') != _FORMAT_VERSION:
+        return None
+
+    data: Dict[str, Dict[str, np.ndarray]] = {}
+    try:
+        for tree_index, tree in enumerate(index['trees']):
+            tree_path = path / str(tree_index)
+            data[tree['name']] = {
+                name: np.asarray(np.load(tree_path / f'{column_index}.npy',
+                                         mmap_mode='r', allow_pickle=False))
+                for column_index, name in enumerate(tree['parameters'])}
+    except (OSError, ValueError):
+        log.warning(f'Could not read the columns in {path}, reading the '
+                    f'data from the database instead.', exc_info=True)
+        return None
+    return data
+
+
+def remove_columns(path: Path) -> None:
+    """
+    Remove the columns of a run from the given directory if there are any
+    """
+    if path.exists():
+        shutil.rmtree(path)
@@ -0,0 +1,176 @@
+"""
+This module contains the conversion of the data of a :class:`.DataSet`, as
+returned by :meth:`.DataSet.get_parameter_data` and the cache of the
+dataset, to pandas DataFrames and xarray Datasets.
+
+The data of a parameter tree is converted without copying it where
+possible. If the values of the setpoints of a tree form a dense grid,
+which is the case for the data of a run with shapes (see
+:meth:`.Measurement.set_shapes`) and for arrays with the same setpoints in
+every row, the index of the DataFrame is built from the product of the
+coordinates along the axes of the grid, rather than by finding the unique
+values of the flattened setpoints, and the xarray Dataset uses the arrays
+as they are.
+"""
+from typing import (TYPE_CHECKING, Dict, List, Mapping, Optional, Tuple,
+                    Union)
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+    import xarray as xr
+
+
+def grid_coordinates(data: Mapping[str, np.ndarray]
+                     ) -> Optional[Dict[str, np.ndarray]]:
+    """
+    Find the coordinates of the axes of the grid that the values of the
+    dependent parameter of a parameter tree lie on.
+
+    Args:
+        data: the data of the parameter tree, with the dependent parameter
+            first, as returned for one tree by
+            :meth:`.DataSet.get_parameter_data`
+
+    Returns:
+        The coordinates along each axis of the values of the dependent
+        parameter by the name of the setpoint that varies along it, in the
+        order of the axes, or None if the values of the setpoints do not
+        form a grid (e.g. because the data is incomplete).
+    """
+    names = list(data)
+    values = data[names[0]]
+    setpoint_names = names[1:]
+    if (len(setpoint_names) != values.ndim
+            or any(data[name].shape != values.shape
+                   or data[name].dtype.hasobject
+                   for name in names)):
+        return None
+
+    coordinates: Dict[int, np.ndarray] = {}
+    axis_names: Dict[int, str] = {}
+    for name in setpoint_names:
+        setpoint_values = data[name]
+        for axis in range(values.ndim):
+            if axis in axis_names:
+                continue
+            index: Tuple[Union[slice, int], ...] = tuple(
+                slice(None) if i == axis else 0 for i in range(values.ndim))
+            coordinate = setpoint_values[index]
+            expanded_shape = tuple(len(coordinate) if i == axis else 1
+                                   for i in range(values.ndim))
+            if np.array_equal(setpoint_values,
+                              np.broadcast_to(
+                                  coordinate.reshape(expanded_shape),
+                                  values.shape)):
+                coordinates[axis] = coordinate
+                axis_names[axis] = name
+                break
+        else:
+            return None
+    return {axis_names[axis]: coordinates[axis]
+            for axis in range(values.ndim)}
+
+
+def _flatten(values: np.ndarray) -> np.ndarray:
+    if values.dtype.hasobject:
+        # ravel will not fully unpack a numpy array of arrays
+        # which are of "object" dtype. This can happen if a variable
+        # length array is stored in the db. We use concatenate to
+        # flatten these
+        return np.concatenate(values)
+    return values.ravel()
+
+
+def to_pandas_index(data: Mapping[str, np.ndarray]
+                    ) -> Optional[Union["pd.Index", "pd.MultiIndex"]]:
+    """
+    Create the index of the DataFrame of the data of a parameter tree from
+    the values of its setpoints
+
+    Args:
+        data: the data of the parameter tree, with the dependent parameter
+            first, as returned for one tree by
+            :meth:`.DataSet.get_parameter_data`
+    """
+    import pandas as pd
+    keys = list(data.keys())
+    if len(data) <= 1:
+        return None
+    elif len(data) == 2:
+        return pd.Index(_flatten(data[keys[1]]), name=keys[1])
+
+    coordinates = grid_coordinates(data)
+    if coordinates is not None:
+        index = pd.MultiIndex.from_product(list(coordinates.values()),
+                                           names=list(coordinates))
+        return index.reorder_levels(keys[1:])
+    return pd.MultiIndex.from_arrays(
+        tuple(_flatten(data[key]) for key in keys[1:]),
+        names=keys[1:])
+
+
+def to_pandas_dataframe(data: Mapping[str, np.ndarray]) -> "pd.DataFrame":
+    """
+    Convert the data of a parameter tree to a DataFrame with a column for
+    the dependent parameter indexed by its setpoints
+
+    Args:
+        data: the data of the parameter tree, with the dependent parameter
+            first, as returned for one tree by
+            :meth:`.DataSet.get_parameter_data`
+    """
+    import pandas as pd
+    if len(data) == 0:
+        return pd.DataFrame()
+    dependent_col_name = list(data.keys())[0]
+    return pd.DataFrame(_flatten(data[dependent_col_name]),
+                        index=to_pandas_index(data),
+                        columns=[dependent_col_name], copy=False)
+
+
+def to_xarray_dataset(
+        parameter_data: Mapping[str, Mapping[str, np.ndarray]]
+) -> "xr.Dataset":
+    """
+    Convert the data of parameter trees to an xarray Dataset with a data
+    variable per dependent parameter and its setpoints as coordinates.
+    The data of parameter trees whose setpoints form a grid of unique
+    coordinates is used as it is, the data of other trees is converted via
+    a DataFrame, i.e. it is arranged on a grid of the unique values of its
+    setpoints. If the setpoints have duplicate values, the data is given
+    along a dimension named ``<dependent parameter>_index`` instead.
+
+    Args:
+        parameter_data: the data of the parameter trees by the name of the
+            dependent parameter, as returned by
+            :meth:`.DataSet.get_parameter_data`
+    """
+    import pandas as pd
+    import xarray as xr
+
+    datasets: List[xr.Dataset] = []
+    for name, data in parameter_data.items():
+        if len(data) == 0:
+            continue
+        coordinates = grid_coordinates(data)
+        if coordinates is not None and all(
+                pd.Index(coordinate).is_unique
+                for coordinate in coordinates.values()):
+            datasets.append(xr.Dataset(
+                {name: (list(coordinates), data[name])},
+                coords={coord_name: (coord_name, coordinate)
+                        for coord_name, coordinate in coordinates.items()}))
+            continue
+
+        dataframe = to_pandas_dataframe(data)
+        if dataframe.index.is_unique:
+            datasets.append(xr.Dataset.from_dataframe(dataframe))
+        else:
+            dim = f'{name}_index'
+            datasets.append(xr.Dataset(
+                {name: (dim, _flatten(data[name]))},
+                coords={key: (dim, _flatten(values))
+                        for key, values in data.items() if key != name}))
+    return xr.merge(datasets)
@@ -1,19 +1,29 @@
 import functools
 import importlib
+import itertools
 import json
 import logging
+import multiprocessing
 import os
 import time
 import uuid
-from dataclasses import dataclass
-from queue import Empty, Queue
-from threading import Thread
-from typing import (TYPE_CHECKING, Any, Callable, Dict, List, Mapping,
-                    Optional, Sequence, Set, Sized, Tuple, Union)
+import warnings
+from collections import defaultdict
+from dataclasses import dataclass, field
+from queue import Empty, Full, Queue
+from concurrent.futures import ThreadPoolExecutor
+from threading import Thread, local
+from typing import (TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator,
+                    List, Mapping, Optional, Sequence, Set, Sized, Tuple,
+                    Union)
 
 import numpy
 
 import qcodes
+from qcodes.dataset.data_conversion import (_flatten, to_pandas_dataframe,
+                                            to_pandas_index, to_xarray_dataset)
+from qcodes.dataset.column_store import (columns_path, read_columns,
+                                         remove_columns, write_columns)
 from qcodes.dataset.descriptions.dependencies import (DependencyError,
                                                       InterDependencies_)
 from qcodes.dataset.descriptions.param_spec import ParamSpec, ParamSpecBase
@@ -28,29 +38,41 @@ from qcodes.dataset.linked_datasets.links import (Link, links_to_str,
                                                   str_to_links)
 from qcodes.dataset.sqlite.connection import (ConnectionPlus, atomic,
                                               atomic_transaction, transaction)
-from qcodes.dataset.sqlite.database import (conn_from_dbpath_or_conn, connect,
-                                            get_DB_location)
+from qcodes.dataset.sqlite.database import (_adapt_array,
+                                            conn_from_dbpath_or_conn, connect,
+                                            connect_read_only,
+                                            connection_pool, get_DB_location)
 from qcodes.dataset.sqlite.queries import (
-    add_meta_data, add_parameter, completed, create_run,
+    _can_read_typed_columns, _convert_rows_to_columns,
+    _get_paramspecs_of_one_param_tree, add_meta_data, add_parameter,
+    completed, create_index_on_parameters, create_run,
     get_completed_timestamp_from_run_id,
     get_experiment_name_from_experiment_id, get_guid_from_run_id,
     get_guids_from_run_spec, get_last_experiment, get_metadata,
-    get_metadata_from_run_id, get_parameter_data, get_parent_dataset_links,
+    get_metadata_from_run_id, get_parameter_data,
+    get_parameter_data_for_one_paramtree, get_parent_dataset_links,
     get_run_description, get_run_timestamp_from_run_id, get_runid_from_guid,
-    get_sample_name_from_experiment_id, mark_run_complete,
-    remove_trigger, run_exists, set_run_timestamp, update_parent_datasets,
-    update_run_description)
-from qcodes.dataset.sqlite.query_helpers import (VALUE, VALUES,
+    get_sample_name_from_experiment_id, iter_parameter_data_for_one_paramtree,
+    mark_run_complete, remove_trigger,
+    reshape_parameter_data_for_one_paramtree, run_exists, set_run_timestamp,
+    update_parent_datasets, update_run_description)
+from qcodes.dataset.sqlite.query_helpers import (ENCODED_VALUE, VALUE, VALUES,
+                                                 insert_many_columns,
                                                  insert_many_values,
                                                  length, one,
-                                                 select_one_where)
+                                                 select_one_where,
+                                                 validate_insert_strategy)
+from qcodes.dataset.sqlite.result_shards import (ResultShardAttacher,
+                                                 attach_result_shard,
+                                                 get_result_shard)
 from qcodes.instrument.parameter import _BaseParameter
 
-from .data_set_cache import DataSetCache
+from .data_set_cache import DataSetCache, shared_cache
 from .descriptions.versioning import serialization as serial
 
 if TYPE_CHECKING:
     import pandas as pd
+    import xarray as xr
 
 
 
@@ -85,6 +107,147 @@ SpecsOrInterDeps = Union[SPECS, InterDependencies_]
 ParameterData = Dict[str, Dict[str, numpy.ndarray]]
 
 
+@dataclass
+class _ResultColumns:
+    """
+    Results for a number of parameters stored column-wise, i.e. as one 1D
+    array of values per parameter. All columns have the same length. This
+    allows results to be passed on to the database without creating a
+    Python dict for each row.
+    """
+    names: List[str]
+    columns: List[numpy.ndarray]
+
+    def __len__(self) -> int:
+        return len(self.columns[0])
+
+
+ResultsList = List[Union[Dict[str, VALUE], _ResultColumns]]
+#: Results along with the name of the top level parameter of the parameter
+#: tree (or the standalone parameter) that they are results for
+TaggedResultsList = List[Tuple[str, Union[Dict[str, VALUE], _ResultColumns]]]
+
+
+@dataclass
+class _ResultLayout:
+    """
+    The parameter trees, each given as top level parameter, its inferred
+    parameters and its setpoints, and the standalone parameters that
+    results are given for.
+    """
+    trees: List[Tuple[ParamSpecBase, Set[ParamSpecBase], Set[ParamSpecBase]]]
+    standalones: Set[ParamSpecBase]
+
+
+class _ShapedResultBuffer:
+    """
+    Pre-allocated column buffers for the results of one parameter tree of
+    known shape. Results are written into the buffers by index and flushed
+    as contiguous slices of them, such that enqueuing a result does not
+    create any Python objects per value.
+
+    The buffers hold as many rows as the shape of the tree has points, so
+    no part of them is ever written twice and the flushed slices can be
+    passed on to the background writer without copying them. Once a result
+    does not fit any more, the buffer is closed and all further results of
+    the tree must be enqueued the regular way.
+
+    The dtype of each column is taken from the first value written into
+    it, such that integers are stored as integers. A value that can not be
+    stored in a column without loss closes the buffer.
+    """
+    _types = ('numeric', 'complex')
+
+    def __init__(self, params: Sequence[ParamSpecBase], size: int) -> None:
+        self.names = [param.name for param in params]
+        self._params = list(params)
+        self._columns: List[numpy.ndarray] = []
+        self._size = size
+        self._flushed = 0
+        self._position = 0
+        self.closed = False
+
+    @classmethod
+    def supports(cls, params: Iterable[ParamSpecBase]) -> bool:
+        return all(param.type in cls._types for param in params)
+
+    @classmethod
+    def _column_dtype(cls, param: ParamSpecBase,
+                      value_dtype: numpy.dtype) -> Optional[numpy.dtype]:
+        dtype: numpy.dtype
+        if param.type == 'complex':
+            dtype = numpy.dtype(numpy.complex128)
+        elif value_dtype.kind in 'biu':
+            dtype = numpy.dtype(numpy.int64)
+        else:
+            dtype = numpy.dtype(numpy.float64)
+        if not cls._fits(value_dtype, dtype):
+            return None
+        return dtype
+
+    @staticmethod
+    def _fits(value_dtype: numpy.dtype, column_dtype: numpy.dtype) -> bool:
+        if value_dtype.kind in 'iu' and column_dtype.kind in 'fc':
+            # 64 bit integers do not fit into the mantissa of a double
+            return value_dtype.itemsize < 8
+        return numpy.can_cast(value_dtype, column_dtype, 'safe')
+
+    def append(self, toplevel_param: ParamSpecBase,
+               result_dict: Mapping[ParamSpecBase, numpy.ndarray]) -> bool:
+        """
+        Write the results for the parameters of the buffer into it. The
+        results must have been validated, i.e. all values are either
+        scalars or have the size of the value of ``toplevel_param``.
+
+        Returns:
+            True if the results have been written and False if the buffer
+            is closed or the results do not fit into it.
+        """
+        if self.closed:
+            return False
+        start = self._position
+        stop = start + result_dict[toplevel_param].size
+        values = [numpy.asarray(result_dict[param]) for param in self._params]
+        if not self._columns:
+            dtypes = [self._column_dtype(param, value.dtype)
+                      for param, value in zip(self._params, values)]
+            if any(dtype is None for dtype in dtypes):
+                self.closed = True
+                return False
+            self._columns = [numpy.empty(self._size, dtype=dtype)
+                             for dtype in dtypes]
+        if stop > self._size or not all(
+                self._fits(value.dtype, column.dtype)
+                for value, column in zip(values, self._columns)):
+            self.closed = True
+            return False
+        for value, column in zip(values, self._columns):
+            column[start:stop] = numpy.ravel(value)
+        self._position = stop
+        return True
+
+    def __len__(self) -> int:
+        """
+        The number of rows that have been written but not yet flushed
+        """
+        return self._position - self._flushed
+
+    def pending(self) -> Optional[_ResultColumns]:
+        """
+        The rows that have been written but not yet flushed, as views into
+        the buffers
+        """
+        if self._position == self._flushed:
+            return None
+        return _ResultColumns(
+            names=self.names,
+            columns=[column[self._flushed:self._position]
+                     for column in self._columns])
+
+    def mark_flushed(self) -> None:
+        self._flushed = self._position
+
+
 class CompletedError(RuntimeError):
     pass
 
@@ -148,8 +311,11 @@ class _Subscriber(Thread):
 
         parameters = dataSet.get_parameters()
         sql_param_list = ",".join([f"NEW.{p.name}" for p in parameters])
+        # only temporary triggers may be created on the tables of attached
+        # databases, such as the results table of a sharded run
+        temp = '' if dataSet._result_shard is None else ' TEMP'
         sql_create_trigger_for_callback = f"""
-        CREATE TRIGGER {self.trigger_id}
+        CREATE{temp} TRIGGER {self.trigger_id}
             AFTER INSERT ON '{self.table_name}'
         BEGIN
             SELECT {self.callback_id}({sql_param_list});
@@ -209,37 +375,148 @@ class _Subscriber(Thread):
         self.log.debug("Stopped subscriber")
 
 
+@dataclass
+class WriterStatistics:
+    """
+    Statistics of the background writer of a database. Latencies are
+    measured from the moment results are put in the write queue until the
+    transaction they are written in has been committed.
+    """
+    #: number of items currently waiting in the write queue
+    queue_depth: int = 0
+    #: largest number of items that have been waiting in the write queue
+    max_queue_depth: int = 0
+    #: number of items written to the database
+    items_written: int = 0
+    #: number of items dropped because the write queue was full
+    items_dropped: int = 0
+    #: number of transactions used to write the items
+    transactions: int = 0
+    #: latency of the most recently written item in seconds
+    last_latency: float = 0.0
+    #: largest latency of any written item in seconds
+    max_latency: float = 0.0
+    #: sum of the latencies of all written items in seconds
+    total_latency: float = 0.0
+
+    @property
+    def mean_latency(self) -> float:
+        if self.items_written == 0:
+            return 0.0
+        return self.total_latency / self.items_written
+
+
 class _BackgroundWriter(Thread):
     """
-    Write the results from the DataSet's dataqueue in a new thread
+    Write the results from the DataSet's dataqueue in a new thread.
+
+    Consecutive items in the queue that are written to the same table are
+    written in one transaction. If writing the items of a table fails, the
+    error is recorded in the ``write_errors`` of the status of the writer,
+    such that it is raised by the :class:`.DataSet` of the table.
     """
 
-    def __init__(self, queue: "Queue[Any]", conn: ConnectionPlus):
+    #: maximal number of queue items that are written in one go
+    max_items_per_batch = 1000
+
+    def __init__(self, queue: "Queue[Any]", conn: ConnectionPlus,
+                 statistics: Optional[WriterStatistics] = None):
         super().__init__(daemon=True)
         self.queue = queue
         self.path = conn.path_to_dbfile
         self.keep_writing = True
+        self.statistics = (statistics if statistics is not None
+                           else WriterStatistics())
 
     def run(self) -> None:
 
-        self.conn = connect(self.path)
-
-        while self.keep_writing:
-
-            item = self.queue.get()
-            if item['keys'] == 'stop':
-                self.keep_writing = False
-                self.conn.close()
-            elif item['keys'] == 'finalize':
-                _WRITERS[self.path].active_datasets.remove(item['values'])
-            else:
-                self.write_results(item['keys'], item['values'], item['table_name'])
-            self.queue.task_done()
-
-    def write_results(self, keys: Sequence[str],
-                      values: Sequence[List[Any]],
-                      table_name: str) -> None:
-        insert_many_values(self.conn, table_name, keys, values)
+        self.connect()
+        try:
+            while self.keep_writing:
+
+                item = self.queue.get()
+                if item['keys'] in ('stop', 'finalize'):
+                    self.handle_control_item(item)
+                    continue
+
+                batch = [item]
+                control_item = None
+                while len(batch) < self.max_items_per_batch:
+                    try:
+                        item = self.queue.get_nowait()
+                    except Empty:
+                        break
+                    if item['keys'] in ('stop', 'finalize'):
+                        control_item = item
+                        break
+                    batch.append(item)
+
+                self.write_batch(batch)
+                for _ in batch:
+                    self.queue.task_done()
+
+                if control_item is not None:
+                    self.handle_control_item(control_item)
+        finally:
+            if self.keep_writing:
+                # writing has failed, so the connection is not closed by a
+                # stop item
+                self.close()
+
+    def connect(self) -> None:
+        self.conn = connection_pool.acquire_writer(self.path)
+        self.result_shards = ResultShardAttacher(self.conn)
+
+    def close(self) -> None:
+        connection_pool.release_writer(self.conn)
+
+    def handle_control_item(self, item: Dict[str, Any]) -> None:
+        if item['keys'] == 'stop':
+            self.keep_writing = False
+            self.close()
+        elif item['keys'] == 'finalize':
+            _WRITERS[self.path].active_datasets.remove(item['values'])
+        self.queue.task_done()
+
+    def write_batch(self, batch: Sequence[Dict[str, Any]]) -> None:
+        """
+        Write a batch of items using one transaction for each run of
+        consecutive items for the same table.
+        """
+        transactions, errors = _write_batch(self.conn, self.result_shards,
+                                            batch)
+        self.record_written(batch, transactions, errors)
+
+    def record_written(self, items: Sequence[Dict[str, Any]],
+                       transactions: int,
+                       errors: Mapping[str, str]) -> None:
+        """
+        Record the written items in the statistics, and the errors by the
+        names of the tables that could not be written to
+        """
+        writer_status = _WRITERS[self.path]
+        for table_name, message in errors.items():
+            log.error(f'Could not write results to {table_name}; '
+                      f'{message}')
+            writer_status.write_errors.setdefault(table_name, message)
+        # the items are counted after the errors have been recorded, such
+        # that no item of a table with an error counts as written
+        items_done = writer_status.items_done
+        for item in items:
+            table_name = item['table_name']
+            items_done[table_name] = items_done.get(table_name, 0) + 1
+        stats = self.statistics
+        written_at = time.perf_counter()
+        stats.transactions += transactions
+        for item in items:
+            if item['table_name'] in errors:
+                continue
+            latency = written_at - item['enqueued_at']
+            stats.items_written += 1
+            stats.last_latency = latency
+            stats.max_latency = max(stats.max_latency, latency)
+            stats.total_latency += latency
+        stats.queue_depth = self.queue.qsize()
 
     def shutdown(self) -> None:
         """
@@ -254,17 +531,272 @@ class _BackgroundWriter(Thread):
             self.join()
 
 
+class _ProcessWriter(_BackgroundWriter):
+    """
+    Write the results from the DataSet's dataqueue in a separate process.
+
+    The thread hands the results over to a writer process which owns the
+    connection to the database, such that adapting the values and executing
+    the SQL statements does not compete with the measurement for the GIL.
+    Columns of results are passed through shared memory (if available),
+    everything else is pickled. Items are only marked as done in the queue
+    once the writer process has committed them, or failed to.
+    """
+
+    #: interval in seconds at which the writer process is checked for being
+    #: alive while waiting for it to write a batch
+    reply_timeout = 1.0
+
+    def connect(self) -> None:
+        context = multiprocessing.get_context('spawn')
+        self.requests: "multiprocessing.Queue[Any]" = context.Queue()
+        self.replies: "multiprocessing.Queue[Any]" = context.Queue()
+        self.process = context.Process(
+            target=_write_in_process,
+            args=(self.path, self.requests, self.replies),
+            daemon=True)
+        self.process.start()
+
+    def close(self) -> None:
+        self.requests.put(None)
+        self.process.join()
+
+    def write_batch(self, batch: Sequence[Dict[str, Any]]) -> None:
+        shared_memories: List[Any] = []
+        try:
+            request = [_share_item(item, shared_memories) for item in batch]
+            self.requests.put(request)
+            transactions, errors = self.wait_for_reply(batch)
+        finally:
+            for shared_memory in shared_memories:
+                shared_memory.close()
+                shared_memory.unlink()
+
+        self.record_written(batch, transactions, errors)
+
+    def wait_for_reply(self, batch: Sequence[Dict[str, Any]]
+                       ) -> Tuple[int, Dict[str, str]]:
+        """
+        Wait for the writer process to reply to a batch of items. If the
+        writer process exits without replying, writing all items of the
+        batch has failed.
+        """
+        while True:
+            try:
+                return self.replies.get(timeout=self.reply_timeout)
+            except Empty:
+                if not self.process.is_alive():
+                    message = (f'The writer process has exited with exit '
+                               f'code {self.process.exitcode}')
+                    return 0, {item['table_name']: message for item in batch}
+
+
+#: the policies for adding results to a full write queue: 'block' waits
+#: until there is space in the queue, 'drop' discards the results
+WRITE_QUEUE_FULL_POLICIES = ('block', 'drop')
+
+
 @dataclass
 class _WriterStatus:
     bg_writer: Optional[_BackgroundWriter]
-    write_in_background: Optional[bool]
+    write_in_background: Optional[Union[bool, str]]
     data_write_queue: "Queue[Any]"
     active_datasets: Set[int]
+    queue_full_policy: str = 'block'
+    statistics: WriterStatistics = field(default_factory=WriterStatistics)
+    #: the errors of writing results in the background by the names of the
+    #: tables that they could not be written to
+    write_errors: Dict[str, str] = field(default_factory=dict)
+    #: the number of items that the writer is done with, i.e. has written
+    #: or failed to write, by the names of the tables of the items
+    items_done: Dict[str, int] = field(default_factory=dict)
+
+    def configure_queue(self) -> None:
+        """
+        Set up the write queue with the size and the policy for full queues
+        given in the config. The config is read when the writer status is
+        created and whenever a background writer is started, so this must
+        only be called while no background writer is consuming the queue.
+        """
+        queue_full_policy = qcodes.config.dataset.write_queue_full_policy
+        if queue_full_policy not in WRITE_QUEUE_FULL_POLICIES:
+            raise ValueError(f'Unknown write queue full policy '
+                             f'{queue_full_policy!r}. Must be one of '
+                             f'{WRITE_QUEUE_FULL_POLICIES}.')
+        self.queue_full_policy = queue_full_policy
+        self.data_write_queue = Queue(
+            maxsize=qcodes.config.dataset.write_queue_maxsize)
+
+    def put_results(self, item: Dict[str, Any]) -> bool:
+        """
+        Put an item with results in the write queue, applying the policy
+        for full queues. Returns False if the item has been dropped.
+        """
+        item['enqueued_at'] = time.perf_counter()
+        if self.queue_full_policy == 'drop':
+            try:
+                self.data_write_queue.put_nowait(item)
+            except Full:
+                self.statistics.items_dropped += 1
+                log.warning(f'The write queue is full, dropping results for '
+                            f'{item["table_name"]}.')
+                return False
+        else:
+            self.data_write_queue.put(item)
+        depth = self.data_write_queue.qsize()
+        self.statistics.queue_depth = depth
+        self.statistics.max_queue_depth = max(
+            self.statistics.max_queue_depth, depth)
+        return True
 
 
 _WRITERS: Dict[str, _WriterStatus] = {}
 
 
+def _group_by_table(
+        items: Sequence[Dict[str, Any]]) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Split write queue items into runs of consecutive items for the same
+    table.
+    """
+    for _, grouped_items in itertools.groupby(
+            items, key=lambda item: item['table_name']):
+        yield list(grouped_items)
+
+
+def _write_items(conn: ConnectionPlus,
+                 items: Sequence[Dict[str, Any]]) -> None:
+    """
+    Write the results of the given write queue items in one transaction.
+    """
+    with atomic(conn) as conn:
+        for item in items:
+            if item.get('columnar', False):
+                insert_many_columns(conn, item['table_name'], item['keys'],
+                                    item['values'],
+                                    strategy=item['insert_strategy'])
+            else:
+                insert_many_values(conn, item['table_name'], item['keys'],
+                                   item['values'],
+                                   strategy=item['insert_strategy'])
+
+
+def _error_message(error: BaseException) -> str:
+    # atomic transactions wrap the original error
+    while error.__cause__ is not None:
+        error = error.__cause__
+    return f'{type(error).__name__}: {error}'
+
+
+def _write_batch(conn: ConnectionPlus, result_shards: ResultShardAttacher,
+                 batch: Sequence[Dict[str, Any]]
+                 ) -> Tuple[int, Dict[str, str]]:
+    """
+    Write a batch of write queue items using one transaction for each run of
+    consecutive items for the same table. Writing the items of one table
+    failing does not keep the items of other tables from being written.
+
+    Returns:
+        The number of transactions used and the error messages by the names
+        of the tables that could not be written to
+    """
+    transactions = 0
+    errors: Dict[str, str] = {}
+    for table_items in _group_by_table(batch):
+        table_name = table_items[0]['table_name']
+        try:
+            result_shards.attach(table_name)
+            _write_items(conn, table_items)
+        except Exception as e:
+            errors.setdefault(table_name, _error_message(e))
+        else:
+            transactions += 1
+    return transactions, errors
+
+
+def _share_item(item: Dict[str, Any],
+                shared_memories: List[Any]) -> Dict[str, Any]:
+    """
+    Prepare a write queue item for being sent to the writer process by
+    copying its columns of results into shared memory. The created shared
+    memory blocks are appended to ``shared_memories``; they must be kept
+    open until the writer process has written the item.
+    """
+    if not item.get('columnar', False):
+        return item
+    try:
+        from multiprocessing import shared_memory
+    except ImportError:
+        # shared memory is only available from python 3.8, fall back to
+        # pickling the columns
+        return item
+
+    shared_columns: List[Any] = []
+    for column in item['values']:
+        if column.dtype.hasobject or column.nbytes == 0:
+            shared_columns.append(column)
+            continue
+        shm = shared_memory.SharedMemory(create=True, size=column.nbytes)
+        shared_memories.append(shm)
+        numpy.ndarray(column.shape, dtype=column.dtype,
+                      buffer=shm.buf)[...] = column
+        shared_columns.append(
+            _SharedColumn(shm.name, column.dtype.str, column.shape))
+    return {**item, 'values': shared_columns}
+
+
+@dataclass
+class _SharedColumn:
+    """
+    Reference to a column of results stored in shared memory.
+    """
+    name: str
+    dtype: str
+    shape: Tuple[int, ...]
+
+    def to_array(self) -> numpy.ndarray:
+        from multiprocessing import shared_memory
+        shm = shared_memory.SharedMemory(name=self.name)
+        try:
+            return numpy.ndarray(self.shape, dtype=self.dtype,
+                                 buffer=shm.buf).copy()
+        finally:
+            shm.close()
+
+
+def _write_in_process(path: str,
+                      requests: "multiprocessing.Queue[Any]",
+                      replies: "multiprocessing.Queue[Any]") -> None:
+    """
+    Main function of the writer process. Writes batches of write queue
+    items received via ``requests`` and replies with the number of
+    transactions used and the error messages by the names of the tables
+    that could not be written to, see :func:`_write_batch`. A None request
+    stops the process.
+    """
+    conn = connect(path)
+    result_shards = ResultShardAttacher(conn)
+    try:
+        while True:
+            batch = requests.get()
+            if batch is None:
+                break
+            try:
+                for item in batch:
+                    if item.get('columnar', False):
+                        item['values'] = [
+                            column.to_array()
+                            if isinstance(column, _SharedColumn) else column
+                            for column in item['values']]
+                reply = _write_batch(conn, result_shards, batch)
+            except Exception as e:
+                message = _error_message(e)
+                reply = (0, {item['table_name']: message for item in batch})
+            replies.put(reply)
+    finally:
+        conn.close()
+
+
 class DataSet(Sized):
 
     # the "persistent traits" are the attributes/properties of the DataSet
@@ -323,7 +855,26 @@ class DataSet(Sized):
         self._parent_dataset_links: List[Link]
         #: In memory representation of the data in the dataset.
         self.cache: DataSetCache = DataSetCache(self)
-        self._results: List[Dict[str, VALUE]] = []
+        self._results: ResultsList = []
+        #: The enqueued results tagged by parameter tree, to be pushed to
+        #: the cache once they have been written
+        self._results_for_cache: TaggedResultsList = []
+        #: The results that have been flushed to the background writer but
+        #: not pushed to the cache yet, along with the number of write
+        #: queue items of this dataset that must be written before
+        self._results_awaiting_write: List[Tuple[int, TaggedResultsList]] = []
+        #: Pre-allocated result buffers by the name of the top level
+        #: parameter of the parameter tree, for trees of known shape
+        self._result_buffers: Dict[str, _ShapedResultBuffer] = {}
+        #: The codecs of the parameters stored compressed by name
+        self._array_codecs: Dict[str, str] = {}
+        self._insert_strategy: str = qcodes.config.dataset.insert_strategy
+        #: The number of write queue items of this dataset that have been
+        #: dropped because the write queue was full
+        self._items_dropped = 0
+        #: The number of write queue items of this dataset that have been
+        #: put in the write queue
+        self._items_enqueued = 0
 
         if run_id is not None:
             if not run_exists(self.conn, run_id):
@@ -349,11 +900,14 @@ class DataSet(Sized):
                                      "You can start a new one with:"
                                      " new_experiment(name, sample_name)")
             name = name or "dataset"
+            shard = (bool(qcodes.config.dataset.result_shards)
+                     and self.path_to_db not in ('', ':memory:'))
             _, run_id, __ = create_run(self.conn, exp_id, name,
                                        generate_guid(),
                                        parameters=None,
                                        values=values,
-                                       metadata=metadata)
+                                       metadata=metadata,
+                                       shard=shard)
             # this is really the UUID (an ever increasing count in the db)
             self._run_id = run_id
             self._completed = False
@@ -373,6 +927,11 @@ class DataSet(Sized):
             self._metadata = get_metadata_from_run_id(self.conn, self.run_id)
             self._parent_dataset_links = []
 
+        #: The path of the result shard of the run, if it is sharded
+        self._result_shard = get_result_shard(self.conn, self.run_id)
+        if self._result_shard is not None:
+            self.conn = self._connect_with_result_shard()
+
         if _WRITERS.get(self.path_to_db) is None:
             queue: "Queue[Any]" = Queue()
             ws: _WriterStatus = _WriterStatus(
@@ -380,6 +939,7 @@ class DataSet(Sized):
                 write_in_background=None,
                 data_write_queue=queue,
                 active_datasets=set())
+            ws.configure_queue()
             _WRITERS[self.path_to_db] = ws
 
     @property
@@ -618,8 +1178,26 @@ class DataSet(Sized):
         echoed back.
         """
         self._debug = not self._debug
-        self.conn.close()
-        self.conn = connect(self.path_to_db, self._debug)
+        if self._result_shard is None:
+            self.conn = connection_pool.connection(self.path_to_db,
+                                                   self._debug)
+        else:
+            self.conn.close()
+            self.conn = self._connect_with_result_shard()
+
+    def _connect_with_result_shard(self) -> ConnectionPlus:
+        """
+        Make a connection of the dataset's own to the database that the
+        result shard of the run is attached to, such that the results table
+        can be queried like a table of the database file. The result shard
+        is not attached to the shared connections of the connection pool,
+        since sqlite limits the number of databases attached to a
+        connection.
+        """
+        assert self._result_shard is not None
+        conn = connect(self.path_to_db, self._debug)
+        attach_result_shard(conn, self.run_id, self._result_shard)
+        return conn
 
     def add_parameter(self, spec: ParamSpec) -> None:
         """
@@ -720,7 +1298,8 @@ class DataSet(Sized):
         if value:
             mark_run_complete(self.conn, self.run_id)
 
-    def mark_started(self, start_bg_writer: bool = False) -> None:
+    def mark_started(self, start_bg_writer: Union[bool, str] = False,
+                     insert_strategy: Optional[str] = None) -> None:
         """
         Mark this :class:`.DataSet` as started. A :class:`.DataSet` that has been started can not
         have its parameters modified.
@@ -729,13 +1308,27 @@ class DataSet(Sized):
 
         Args:
             start_bg_writer: If True, the add_results method will write to the
-                database in a separate thread.
+                database in a separate thread. If 'process', the results
+                will be written to the database by a separate process.
+            insert_strategy: How the add_results method inserts the results
+                into the database, either 'values' (multi-row INSERT
+                statements) or 'executemany' (one prepared INSERT statement
+                executed for every row). By default the setting will be read
+                from the ``qcodesrc.json`` config file.
         """
         if not self._started:
+            if start_bg_writer not in (True, False, 'process'):
+                raise ValueError(f'Invalid value {start_bg_writer!r} for '
+                                 f'start_bg_writer. Must be True, False or '
+                                 f"'process'.")
+            if insert_strategy is not None:
+                validate_insert_strategy(insert_strategy)
+                self._insert_strategy = insert_strategy
             self._perform_start_actions(start_bg_writer=start_bg_writer)
             self._started = True
 
-    def _perform_start_actions(self, start_bg_writer: bool) -> None:
+    def _perform_start_actions(self,
+                               start_bg_writer: Union[bool, str]) -> None:
         """
         Perform the actions that must take place once the run has been started
         """
@@ -744,6 +1337,13 @@ class DataSet(Sized):
         for spec in paramspecs:
             add_parameter(self.conn, self.table_name, spec)
 
+        if qcodes.config.dataset.index_setpoints:
+            setpoint_names = {setpoint.name for setpoints
+                              in self._rundescriber.interdeps.dependencies.values()
+                              for setpoint in setpoints}
+            for name in sorted(setpoint_names):
+                create_index_on_parameters(self.conn, self.table_name, name)
+
         desc_str = serial.to_json_for_storage(self.description)
 
         update_run_description(self.conn, self.run_id, desc_str)
@@ -753,17 +1353,30 @@ class DataSet(Sized):
         pdl_str = links_to_str(self._parent_dataset_links)
         update_parent_datasets(self.conn, self.run_id, pdl_str)
 
+        self._result_buffers = self._allocate_result_buffers()
+        self.cache._start_receiving_pushes()
+        self._array_codecs = {
+            ps.name: ps.codec for ps in self._rundescriber.interdeps.paramspecs
+            if ps.codec is not None}
+
         writer_status = self._writer_status
 
         write_in_background_status = writer_status.write_in_background
         if write_in_background_status is not None and write_in_background_status != start_bg_writer:
             raise RuntimeError("All datasets written to the same database must "
-                               "be written either in the background or in the "
-                               "main thread. You cannot mix.")
+                               "be written either in the background, in a "
+                               "separate process or in the main thread. You "
+                               "cannot mix.")
         if start_bg_writer:
-            writer_status.write_in_background = True
+            writer_status.write_in_background = start_bg_writer
             if writer_status.bg_writer is None:
-                writer_status.bg_writer = _BackgroundWriter(writer_status.data_write_queue, self.conn)
+                writer_class = (_ProcessWriter if start_bg_writer == 'process'
+                                else _BackgroundWriter)
+                writer_status.configure_queue()
+                writer_status.statistics = WriterStatistics()
+                writer_status.bg_writer = writer_class(
+                    writer_status.data_write_queue, self.conn,
+                    writer_status.statistics)
             if not writer_status.bg_writer.is_alive():
                 writer_status.bg_writer.start()
         else:
@@ -771,6 +1384,26 @@ class DataSet(Sized):
 
         writer_status.active_datasets.add(self.run_id)
 
+    def _allocate_result_buffers(self) -> Dict[str, _ShapedResultBuffer]:
+        """
+        Allocate result buffers for all parameter trees with a known shape
+        and only numeric and complex parameters
+        """
+        shapes = self._rundescriber.shapes
+        if shapes is None:
+            return {}
+        interdeps = self._rundescriber.interdeps
+        buffers = {}
+        for toplevel_param, deps in interdeps.dependencies.items():
+            shape = shapes.get(toplevel_param.name)
+            params = ((toplevel_param,) + deps
+                      + interdeps.inferences.get(toplevel_param, ()))
+            if shape is None or not _ShapedResultBuffer.supports(params):
+                continue
+            buffers[toplevel_param.name] = _ShapedResultBuffer(
+                params, int(numpy.prod(shape)))
+        return buffers
+
     def mark_completed(self) -> None:
         """
         Mark :class:`.DataSet` as complete and thus read only and notify the subscribers
@@ -783,6 +1416,7 @@ class DataSet(Sized):
 
         self._perform_completion_actions()
         self.completed = True
+        self._raise_if_writing_failed()
 
     def _perform_completion_actions(self) -> None:
         """
@@ -791,6 +1425,12 @@ class DataSet(Sized):
         for sub in self.subscribers.values():
             sub.done_callback()
         self._ensure_dataset_written()
+        if self._items_dropped > 0:
+            self.add_metadata('items_dropped', self._items_dropped)
+            warnings.warn(f'{self._items_dropped} batches of results of run '
+                          f'{self.run_id} have been dropped because the '
+                          f'write queue was full. The number is stored in '
+                          f'the metadata of the run as items_dropped.')
 
     def add_results(self, results: Sequence[Mapping[str, VALUE]]) -> None:
         """
@@ -806,22 +1446,102 @@ class DataSet(Sized):
         the name of a parameter in this :class:`.DataSet`.
 
         It is an error to add results to a completed :class:`.DataSet`.
+
+        Note that calling this method stops the results of the
+        :class:`.DataSet` from being pushed to its cache, also for results
+        added later on with :meth:`.DataSaver.add_result`. The cache then
+        reads all data from the database instead, like the cache of a
+        :class:`.DataSet` that is loaded from the database. This keeps the
+        cache consistent with the database, since the results given to
+        this method are not converted for the cache.
         """
+        self._raise_if_not_writable()
+        self._stop_pushing_to_cache()
+        self._add_results(results)
 
+    def _add_results(self, results: Sequence[Mapping[str, VALUE]]) -> None:
+        """
+        Adds a sequence of results to the :class:`.DataSet`, see
+        :meth:`add_results`. This is used to flush the enqueued results,
+        which are pushed to the cache separately.
+        """
         self._raise_if_not_writable()
 
-        expected_keys = frozenset.union(*[frozenset(d) for d in results])
-        values = [[d.get(k, None) for k in expected_keys] for d in results]
+        encoded_results: Sequence[Mapping[str, ENCODED_VALUE]] = results
+        if self._array_codecs:
+            encoded_results = [self._encode_arrays(result)
+                               for result in results]
+
+        expected_keys = frozenset.union(*[frozenset(d)
+                                          for d in encoded_results])
+        values = [[d.get(k, None) for k in expected_keys]
+                  for d in encoded_results]
 
         writer_status = self._writer_status
 
         if writer_status.write_in_background:
             item = {'keys': list(expected_keys), 'values': values,
-                    "table_name": self.table_name}
-            writer_status.data_write_queue.put(item)
+                    "table_name": self.table_name,
+                    'insert_strategy': self._insert_strategy}
+            if writer_status.put_results(item):
+                self._items_enqueued += 1
+            else:
+                self._items_dropped += 1
         else:
             insert_many_values(self.conn, self.table_name, list(expected_keys),
-                               values)
+                               values, strategy=self._insert_strategy)
+
+    def _encode_arrays(self, result: Mapping[str, VALUE]
+                       ) -> Dict[str, ENCODED_VALUE]:
+        """
+        Encode the values of parameters that are stored compressed. The
+        values are encoded as bytes (rather than the memoryview returned by
+        the sqlite adapter) such that they can be passed to a writer process.
+        """
+        codecs = self._array_codecs
+        return {name: (value if value is None or name not in codecs
+                       else bytes(_adapt_array(numpy.asarray(value),
+                                               codecs[name])))
+                for name, value in result.items()}
+
+    def _add_result_columns(self, result_columns: _ResultColumns) -> None:
+        """
+        Adds results given column-wise to the :class:`.DataSet`. This is
+        the columnar counterpart of :meth:`add_results` used when flushing
+        the results of array-valued ``add_result`` calls.
+
+        Args:
+            result_columns: the names of the parameters and one 1D array of
+                values for each of them. Parameters not included are
+                assumed to be None.
+        """
+        self._raise_if_not_writable()
+
+        writer_status = self._writer_status
+
+        if writer_status.write_in_background:
+            item = {'keys': result_columns.names,
+                    'values': result_columns.columns,
+                    'table_name': self.table_name,
+                    'insert_strategy': self._insert_strategy,
+                    'columnar': True}
+            if writer_status.put_results(item):
+                self._items_enqueued += 1
+            else:
+                self._items_dropped += 1
+        else:
+            insert_many_columns(self.conn, self.table_name,
+                                result_columns.names, result_columns.columns,
+                                strategy=self._insert_strategy)
+
+    @property
+    def _number_of_enqueued_rows(self) -> int:
+        """
+        The number of rows of results waiting to be flushed to the database
+        """
+        return (sum(len(res) if isinstance(res, _ResultColumns) else 1
+                    for res in self._results)
+                + sum(len(buffer) for buffer in self._result_buffers.values()))
 
     def _raise_if_not_writable(self) -> None:
         if self.pristine:
@@ -838,7 +1558,16 @@ class DataSet(Sized):
         if writer_status.write_in_background:
             writer_status.data_write_queue.put({'keys': 'finalize', 'values': self.run_id})
             while self.run_id in writer_status.active_datasets:
+                bg_writer = writer_status.bg_writer
+                if bg_writer is None or not bg_writer.is_alive():
+                    writer_status.active_datasets.discard(self.run_id)
+                    writer_status.write_errors.setdefault(
+                        self.table_name, 'The background writer has stopped')
+                    break
                 time.sleep(self.background_sleep_time)
+            if self.cache._receives_pushes:
+                self._push_written_results_to_cache()
+            writer_status.items_done.pop(self.table_name, None)
         else:
             if self.run_id in writer_status.active_datasets:
                 writer_status.active_datasets.remove(self.run_id)
@@ -876,7 +1605,10 @@ class DataSet(Sized):
             self,
             *params: Union[str, ParamSpec, _BaseParameter],
             start: Optional[int] = None,
-            end: Optional[int] = None) -> ParameterData:
+            end: Optional[int] = None,
+            ranges: Optional[Mapping[Union[str, ParamSpec, _BaseParameter],
+                                     Tuple[Any, Any]]] = None,
+            stride: Optional[int] = None) -> ParameterData:
         """
         Returns the values stored in the :class:`.DataSet` for the specified parameters
         and their dependencies. If no parameters are supplied the values will
@@ -906,6 +1638,22 @@ class DataSet(Sized):
         less than or equal to the start, or if start is after the current end
         of the :class:`.DataSet` – then a list of empty arrays is returned.
 
+        If the columns of the :class:`.DataSet` have been materialised (see
+        :meth:`materialise_columns`) and no selection of results is made, the
+        values are returned as read-only arrays that are memory mapped to
+        the files of the columns.
+
+        The ranges argument selects the results where the values of the
+        given parameters (typically setpoints) lie within the given ranges,
+        e.g. ``ranges={'x': (0, 1)}`` selects the results with
+        ``0 <= x <= 1``. The selection is done by the database, so only the
+        selected results are loaded. A range only applies to the parameter
+        trees that the parameter is part of, and the start and end arguments
+        count the results within the ranges. Selecting by ranges is faster
+        for large datasets if the database has an index on the parameter,
+        see :meth:`create_index`. The stride argument returns only every
+        stride-th of the selected results.
+
         Args:
             *params: string parameter names, QCoDeS Parameter objects, and
                 ParamSpec objects. If no parameters are supplied data for
@@ -915,6 +1663,11 @@ class DataSet(Sized):
                 if None
             end: end value of selection range (by results count); ignored if
                 None
+            ranges: dictionary from parameters (as string parameter names,
+                QCoDeS Parameter objects, or ParamSpec objects) to tuples of
+                the lowest and highest value to select (both included). None
+                as the lowest or highest value means no limit.
+            stride: return every stride-th result only; ignored if None
 
         Returns:
             Dictionary from requested parameters to Dict of parameter names
@@ -926,8 +1679,193 @@ class DataSet(Sized):
                                  for ps in self._rundescriber.interdeps.non_dependencies]
         else:
             valid_param_names = self._validate_parameters(*params)
-        return get_parameter_data(self.conn, self.table_name,
-                                  valid_param_names, start, end)
+        columns = None
+        if (start is None and end is None and ranges is None
+                and stride is None):
+            columns = self._read_materialised_columns()
+            if columns is None and self.completed:
+                columns = {}
+        if columns is None:
+            return get_parameter_data(self.conn, self.table_name,
+                                      valid_param_names, start, end,
+                                      ranges=self._validate_ranges(ranges),
+                                      stride=stride)
+        # the parameter trees that are not materialised are read from the
+        # shared cache of the data of completed runs or the database
+        not_materialised = [name for name in valid_param_names
+                            if name not in columns]
+        data = {}
+        if not_materialised and self.completed:
+            trees = self._load_completed_parameter_trees(not_materialised)
+            data = {name: reshape_parameter_data_for_one_paramtree(
+                        self._rundescriber, name, trees[name][0])
+                    for name in not_materialised}
+        elif not_materialised:
+            data = get_parameter_data(self.conn, self.table_name,
+                                      not_materialised)
+        return {name: dict(columns[name]) if name in columns else data[name]
+                for name in valid_param_names}
+
+    def _load_completed_parameter_trees(
+            self, names: Sequence[str]
+    ) -> Dict[str, Tuple[Dict[str, numpy.ndarray], int]]:
+        """
+        Load the data of the given parameter trees of this completed
+        dataset from the cache shared by all datasets of the same run, see
+        :class:`.SharedParameterDataCache`. The trees that are not cached
+        are read from the database and added to the cache.
+        """
+        source = (self.path_to_db, self.run_id)
+        trees = shared_cache.get(self.guid, source, names)
+        missing_names = [name for name in names if name not in trees]
+        if missing_names:
+            missing_trees = {
+                name: get_parameter_data_for_one_paramtree(
+                    self.conn, self.table_name, self._rundescriber, name,
+                    start=None, end=None)
+                for name in missing_names}
+            shared_cache.put(self.guid, source, missing_trees)
+            trees.update(missing_trees)
+        return trees
+
+    def _validate_ranges(
+            self,
+            ranges: Optional[Mapping[Union[str, ParamSpec, _BaseParameter],
+                                     Tuple[Any, Any]]]
+    ) -> Optional[Dict[str, Tuple[Any, Any]]]:
+        if ranges is None:
+            return None
+        valid_ranges = {}
+        for param, param_range in ranges.items():
+            name, = self._validate_parameters(param)
+            low, high = param_range
+            valid_ranges[name] = (low, high)
+        return valid_ranges
+
+    def materialise_columns(self) -> str:
+        """
+        Write the data of this completed :class:`.DataSet` to files of raw
+        numpy columns in a directory next to the database file, such that
+        it can later be read (by :meth:`get_parameter_data` and the
+        :attr:`cache`) from memory mapped files instead of from the
+        database. Parameter trees with values that can not be memory mapped
+        (e.g. arrays of varying length) are still read from the database.
+
+        Returns:
+            The path of the directory that the columns are written to
+        """
+        if not self.completed:
+            raise RuntimeError('Can not materialise the columns of a DataSet '
+                               'that has not been completed.')
+        path = columns_path(self.path_to_db, self.guid)
+        data = get_parameter_data(self.conn, self.table_name)
+        return str(write_columns(path, data))
+
+    def remove_materialised_columns(self) -> None:
+        """
+        Remove the files written by :meth:`materialise_columns`, if any
+        """
+        if self.path_to_db in ('', ':memory:'):
+            return
+        remove_columns(columns_path(self.path_to_db, self.guid))
+
+    def _read_materialised_columns(self) -> Optional[ParameterData]:
+        if not self.completed or self.path_to_db in ('', ':memory:'):
+            return None
+        return read_columns(columns_path(self.path_to_db, self.guid))
+
+    def create_index(self,
+                     *params: Union[str, ParamSpec, _BaseParameter]) -> None:
+        """
+        Create an index in the database on the given parameters of this
+        :class:`.DataSet`, unless it exists already. The index speeds up
+        selecting results by ranges of the values of the first parameter in
+        :meth:`get_parameter_data`, at the cost of some disk space and of
+        slower writing of results. To index the setpoints of all datasets
+        as they are created set ``dataset.index_setpoints`` in the config.
+
+        Args:
+            *params: string parameter names, QCoDeS Parameter objects, and
+                ParamSpec objects to index
+        """
+        if not self.started:
+            raise RuntimeError('Can not create an index on a DataSet that '
+                               'has not been started.')
+        valid_param_names = self._validate_parameters(*params)
+        create_index_on_parameters(self.conn, self.table_name,
+                                   *valid_param_names)
+
+    def iter_parameter_data(
+            self,
+            *params: Union[str, ParamSpec, _BaseParameter],
+            chunk_rows: int = 100000,
+            ranges: Optional[Mapping[Union[str, ParamSpec, _BaseParameter],
+                                     Tuple[Any, Any]]] = None,
+            stride: Optional[int] = None) -> Iterator[ParameterData]:
+        """
+        Iterate over the values stored in the :class:`.DataSet` for the
+        specified parameters and their dependencies in chunks of results,
+        such that the values never have to be in memory all at once. Each
+        chunk is in the same format as the return value of
+        :meth:`get_parameter_data` but holds the values of at most
+        ``chunk_rows`` results of a single requested parameter. The chunks of
+        the requested parameters follow each other, and the values are never
+        reshaped to the shape of the dataset.
+
+        The values are read from the database as the iteration proceeds, so
+        results added to the dataset during the iteration may or may not
+        be included.
+
+        Args:
+            *params: string parameter names, QCoDeS Parameter objects, and
+                ParamSpec objects. If no parameters are supplied data for
+                all parameters that are not a dependency of another
+                parameter will be returned.
+            chunk_rows: the maximal number of results per chunk
+            ranges: select results by ranges of the values of parameters,
+                see :meth:`get_parameter_data`
+            stride: return every stride-th result only; ignored if None
+
+        Yields:
+            Dictionaries from a requested parameter to Dict of parameter
+            names to numpy arrays containing the data points of a chunk of
+            results.
+        """
+        if len(params) == 0:
+            valid_param_names = [ps.name
+                                 for ps in self._rundescriber.interdeps.non_dependencies]
+        else:
+            valid_param_names = self._validate_parameters(*params)
+        valid_ranges = self._validate_ranges(ranges)
+        for name in valid_param_names:
+            for chunk in iter_parameter_data_for_one_paramtree(
+                    self.conn, self.table_name, self._rundescriber, name,
+                    chunk_rows, ranges=valid_ranges, stride=stride):
+                yield {name: chunk}
+
+    def iter_data_as_pandas_dataframe(
+            self,
+            *params: Union[str, ParamSpec, _BaseParameter],
+            chunk_rows: int = 100000) -> Iterator[Dict[str, "pd.DataFrame"]]:
+        """
+        Iterate over the values stored in the :class:`.DataSet` for the
+        specified parameters and their dependencies in chunks of results as
+        :py:class:`pandas.DataFrame` s, see :meth:`iter_parameter_data`
+        and :meth:`get_data_as_pandas_dataframe`.
+
+        Args:
+            *params: string parameter names, QCoDeS Parameter objects, and
+                ParamSpec objects. If no parameters are supplied data for
+                all parameters that are not a dependency of another
+                parameter will be returned.
+            chunk_rows: the maximal number of results per chunk
+
+        Yields:
+            Dictionaries from a requested parameter name to a
+            :py:class:`pandas.DataFrame` of a chunk of results.
+        """
+        for chunk in self.iter_parameter_data(*params, chunk_rows=chunk_rows):
+            yield self._load_to_dataframes(chunk)
 
     def get_data_as_pandas_dataframe(self,
                                      *params: Union[str,
@@ -978,51 +1916,101 @@ class DataSet(Sized):
         dfs = self._load_to_dataframes(datadict)
         return dfs
 
+    def to_xarray_dataset(self,
+                          *params: Union[str, ParamSpec, _BaseParameter],
+                          start: Optional[int] = None,
+                          end: Optional[int] = None) -> "xr.Dataset":
+        """
+        Returns the values stored in the :class:`.DataSet` for the specified
+        parameters and their dependencies as an :py:class:`xarray.Dataset`
+        with a data variable per requested parameter and its setpoints as
+        coordinates, see :func:`.data_conversion.to_xarray_dataset`.
+        This requires xarray to be installed.
+
+        Args:
+            *params: string parameter names, QCoDeS Parameter objects, and
+                ParamSpec objects. If no parameters are supplied data for
+                all parameters that are not a dependency of another
+                parameter will be returned.
+            start: start value of selection range (by result count); ignored
+                if None
+            end: end value of selection range (by results count); ignored if
+                None
+
+        Returns:
+            :py:class:`xarray.Dataset` with the requested parameters.
+        """
+        datadict = self.get_parameter_data(*params,
+                                           start=start,
+                                           end=end)
+        return to_xarray_dataset(datadict)
+
     @staticmethod
     def _data_to_dataframe(data: Dict[str, numpy.ndarray], index: Union["pd.Index", "pd.MultiIndex"]) -> "pd.DataFrame":
         import pandas as pd
         if len(data) == 0:
             return pd.DataFrame()
         dependent_col_name = list(data.keys())[0]
-        dependent_data = data[dependent_col_name]
-        if dependent_data.dtype == numpy.dtype('O'):
-            # ravel will not fully unpack a numpy array of arrays
-            # which are of "object" dtype. This can happen if a variable
-            # length array is stored in the db. We use concatenate to
-            # flatten these
-            mydata = numpy.concatenate(dependent_data)
-        else:
-            mydata = dependent_data.ravel()
-        df = pd.DataFrame(mydata, index=index,
-                          columns=[dependent_col_name])
-        return df
+        return pd.DataFrame(_flatten(data[dependent_col_name]), index=index,
+                            columns=[dependent_col_name], copy=False)
 
     @staticmethod
     def _generate_pandas_index(data: Dict[str, numpy.ndarray]) -> Union["pd.Index", "pd.MultiIndex"]:
         # the first element in the dict given by parameter_tree is always the dependent
         # parameter and the index is therefore formed from the rest
-        import pandas as pd
-        keys = list(data.keys())
-        if len(data) <= 1:
-            index = None
-        elif len(data) == 2:
-            index = pd.Index(data[keys[1]].ravel(), name=keys[1])
-        else:
-            index_data = tuple(numpy.concatenate(data[key])
-                               if data[key].dtype == numpy.dtype('O')
-                               else data[key].ravel()
-                               for key in keys[1:])
-            index = pd.MultiIndex.from_arrays(
-                index_data,
-                names=keys[1:])
-        return index
+        return to_pandas_index(data)
+
+    def _results_to_parameter_data(
+            self, results: TaggedResultsList
+    ) -> Dict[str, Tuple[Dict[str, numpy.ndarray], int]]:
+        """
+        Convert results tagged by parameter tree to the data of the parameter
+        trees, in the format that the data would be read from the database
+        with :func:`.get_parameter_data_for_one_paramtree`, along with the
+        number of rows of results of each tree. This is used by the cache to
+        convert the results pushed to it.
+        """
+        interdeps = self._rundescriber.interdeps
+        results_by_tree: Dict[str, ResultsList] = defaultdict(list)
+        for name, result in results:
+            results_by_tree[name].append(result)
+
+        new_data = {}
+        for name, tree_results in results_by_tree.items():
+            paramspecs = _get_paramspecs_of_one_param_tree(interdeps, name)
+            if not _can_read_typed_columns(paramspecs):
+                # results of trees with arrays are always given as rows
+                rows = [[result.get(ps.name) for ps in paramspecs]
+                        for result in tree_results
+                        if not isinstance(result, _ResultColumns)]
+                new_data[name] = (_convert_rows_to_columns(rows, paramspecs),
+                                  len(rows))
+                continue
+
+            # consecutive results given as rows are converted together
+            chunks: List[List[Any]] = []
+            rows = []
+            for result in tree_results:
+                if isinstance(result, _ResultColumns):
+                    if rows:
+                        chunks.append([list(column) for column in zip(*rows)])
+                        rows = []
+                    columns = dict(zip(result.names, result.columns))
+                    chunks.append([columns.get(ps.name) for ps in paramspecs])
+                else:
+                    rows.append([result.get(ps.name) for ps in paramspecs])
+            if rows:
+                chunks.append([list(column) for column in zip(*rows)])
+            tree_data = {
+                ps.name: numpy.concatenate([_typed_column(chunk[i], ps)
+                                            for chunk in chunks])
+                for i, ps in enumerate(paramspecs)}
+            new_data[name] = (tree_data, len(tree_data[name]))
+        return new_data
 
     def _load_to_dataframes(self, datadict: ParameterData) -> Dict[str, "pd.DataFrame"]:
-        dfs = {}
-        for name, subdict in datadict.items():
-            index = self._generate_pandas_index(subdict)
-            dfs[name] = self._data_to_dataframe(subdict, index)
-        return dfs
+        return {name: to_pandas_dataframe(subdict)
+                for name, subdict in datadict.items()}
 
     def write_data_to_text_file(self, path: str,
                                 single_file: bool = False,
@@ -1057,31 +2045,71 @@ class DataSet(Sized):
         Raises:
             DataLengthException: If the data of multiple parameters have not same
                                  length and wanted to be merged in a single file.
+                                 If only the arrays of array parameters differ
+                                 in length, this is found while writing the
+                                 file, which is then removed.
             DataPathException: If the data of multiple parameters are wanted to be merged
                                in a single file but no filename provided.
         """
         import pandas as pd
-        dfdict = self.get_data_as_pandas_dataframe()
-        dfs_to_save = list()
-        for parametername, df in dfdict.items():
-            if not single_file:
-                dst = os.path.join(path, f'{parametername}.dat')
-                df.to_csv(path_or_buf=dst, header=False, sep='\t')
-            else:
-                dfs_to_save.append(df)
-        if single_file:
-            df_length = len(dfs_to_save[0])
-            if any(len(df) != df_length for df in dfs_to_save):
-                raise DataLengthException("You cannot concatenate data " +
-                                          "with different length to a " +
-                                          "single file.")
-            if single_file_name == None:
-                raise DataPathException("Please provide the desired file name " +
-                                        "for the concatenated data.")
-            else:
-                dst = os.path.join(path, f'{single_file_name}.dat')
-                df_to_save = pd.concat(dfs_to_save, axis=1)
-                df_to_save.to_csv(path_or_buf=dst, header=False, sep='\t')
+        param_names = [ps.name for ps
+                       in self._rundescriber.interdeps.non_dependencies]
+        if not single_file:
+            for name in param_names:
+                dst = os.path.join(path, f'{name}.dat')
+                with open(dst, 'w', newline='') as dat_file:
+                    for chunk in self.iter_data_as_pandas_dataframe(name):
+                        chunk[name].to_csv(path_or_buf=dat_file,
+                                           header=False, sep='\t')
+            return
+
+        # the parameter trees are read in chunks of the same number of
+        # results side by side, which only match up if the trees have the
+        # same number of results
+        length_exception = DataLengthException("You cannot concatenate data " +
+                                               "with different length to a " +
+                                               "single file.")
+        n_rows = [self._number_of_results_of_tree(name)
+                  for name in param_names]
+        if any(n != n_rows[0] for n in n_rows):
+            raise length_exception
+        # the number of values of trees with array parameters can only be
+        # compared while reading the data, which is not done without a file
+        # to write it to
+        if single_file_name is None:
+            raise DataPathException("Please provide the desired file name " +
+                                    "for the concatenated data.")
+
+        def dfs_to_concatenate() -> Iterator[List["pd.Series"]]:
+            chunk_iterators = [self.iter_data_as_pandas_dataframe(name)
+                               for name in param_names]
+            for chunks in zip(*chunk_iterators):
+                dfs_to_save = [chunk[name] for chunk, name
+                               in zip(chunks, param_names)]
+                # the number of values per result can differ between
+                # trees with array parameters
+                if any(len(df) != len(dfs_to_save[0])
+                       for df in dfs_to_save):
+                    raise length_exception
+                yield dfs_to_save
+
+        dst = os.path.join(path, f'{single_file_name}.dat')
+        try:
+            with open(dst, 'w', newline='') as dat_file:
+                for dfs_to_save in dfs_to_concatenate():
+                    df_to_save = pd.concat(dfs_to_save, axis=1)
+                    df_to_save.to_csv(path_or_buf=dat_file, header=False,
+                                      sep='\t')
+        except DataLengthException:
+            os.remove(dst)
+            raise
+
+    def _number_of_results_of_tree(self, name: str) -> int:
+        sql = f"""
+              SELECT COUNT(*) FROM "{self.table_name}"
+              WHERE {name} IS NOT NULL
+              """
+        return one(atomic_transaction(self.conn, sql), 0)
 
     def subscribe(self,
                   callback: Callable[[Any, int, Optional[Any]], None],
@@ -1172,8 +2200,32 @@ class DataSet(Sized):
 
         return "\n".join(out)
 
+    def _result_layout(
+            self, params: Iterable[ParamSpecBase]) -> _ResultLayout:
+        """
+        Split the given parameters into the parameter trees (top level
+        parameters along with their setpoints and inferred parameters) and
+        the standalone parameters they contain. The layout only depends on
+        which parameters results are given for, so it can be reused for
+        all results for the same parameters.
+        """
+        interdeps = self._rundescriber.interdeps
+        params = set(params)
+
+        trees = []
+        toplevel_params = set(interdeps.dependencies).intersection(params)
+        for toplevel_param in toplevel_params:
+            inff_params = set(interdeps.inferences.get(toplevel_param, ()))
+            deps_params = set(interdeps.dependencies.get(toplevel_param, ()))
+            trees.append((toplevel_param, inff_params, deps_params))
+
+        standalones = set(interdeps.standalones).intersection(params)
+
+        return _ResultLayout(trees=trees, standalones=standalones)
+
     def _enqueue_results(
-            self, result_dict: Mapping[ParamSpecBase, numpy.ndarray]) -> None:
+            self, result_dict: Mapping[ParamSpecBase, numpy.ndarray],
+            layout: Optional[_ResultLayout] = None) -> None:
         """
         Enqueue the results into self._results
 
@@ -1183,21 +2235,39 @@ class DataSet(Sized):
         tree.
 
         Deal with 'numeric' type parameters. If a 'numeric' top level parameter
-        has non-scalar shape, it must be unrolled into a list of dicts of
-        single values (database).
+        has non-scalar shape, it must be unrolled into columns of single
+        values (database).
+
+        The layout of the parameters in ``result_dict`` is computed unless
+        it is given, which allows callers to compute it once for many
+        results for the same parameters.
+
+        If the cache receives pushes, the results are also tagged with
+        their parameter tree in self._results_for_cache.
+
+        Results are written in the order they are enqueued in. Hence only
+        the tree that results have been enqueued for last may have rows
+        pending in its buffer. Enqueuing results for any other tree moves
+        these rows to self._results and closes the buffer, since the
+        results of the trees are interleaved.
         """
         self._raise_if_not_writable()
-        interdeps = self._rundescriber.interdeps
 
-        toplevel_params = (set(interdeps.dependencies)
-                           .intersection(set(result_dict)))
-        for toplevel_param in toplevel_params:
-            inff_params = set(interdeps.inferences.get(toplevel_param, ()))
-            deps_params = set(interdeps.dependencies.get(toplevel_param, ()))
+        if layout is None:
+            layout = self._result_layout(result_dict)
+        push_to_cache = self.cache._receives_pushes
+
+        for toplevel_param, inff_params, deps_params in layout.trees:
+            buffer = self._result_buffers.get(toplevel_param.name)
+            self._move_buffered_results(keep=buffer, close=True)
+            if buffer is not None:
+                if buffer.append(toplevel_param, result_dict):
+                    continue
+                self._move_buffered_results()
             all_params = (inff_params
                           .union(deps_params)
                           .union({toplevel_param}))
-            res_dict: Dict[str, VALUE] = {}  # the dict to append to _results
+            res_list: ResultsList
             if toplevel_param.type == 'array':
                 res_list = self._finalize_res_dict_array(
                     result_dict, all_params)
@@ -1206,23 +2276,51 @@ class DataSet(Sized):
                                result_dict, toplevel_param,
                                inff_params, deps_params)
             else:
-                res_dict = {ps.name: result_dict[ps] for ps in all_params}
+                res_dict: Dict[str, VALUE] = {ps.name: result_dict[ps]
+                                              for ps in all_params}
                 res_list = [res_dict]
             self._results += res_list
+            if push_to_cache:
+                self._results_for_cache += [(toplevel_param.name, res)
+                                            for res in res_list]
 
         # Finally, handle standalone parameters
 
-        standalones = (set(interdeps.standalones)
-                       .intersection(set(result_dict)))
+        if layout.standalones:
+            self._move_buffered_results(close=True)
+            stdln_dict = {st: result_dict[st] for st in layout.standalones}
+            res_list = self._finalize_res_dict_standalones(stdln_dict)
+            self._results += res_list
+            if push_to_cache:
+                # there is one result per standalone parameter, in order
+                self._results_for_cache += [
+                    (param.name, res) for param, res in zip(stdln_dict,
+                                                            res_list)]
 
-        if standalones:
-            stdln_dict = {st: result_dict[st] for st in standalones}
-            self._results += self._finalize_res_dict_standalones(stdln_dict)
+    def _move_buffered_results(
+            self, keep: Optional[_ShapedResultBuffer] = None,
+            close: bool = False) -> None:
+        """
+        Move the rows pending in the result buffers, except in ``keep``, to
+        the end of self._results and optionally close these buffers.
+        """
+        for name, buffer in self._result_buffers.items():
+            if buffer is keep:
+                continue
+            pending = buffer.pending()
+            if pending is None:
+                continue
+            self._results.append(pending)
+            if self.cache._receives_pushes:
+                self._results_for_cache.append((name, pending))
+            buffer.mark_flushed()
+            if close:
+                buffer.closed = True
 
     @staticmethod
     def _finalize_res_dict_array(
             result_dict: Mapping[ParamSpecBase, values_type],
-            all_params: Set[ParamSpecBase]) -> List[Dict[str, VALUE]]:
+            all_params: Set[ParamSpecBase]) -> ResultsList:
         """
         Make a list of res_dicts out of the results for a 'array' type
         parameter. The results are assumed to already have been validated for
@@ -1256,15 +2354,16 @@ class DataSet(Sized):
             result_dict: Mapping[ParamSpecBase, numpy.ndarray],
             toplevel_param: ParamSpecBase,
             inff_params: Set[ParamSpecBase],
-            deps_params: Set[ParamSpecBase]) -> List[Dict[str, VALUE]]:
+            deps_params: Set[ParamSpecBase]) -> ResultsList:
         """
         Make a res_dict in the format expected by DataSet.add_results out
         of the results for a 'numeric' or text type parameter. This includes
         replicating and unrolling values as needed and also handling the corner
-        case of np.array(1) kind of values
+        case of np.array(1) kind of values. Non-scalar results are returned
+        as columns of values rather than as one res_dict per value.
         """
 
-        res_list: List[Dict[str, VALUE]] = []
+        res_list: ResultsList = []
         all_params = inff_params.union(deps_params).union({toplevel_param})
 
         t_map = {'numeric': float, 'text': str, 'complex': complex}
@@ -1289,41 +2388,42 @@ class DataSet(Sized):
                     flat_results[dep.name] = result_dict[dep].ravel()
             for inff in inff_params:
                 if numpy.shape(result_dict[inff]) == ():
-                    flat_results[inff.name] = numpy.repeat(result_dict[dep], N)
+                    flat_results[inff.name] = numpy.repeat(result_dict[inff], N)
                 else:
                     flat_results[inff.name] = result_dict[inff].ravel()
 
-            # And then put everything into the list
+            # And then put everything into the list as columns
 
-            res_list = [{p.name: flat_results[p.name][ind] for p in all_params}
-                        for ind in range(N)]
+            names = [p.name for p in all_params]
+            res_list = [_ResultColumns(
+                names=names,
+                columns=[flat_results[name] for name in names])]
 
         return res_list
 
     @staticmethod
     def _finalize_res_dict_standalones(
             result_dict: Mapping[ParamSpecBase, numpy.ndarray]
-    ) -> List[Dict[str, VALUE]]:
+    ) -> ResultsList:
         """
-        Massage all standalone parameters into the correct shape
+        Massage all standalone parameters into the correct shape. Non-scalar
+        numeric, text and complex values are returned as a column of values
+        rather than as one res_dict per value.
         """
-        res_list: List[Dict[str, VALUE]] = []
+        res_list: ResultsList = []
         for param, value in result_dict.items():
-            if param.type == 'text':
-                if value.shape:
-                    res_list += [{param.name: str(val)} for val in value]
-                else:
-                    res_list += [{param.name: str(value)}]
+            if param.type in ('numeric', 'text', 'complex') and value.shape:
+                column = value.ravel()
+                if param.type == 'text' and column.dtype.kind != 'U':
+                    column = column.astype(str)
+                res_list.append(_ResultColumns(names=[param.name],
+                                               columns=[column]))
+            elif param.type == 'text':
+                res_list += [{param.name: str(value)}]
             elif param.type == 'numeric':
-                if value.shape:
-                    res_list += [{param.name: number} for number in value]
-                else:
-                    res_list += [{param.name: float(value)}]
+                res_list += [{param.name: float(value)}]
             elif param.type == 'complex':
-                if value.shape:
-                    res_list += [{param.name: number} for number in value]
-                else:
-                    res_list += [{param.name: complex(value)}]
+                res_list += [{param.name: complex(value)}]
             else:
                 res_list += [{param.name: value}]
 
@@ -1342,15 +2442,33 @@ class DataSet(Sized):
 
         log.debug('Flushing to database')
         writer_status = self._writer_status
+        # the rows pending in a buffer are the most recent results
+        self._move_buffered_results()
+        items_dropped = self._items_dropped
         if len(self._results) > 0:
             try:
-
-                self.add_results(self._results)
+                # consecutive results given as rows are written together,
+                # results given as columns are written one block at a time
+                rows: List[Dict[str, VALUE]] = []
+                for result in self._results:
+                    if isinstance(result, _ResultColumns):
+                        if rows:
+                            self._add_results(rows)
+                            rows = []
+                        self._add_result_columns(result)
+                    else:
+                        rows.append(result)
+                if rows:
+                    self._add_results(rows)
                 if writer_status.write_in_background:
                     log.debug(f"Succesfully enqueued result for write thread")
                 else:
                     log.debug(f'Successfully wrote result to disk')
                 self._results = []
+                if self.cache._receives_pushes:
+                    self._push_flushed_results_to_cache(
+                        dropped=self._items_dropped > items_dropped)
+                self._results_for_cache = []
             except Exception as e:
                 if writer_status.write_in_background:
                     log.warning(f"Could not enqueue result; {e}")
@@ -1363,6 +2481,78 @@ class DataSet(Sized):
             log.debug(f"Waiting for write queue to empty.")
             writer_status.data_write_queue.join()
 
+        self._raise_if_writing_failed()
+
+    def _push_flushed_results_to_cache(self, dropped: bool) -> None:
+        """
+        Push the results that have just been flushed to the cache once they
+        have been written. The cache is updated from the results that have
+        been written rather than by reading them back.
+        """
+        if not self._writer_status.write_in_background:
+            self.cache._push(self._results_for_cache)
+        elif dropped:
+            # the results that have been dropped are not in the database
+            self._stop_pushing_to_cache()
+        else:
+            self._results_awaiting_write.append(
+                (self._items_enqueued, self._results_for_cache))
+            self._push_written_results_to_cache()
+
+    def _push_written_results_to_cache(self) -> None:
+        """
+        Push the results that the background writer has written to the
+        cache. If writing results has failed, the cache reads the data
+        from the database instead.
+        """
+        writer_status = self._writer_status
+        if self.table_name in writer_status.write_errors:
+            self._stop_pushing_to_cache()
+            return
+        items_done = writer_status.items_done.get(self.table_name, 0)
+        written: TaggedResultsList = []
+        while (self._results_awaiting_write
+               and self._results_awaiting_write[0][0] <= items_done):
+            written += self._results_awaiting_write.pop(0)[1]
+        if written:
+            self.cache._push(written)
+
+    def _stop_pushing_to_cache(self) -> None:
+        """
+        Let the cache read the data from the database from now on, starting
+        with the results that have not been pushed to it
+        """
+        self.cache._stop_receiving_pushes()
+        self._results_for_cache = []
+        self._results_awaiting_write = []
+
+    def _raise_if_writing_failed(self) -> None:
+        """
+        Raise the error of writing results of this :class:`.DataSet` in the
+        background, if any. Each error is only raised once.
+        """
+        message = self._writer_status.write_errors.pop(self.table_name, None)
+        if message is not None:
+            self._stop_pushing_to_cache()
+            raise RuntimeError(f'Writing results of run {self.run_id} to '
+                               f'the database in the background has failed, '
+                               f'some results are lost; {message}')
+
+
+def _typed_column(values: Any, paramspec: ParamSpecBase) -> numpy.ndarray:
+    """
+    Convert the values of a numeric, complex or text parameter to an array
+    with the dtype that they would be read from the database with
+    """
+    if paramspec.type == 'numeric':
+        return numpy.asarray(values, dtype=numpy.float64)
+    elif paramspec.type == 'complex':
+        return numpy.asarray(values, dtype=numpy.complex128)
+    column = numpy.asarray(values)
+    if column.dtype.kind != 'U':
+        column = column.astype(str)
+    return column
+
 
 # public api
 def load_by_id(run_id: int, conn: Optional[ConnectionPlus] = None) -> DataSet:
@@ -1386,7 +2576,7 @@ def load_by_id(run_id: int, conn: Optional[ConnectionPlus] = None) -> DataSet:
     if run_id is None:
         raise ValueError('run_id has to be a positive integer, not None.')
 
-    conn = conn or connect(get_DB_location())
+    conn = conn or connection_pool.connection(get_DB_location())
 
     d = DataSet(conn=conn, run_id=run_id)
     return d
@@ -1428,7 +2618,7 @@ def load_by_run_spec(*,
     Returns:
         :class:`.DataSet` matching the provided specification.
     """
-    conn = conn or connect(get_DB_location())
+    conn = conn or connection_pool.connection(get_DB_location())
     guids = get_guids_from_run_spec(conn,
                                     captured_run_id=captured_run_id,
                                     captured_counter=captured_counter,
@@ -1468,7 +2658,7 @@ def load_by_guid(guid: str, conn: Optional[ConnectionPlus] = None) -> DataSet:
         NameError: if no run with the given GUID exists in the database
         RuntimeError: if several runs with the given GUID are found
     """
-    conn = conn or connect(get_DB_location())
+    conn = conn or connection_pool.connection(get_DB_location())
 
     # this function raises a RuntimeError if more than one run matches the GUID
     run_id = get_runid_from_guid(conn, guid)
@@ -1499,7 +2689,7 @@ def load_by_counter(counter: int, exp_id: int,
     Returns:
         :class:`.DataSet` of the given counter in the given experiment
     """
-    conn = conn or connect(get_DB_location())
+    conn = conn or connection_pool.connection(get_DB_location())
     sql = """
     SELECT run_id
     FROM
@@ -1515,6 +2705,67 @@ def load_by_counter(counter: int, exp_id: int,
     return d
 
 
+def load_many(run_ids: Sequence[int],
+              *params: Union[str, ParamSpec, _BaseParameter],
+              conn: Optional[ConnectionPlus] = None,
+              max_workers: Optional[int] = None) -> Dict[int, ParameterData]:
+    """
+    Load the parameter data of many runs, as returned by
+    :meth:`.DataSet.get_parameter_data`, concurrently. The runs are read by
+    a pool of threads with a read-only connection to the database each.
+
+    If no connection is provided, the runs are loaded from the database file
+    that is specified in the config.
+
+    Args:
+        run_ids: run ids of the datasets to load
+        *params: string parameter names, QCoDeS Parameter objects, and
+            ParamSpec objects to load the data of. If no parameters are
+            supplied the data of all parameters that are not a dependency
+            of another parameter are loaded.
+        conn: connection to the database to load from
+        max_workers: the maximal number of threads to load the runs with.
+            Defaults to the number of CPUs that this process may use, since
+            loading the data is mostly bound by the CPU.
+
+    Returns:
+        Dictionary from run ids to the parameter data of the runs
+    """
+    conn = conn or connection_pool.connection(get_DB_location())
+    path_to_db = conn.path_to_dbfile
+    if path_to_db in ('', ':memory:'):
+        # other connections can not see an in-memory database
+        return {run_id: DataSet(conn=conn, run_id=run_id
+                                ).get_parameter_data(*params)
+                for run_id in run_ids}
+
+    if max_workers is None:
+        try:
+            max_workers = len(os.sched_getaffinity(0))
+        except AttributeError:
+            # sched_getaffinity is not available on all platforms
+            max_workers = os.cpu_count() or 1
+
+    thread_data = local()
+    connections: List[ConnectionPlus] = []
+
+    def load(run_id: int) -> ParameterData:
+        thread_conn = getattr(thread_data, 'conn', None)
+        if thread_conn is None:
+            thread_conn = thread_data.conn = connect_read_only(path_to_db)
+            connections.append(thread_conn)
+        return DataSet(conn=thread_conn, run_id=run_id
+                       ).get_parameter_data(*params)
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            data = executor.map(load, run_ids)
+            return dict(zip(run_ids, data))
+    finally:
+        for thread_conn in connections:
+            thread_conn.close()
+
+
 def new_data_set(name: str,
                  exp_id: Optional[int] = None,
                  specs: Optional[SPECS] = None,
@@ -1,13 +1,182 @@
-from typing import TYPE_CHECKING, Dict, Optional
+import logging
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Dict, Mapping, Optional, Sequence, Tuple
 
+import numpy as np
+
+import qcodes
+
+from qcodes.dataset.data_conversion import to_xarray_dataset
 from qcodes.dataset.descriptions.rundescriber import RunDescriber
 from qcodes.dataset.sqlite.queries import (
+    append_parameter_data_to_existing_arrays,
     append_shaped_parameter_data_to_existing_arrays, completed)
 
 if TYPE_CHECKING:
     import pandas as pd
+    import xarray as xr
+
+    from .data_set import DataSet, ParameterData, TaggedResultsList
+
+log = logging.getLogger(__name__)
+
+#: the number of rows of results that may be pushed to a cache without it
+#: being read, before the cache stops receiving pushes
+_MAX_PENDING_ROWS = 100000
+
+
+#: the data of a parameter tree and the number of rows it has been read from
+ParameterTreeData = Tuple[Dict[str, np.ndarray], int]
+
+
+def _nbytes(tree_data: ParameterTreeData) -> int:
+    data, _ = tree_data
+    nbytes = 0
+    for values in data.values():
+        nbytes += values.nbytes
+        if values.dtype.hasobject:
+            nbytes += sum(getattr(value, 'nbytes', 0)
+                          for value in values.ravel())
+    return nbytes
+
+
+def _copy_tree_data(tree_data: ParameterTreeData) -> ParameterTreeData:
+    """
+    Copy the arrays of the data of a parameter tree, including the arrays
+    that are the elements of arrays of objects
+    """
+    data, n_rows = tree_data
+    copied_data = {}
+    for name, values in data.items():
+        copied_values = values.copy()
+        if copied_values.dtype.hasobject:
+            flat_values = copied_values.reshape(-1)
+            for i, value in enumerate(flat_values):
+                if isinstance(value, np.ndarray):
+                    flat_values[i] = value.copy()
+        copied_data[name] = copied_values
+    return copied_data, n_rows
+
+
+class SharedParameterDataCache:
+    """
+    A process-wide cache of the data of the parameter trees of completed
+    runs by the GUID of the run. The data of a completed run does not
+    change, so it is read from the database once and then shared by all
+    :class:`.DataSet` objects of the run, e.g. by the datasets returned by
+    :func:`.load_by_id` and :func:`.load_by_guid` and the dataset loaded by
+    :func:`.plot_dataset`. The cached arrays are private to the cache: it
+    stores copies of the data that it is given and hands out copies of the
+    cached data, such that one dataset can not change the data of another
+    and the data handed out can be modified. Copying the data is still much
+    faster than reading it from the database.
+
+    GUIDs are generated from the time in ms, so runs that are created
+    within the same ms may have the same GUID. The data is therefore only
+    shared by datasets of the run in the same database, which is checked
+    by the path of the database and the run id of the run in it.
+
+    The data of the least recently used runs is evicted once the size of
+    the cached data exceeds ``config['dataset']['shared_cache_max_bytes']``
+    bytes. Setting it to 0 disables the cache.
+    """
+
+    def __init__(self) -> None:
+        self._runs: 'OrderedDict[str, Dict[str, ParameterTreeData]]' = \
+            OrderedDict()
+        self._sources: Dict[str, Tuple[str, int]] = {}
+        self._nbytes: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def max_bytes(self) -> int:
+        return int(qcodes.config.dataset.shared_cache_max_bytes)
+
+    @property
+    def nbytes(self) -> int:
+        """The number of bytes of the cached data"""
+        return sum(self._nbytes.values())
+
+    def __len__(self) -> int:
+        return len(self._runs)
+
+    def __contains__(self, guid: object) -> bool:
+        return guid in self._runs
+
+    def get(self, guid: str, source: Tuple[str, int], names: Sequence[str]
+            ) -> Dict[str, ParameterTreeData]:
+        """
+        Get the cached data of the given parameter trees of a run
+
+        Args:
+            guid: the GUID of the run
+            source: the path of the database and the run id of the run
+            names: the names of the dependent parameters of the trees
+
+        Returns:
+            Copies of the data of those of the trees that are cached by the
+            name of the dependent parameter
+        """
+        with self._lock:
+            trees = self._runs.get(guid)
+            if trees is None or self._sources[guid] != source:
+                return {}
+            self._runs.move_to_end(guid)
+            cached_trees = {name: trees[name] for name in names
+                            if name in trees}
+        return {name: _copy_tree_data(tree_data)
+                for name, tree_data in cached_trees.items()}
+
+    def put(self, guid: str, source: Tuple[str, int],
+            trees: Mapping[str, ParameterTreeData]) -> None:
+        """
+        Add copies of the data of parameter trees of a completed run to the
+        cache and evict the data of the least recently used runs if the
+        cache is full. The given data is not modified.
+
+        Args:
+            guid: the GUID of the run
+            source: the path of the database and the run id of the run
+            trees: the data of the parameter trees by the name of the
+                dependent parameter, as returned by
+                :func:`.get_parameter_data_for_one_paramtree`
+        """
+        max_bytes = self.max_bytes
+        nbytes = sum(_nbytes(tree_data) for tree_data in trees.values())
+        with self._lock:
+            if self._sources.get(guid, source) != source:
+                # the data of another run with the same GUID is replaced
+                self._remove(guid)
+            if self._nbytes.get(guid, 0) + nbytes > max_bytes:
+                return
+            self._runs.setdefault(guid, {}).update(
+                (name, _copy_tree_data(tree_data))
+                for name, tree_data in trees.items())
+            self._runs.move_to_end(guid)
+            self._sources[guid] = source
+            self._nbytes[guid] = self._nbytes.get(guid, 0) + nbytes
+            while sum(self._nbytes.values()) > max_bytes:
+                evicted_guid = next(iter(self._runs))
+                self._remove(evicted_guid)
+                log.debug(f'Evicted the data of {evicted_guid} from the '
+                          f'shared cache')
+
+    def _remove(self, guid: str) -> None:
+        del self._runs[guid]
+        del self._sources[guid]
+        del self._nbytes[guid]
+
+    def clear(self) -> None:
+        """Remove the data of all runs from the cache"""
+        with self._lock:
+            self._runs.clear()
+            self._sources.clear()
+            self._nbytes.clear()
+
 
-    from .data_set import DataSet, ParameterData
+#: the cache of the data of completed runs shared by all datasets
+shared_cache = SharedParameterDataCache()
 
 
 class DataSetCache:
@@ -17,6 +186,11 @@ class DataSetCache:
     from the db as it is written. The cache is available in the same formats
     as :py:class:`.DataSet.get_parameter_data` and :py:class:`.DataSet.get_data_as_pandas_dataframe`
 
+    The cache of the :py:class:`.DataSet` that results are added to in this
+    process does not read from the db. Instead, the dataset pushes the
+    results to the cache once they have been written to the db, and they
+    are added to the cached data the next time that the cache is read. If
+    results can not be written, the cache reads from the db again.
     """
 
     def __init__(self, dataset: 'DataSet'):
@@ -26,7 +200,15 @@ class DataSetCache:
         self._read_status: Dict[str, int] = {}
         #: number of rows written per parameter tree (by the name of the dependent parameter)
         self._write_status: Dict[str, Optional[int]] = {}
+        #: buffers backing the arrays of parameters of unknown shape
+        #: (by the name of the dependent parameter and the parameter)
+        self._buffers: Dict[str, Dict[str, np.ndarray]] = {}
         self._loaded_from_completed_ds = False
+        #: whether the data is pushed to the cache by the dataset writing it
+        self._receives_pushes = False
+        #: results that have been pushed but not added to the data yet
+        self._pending_results: TaggedResultsList = []
+        self._n_pending_rows = 0
 
     @property
     def rundescriber(self) -> RunDescriber:
@@ -43,9 +225,21 @@ class DataSetCache:
         """
         if self._loaded_from_completed_ds:
             return
+        if self._receives_pushes:
+            self._dataset._push_written_results_to_cache()
+        if self._receives_pushes:
+            self._append_pending_results()
+            if self._dataset.completed:
+                self._loaded_from_completed_ds = True
+                self._release_buffers()
+            return
         self._dataset._completed = completed(self._dataset.conn, self._dataset.run_id)
         if self._dataset.completed:
             self._loaded_from_completed_ds = True
+            if not self._read_status:
+                if not self._load_materialised_columns():
+                    self._load_completed_data()
+                return
 
         (self._write_status,
          self._read_status,
@@ -55,9 +249,120 @@ class DataSetCache:
             self.rundescriber,
             self._write_status,
             self._read_status,
-            self._data
+            self._data,
+            self._buffers
         )
 
+        if self._loaded_from_completed_ds:
+            self._release_buffers()
+
+    def _start_receiving_pushes(self) -> None:
+        """
+        Let the dataset push the results that it writes to the cache rather
+        than reading the data from the db
+        """
+        self._receives_pushes = True
+        self._append_to_data({})
+
+    def _stop_receiving_pushes(self) -> None:
+        """
+        Read the data from the db again, starting with the results that have
+        been pushed but not added to the data yet
+        """
+        self._receives_pushes = False
+        self._pending_results = []
+        self._n_pending_rows = 0
+
+    def _push(self, results: 'TaggedResultsList') -> None:
+        """
+        Push results that have been written to the db to the cache. If the
+        cache is not read while many results are pushed to it, it stops
+        receiving pushes so as not to hold on to the results.
+
+        Args:
+            results: the results along with the name of the parameter tree
+                they belong to, as enqueued by the dataset
+        """
+        self._pending_results += results
+        self._n_pending_rows += sum(
+            len(result) if not isinstance(result, dict) else 1
+            for _, result in results)
+        if self._n_pending_rows > _MAX_PENDING_ROWS:
+            log.debug(f'The cache of {self._dataset.guid} has not been read '
+                      f'while {self._n_pending_rows} rows have been pushed '
+                      f'to it. Reading the data from the db instead.')
+            self._stop_receiving_pushes()
+
+    def _append_pending_results(self) -> None:
+        if not self._pending_results:
+            return
+        new_data = self._dataset._results_to_parameter_data(
+            self._pending_results)
+        self._pending_results = []
+        self._n_pending_rows = 0
+        self._append_to_data(new_data)
+
+    def _append_to_data(
+            self, new_data: Mapping[str, Tuple[Dict[str, np.ndarray], int]]
+    ) -> None:
+        (self._write_status,
+         self._read_status,
+         self._data) = append_parameter_data_to_existing_arrays(
+            self.rundescriber,
+            self._write_status,
+            self._read_status,
+            self._data,
+            new_data,
+            self._buffers
+        )
+
+    def _load_materialised_columns(self) -> bool:
+        """
+        Use the materialised columns of the dataset as the cached data if
+        there are columns for all parameter trees with the shapes that the
+        data would have been loaded with from the database. Returns
+        whether the columns are used.
+        """
+        columns = self._dataset._read_materialised_columns()
+        if columns is None:
+            return False
+        shapes = self.rundescriber.shapes or {}
+        for paramspec in self.rundescriber.interdeps.non_dependencies:
+            tree = columns.get(paramspec.name)
+            if tree is None:
+                return False
+            shape = shapes.get(paramspec.name)
+            if shape is not None and any(values.shape != tuple(shape)
+                                         for values in tree.values()):
+                return False
+        self._data = columns
+        return True
+
+    def _load_completed_data(self) -> None:
+        """
+        Load all data of the completed dataset, which is shared with the
+        other datasets of the same run, see :class:`SharedParameterDataCache`
+        """
+        names = [paramspec.name for paramspec in
+                 self.rundescriber.interdeps.non_dependencies]
+        self._append_to_data(
+            self._dataset._load_completed_parameter_trees(names))
+        self._release_buffers()
+
+    def _release_buffers(self) -> None:
+        """
+        Replace the views on buffers by trimmed copies of them, such that
+        the unused capacity of the buffers is released
+        """
+        for meas_parameter, buffers in self._buffers.items():
+            subtree_data = self._data.get(meas_parameter, {})
+            for name, buffer in buffers.items():
+                values = subtree_data.get(name)
+                if (buffer is not None and values is not None
+                        and len(values) < len(buffer)):
+                    subtree_data[name] = values.copy()
+        self._buffers = {}
+
     def data(self) -> 'ParameterData':
         """
         Loads data from the database on disk if needed and returns
@@ -88,3 +393,20 @@ class DataSetCache:
             return None
         dfs = self._dataset._load_to_dataframes(self._data)
         return dfs
+
+    def to_xarray_dataset(self) -> Optional["xr.Dataset"]:
+        """
+        Convert the cached dataset to an xarray Dataset. The returned
+        dataset is in the same format as
+        :py:meth:`.DataSet.to_xarray_dataset`. The data of parameter trees
+        whose setpoints form a grid, such as the data of a run with shapes,
+        is not copied.
+
+        Returns:
+            An :py:class:`xarray.Dataset` with a data variable per parameter
+            tree.
+        """
+        self.load_data_from_db()
+        if self._data is None:
+            return None
+        return to_xarray_dataset(self._data)
@@ -1,8 +1,10 @@
 import os
-from typing import Optional, Union
+import sys
+from typing import Iterator, List, Optional, Sequence, Union
 from warnings import warn
 
 import numpy as np
+from tqdm import tqdm
 
 from qcodes.dataset.data_set import DataSet
 from qcodes.dataset.descriptions.versioning.converters import new_to_old
@@ -12,24 +14,42 @@ from qcodes.dataset.sqlite.database import (
     connect, get_db_version_and_newest_available_version)
 from qcodes.dataset.sqlite.queries import (add_meta_data, create_run,
                                            get_exp_ids_from_run_ids,
+                                           get_guid_from_run_id,
+                                           get_guids_from_run_spec,
                                            get_matching_exp_ids,
-                                           get_runid_from_guid,
                                            is_run_id_in_database,
                                            mark_run_complete, new_experiment)
 from qcodes.dataset.sqlite.query_helpers import (select_many_where,
                                                  sql_placeholder_string)
+from qcodes.dataset.sqlite.result_shards import get_result_shard
+
+#: the schema name under which the source database is attached to the
+#: connection to the target database
+_SOURCE_SCHEMA = 'extract_source'
 
 
 def extract_runs_into_db(source_db_path: str,
                          target_db_path: str, *run_ids: int,
                          upgrade_source_db: bool = False,
-                         upgrade_target_db: bool = False) -> None:
+                         upgrade_target_db: bool = False,
+                         batch_size: Optional[int] = None,
+                         show_progress: bool = False) -> None:
     """
     Extract a selection of runs into another DB file. All runs must come from
     the same experiment. They will be added to an experiment with the same name
     and ``sample_name`` in the target db. If such an experiment does not exist, it
     will be created.
 
+    Runs whose GUID is already in the target DB file are skipped, so an
+    interrupted extraction of many runs with a ``batch_size`` can be resumed
+    by calling this function again with the same arguments. The results of
+    the runs are copied by the database itself (the source DB file is
+    attached to the connection to the target DB file), without reading
+    them into python. The runs are copied one after the other, and the
+    bookkeeping of each run (its entry in the runs table, its metadata and
+    its parameters) is inserted run by run within the transaction of its
+    batch.
+
     Args:
         source_db_path: Path to the source DB file
         target_db_path: Path to the target DB file. The target DB file will be
@@ -39,7 +59,15 @@ def extract_runs_into_db(source_db_path: str,
           not the newest, should it be upgraded?
         upgrade_target_db: If the target DB is found to be in a version that is
           not the newest, should it be upgraded?
+        batch_size: The number of runs that are copied per transaction. If
+          None, all runs are copied in a single transaction, such that no
+          run is copied if copying any of them fails.
+        show_progress: Whether to show a progress bar of the copied runs
     """
+    if batch_size is not None and batch_size < 1:
+        raise ValueError(f'batch_size must be a positive integer, not '
+                         f'{batch_size}')
+
     # Check for versions
     (s_v, new_v) = get_db_version_and_newest_available_version(source_db_path)
     if s_v < new_v and not upgrade_source_db:
@@ -95,30 +123,66 @@ def extract_runs_into_db(source_db_path: str,
 
     target_conn = connect(target_db_path)
 
+    # Runs that are already in the target DB file have been extracted
+    # before, e.g. by an extraction that has been interrupted
+    target_guids = set(get_guids_from_run_spec(target_conn))
+    run_ids_to_copy = []
+    for run_id in run_ids:
+        guid = get_guid_from_run_id(source_conn, run_id)
+        if guid not in target_guids:
+            target_guids.add(guid)
+            run_ids_to_copy.append(run_id)
+
+    pbar = tqdm(total=len(run_ids_to_copy), file=sys.stdout,
+                disable=not show_progress)
+    pbar.set_description("Extracting runs")
+
     # this function raises if the target DB file has several experiments
     # matching both the name and sample_name
 
     try:
-        with atomic(target_conn) as target_conn:
-
-            target_exp_id = _create_exp_if_needed(target_conn,
-                                                  exp_attrs['name'],
-                                                  exp_attrs['sample_name'],
-                                                  exp_attrs['format_string'],
-                                                  exp_attrs['start_time'],
-                                                  exp_attrs['end_time'])
-
-            # Finally insert the runs
-            for run_id in run_ids:
-                _extract_single_dataset_into_db(DataSet(run_id=run_id,
-                                                        conn=source_conn),
-                                                target_conn,
-                                                target_exp_id)
+        # a database can not be attached within a transaction
+        target_conn.execute(f"ATTACH DATABASE ? AS {_SOURCE_SCHEMA}",
+                            (source_db_path,))
+        target_exp_id = None
+        for batch in _batches(run_ids_to_copy, batch_size):
+            with atomic(target_conn) as target_conn:
+
+                if target_exp_id is None:
+                    target_exp_id = _create_exp_if_needed(
+                        target_conn,
+                        exp_attrs['name'],
+                        exp_attrs['sample_name'],
+                        exp_attrs['format_string'],
+                        exp_attrs['start_time'],
+                        exp_attrs['end_time'])
+
+                # Finally insert the runs
+                for run_id in batch:
+                    _extract_single_dataset_into_db(DataSet(run_id=run_id,
+                                                            conn=source_conn),
+                                                    target_conn,
+                                                    target_exp_id)
+            pbar.update(len(batch))
     finally:
+        pbar.close()
         source_conn.close()
         target_conn.close()
 
 
+def _batches(run_ids: Sequence[int],
+             batch_size: Optional[int]) -> Iterator[List[int]]:
+    """
+    Split the run ids into batches of the given size, or a single batch if
+    the size is None. There is always at least one (maybe empty) batch.
+    """
+    if batch_size is None or len(run_ids) == 0:
+        yield list(run_ids)
+        return
+    for start in range(0, len(run_ids), batch_size):
+        yield list(run_ids[start:start + batch_size])
+
+
 def _create_exp_if_needed(target_conn: ConnectionPlus,
                           exp_name: str,
                           sample_name: str,
@@ -164,13 +228,12 @@ def _extract_single_dataset_into_db(dataset: DataSet,
     meth:`extract_runs_into_db`
 
     Insert the given dataset into the specified database file as the latest
-    run.
-
-    Trying to insert a run already in the DB is a NOOP.
+    run. The caller must make sure that the run is not already in the DB.
 
     Args:
         dataset: A dataset representing the run to be copied
-        target_conn: connection to the DB. Must be atomically guarded
+        target_conn: connection to the DB, which the DB of the dataset is
+          attached to. Must be atomically guarded
         target_exp_id: The ``exp_id`` of the (target DB) experiment in which to
           insert the run
     """
@@ -180,13 +243,6 @@ def _extract_single_dataset_into_db(dataset: DataSet,
                          'can not be copied. The incomplete dataset has '
                          f'GUID: {dataset.guid} and run_id: {dataset.run_id}')
 
-    source_conn = dataset.conn
-
-    run_id = get_runid_from_guid(target_conn, dataset.guid)
-
-    if run_id != -1:
-        return
-
     if dataset.parameters is not None:
         param_names = dataset.parameters.split(',')
     else:
@@ -213,7 +269,15 @@ def _extract_single_dataset_into_db(dataset: DataSet,
             captured_counter=captured_counter,
             parent_dataset_links=parent_dataset_links)
 
-    _populate_results_table(source_conn,
+    if get_result_shard(dataset.conn, dataset.run_id) is None:
+        _populate_results_table(target_conn,
+                                dataset.table_name,
+                                target_table_name)
+    else:
+        # the result shard can not be attached to the connection to the
+        # target DB within the transaction, so the results are copied
+        # through the connection of the dataset
+        _copy_results_table(dataset.conn,
                             target_conn,
                             dataset.table_name,
                             target_table_name)
@@ -227,31 +291,60 @@ def _extract_single_dataset_into_db(dataset: DataSet,
         add_meta_data(target_conn, target_run_id, {'snapshot': snapshot_raw})
 
 
-def _populate_results_table(source_conn: ConnectionPlus,
-                            target_conn: ConnectionPlus,
+def _populate_results_table(target_conn: ConnectionPlus,
                             source_table_name: str,
                             target_table_name: str) -> None:
     """
-    Copy over all the entries of the results table
+    Copy over all the entries of the results table of the source DB, which
+    must be attached to the connection to the target DB
+    """
+    cursor = target_conn.cursor()
+    cursor.execute(f'PRAGMA {_SOURCE_SCHEMA}.table_info'
+                   f'("{source_table_name}")')
+    column_names = ','.join(f'"{row["name"]}"' for row in cursor.fetchall()
+                            if row['name'] != 'id')
+    if not column_names:
+        # the run has no parameters, so there are no results to copy
+        return
+
+    copy_data_query = f"""
+                      INSERT INTO "{target_table_name}"
+                      ({column_names})
+                      SELECT {column_names}
+                      FROM {_SOURCE_SCHEMA}."{source_table_name}"
+                      ORDER BY id
+                      """
+    cursor.execute(copy_data_query)
+
+
+def _copy_results_table(source_conn: ConnectionPlus,
+                        target_conn: ConnectionPlus,
+                        source_table_name: str,
+                        target_table_name: str) -> None:
+    """
+    Copy over all the entries of a results table that can be queried with
+    the source connection
     """
-    get_data_query = f"""
-                     SELECT *
-                     FROM "{source_table_name}"
-                     """
-
-    source_cursor = source_conn.cursor()
-    target_cursor = target_conn.cursor()
-
-    for row in source_cursor.execute(get_data_query):
-        column_names = ','.join(row.keys()[1:])  # the first key is "id"
-        values = tuple(val for val in row[1:])
-        value_placeholders = sql_placeholder_string(len(values))
-        insert_data_query = f"""
-                             INSERT INTO "{target_table_name}"
-                             ({column_names})
-                             values {value_placeholders}
-                             """
-        target_cursor.execute(insert_data_query, values)
+    cursor = source_conn.cursor()
+    cursor.execute(f'PRAGMA table_info("{source_table_name}")')
+    column_names = ','.join(f'"{row["name"]}"' for row in cursor.fetchall()
+                            if row['name'] != 'id')
+    if not column_names:
+        # the run has no parameters, so there are no results to copy
+        return
+
+    rows = cursor.execute(f"""
+                          SELECT {column_names}
+                          FROM "{source_table_name}"
+                          ORDER BY id
+                          """)
+    value_placeholders = sql_placeholder_string(len(rows.description))
+    insert_data_query = f"""
+                        INSERT INTO "{target_table_name}"
+                        ({column_names})
+                        VALUES {value_placeholders}
+                        """
+    target_conn.cursor().executemany(insert_data_query, rows)
 
 
 def _rewrite_timestamps(target_conn: ConnectionPlus, target_run_id: int,
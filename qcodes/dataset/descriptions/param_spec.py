@@ -3,14 +3,20 @@ from typing import Any, List, Optional, Sequence, Union
 
 from typing_extensions import TypedDict
 
+from qcodes.dataset.array_codecs import validate_codec
 
-class ParamSpecBaseDict(TypedDict):
+
+class _ParamSpecBaseDictRequired(TypedDict):
     name: str
     paramtype: str
     label: Optional[str]
     unit: Optional[str]
 
 
+class ParamSpecBaseDict(_ParamSpecBaseDictRequired, total=False):
+    codec: str
+
+
 class ParamSpecDict(ParamSpecBaseDict):
     inferred_from: List[str]
     depends_on: List[str]
@@ -24,13 +30,18 @@ class ParamSpecBase:
                  name: str,
                  paramtype: str,
                  label: Optional[str] = None,
-                 unit: Optional[str] = None):
+                 unit: Optional[str] = None,
+                 codec: Optional[str] = None):
         """
         Args:
             name: name of the parameter
             paramtype: type of the parameter, i.e. the SQL storage class
             label: label of the parameter
             unit: The unit of the parameter
+            codec: The codec to compress the values of the parameter with
+                when storing them, see
+                :mod:`qcodes.dataset.array_codecs`. Only
+                parameters of type 'array' can be compressed.
         """
 
         if not isinstance(paramtype, str):
@@ -43,11 +54,17 @@ class ParamSpecBase:
                              'identifier names are allowed (no spaces or '
                              'punctuation marks, no prepended '
                              'numbers, etc.)')
+        if codec is not None:
+            validate_codec(codec)
+            if paramtype.lower() != 'array':
+                raise ValueError(f'Invalid codec for {name}. Only parameters '
+                                 f'of type array can be compressed.')
 
         self.name = name
         self.type = paramtype.lower()
         self.label = label or ''
         self.unit = unit or ''
+        self.codec = codec
 
         self._hash: int = self._compute_hash()
 
@@ -55,7 +72,7 @@ class ParamSpecBase:
         """
         This method should only be called by __init__
         """
-        attrs = ['name', 'type', 'label', 'unit']
+        attrs = ['name', 'type', 'label', 'unit', 'codec']
         # First, get the hash of the tuple with all the relevant attributes
         all_attr_tuple_hash = hash(
             tuple(getattr(self, attr) for attr in attrs)
@@ -72,13 +89,14 @@ class ParamSpecBase:
         return f"{self.name} {self.type}"
 
     def __repr__(self) -> str:
+        codec = '' if self.codec is None else f", codec='{self.codec}'"
         return (f"ParamSpecBase('{self.name}', '{self.type}', '{self.label}', "
-                f"'{self.unit}')")
+                f"'{self.unit}'{codec})")
 
     def __eq__(self, other: Any) -> bool:
         if not isinstance(other, ParamSpecBase):
             return False
-        attrs = ['name', 'type', 'label', 'unit']
+        attrs = ['name', 'type', 'label', 'unit', 'codec']
         for attr in attrs:
             if getattr(self, attr) != getattr(other, attr):
                 return False
@@ -98,6 +116,10 @@ class ParamSpecBase:
                                    paramtype=self.type,
                                    label=self.label,
                                    unit=self.unit)
+        # the codec is left out if not used such that the representation
+        # can be read by versions of QCoDeS that do not know about codecs
+        if self.codec is not None:
+            output['codec'] = self.codec
         return output
 
     @classmethod
@@ -113,7 +135,8 @@ class ParamSpecBase:
         return ParamSpecBase(name=ser['name'],
                              paramtype=ser['paramtype'],
                              label=ser['label'],
-                             unit=ser['unit'])
+                             unit=ser['unit'],
+                             codec=ser.get('codec'))
 
 
 class ParamSpec(ParamSpecBase):
@@ -3,6 +3,7 @@ from typing import Optional, List, Any
 import logging
 
 import qcodes
+from qcodes.dataset.catalogue import RunRecord, run_catalogue
 from qcodes.dataset.data_set import (DataSet, load_by_id, load_by_counter,
                                      new_data_set, SPECS)
 from qcodes.dataset.sqlite.connection import transaction, ConnectionPlus
@@ -10,9 +11,9 @@ from qcodes.dataset.sqlite.queries import new_experiment as ne, \
     finish_experiment, get_run_counter, get_runs, get_last_run, \
     get_last_experiment, get_experiments, \
     get_experiment_name_from_experiment_id, get_runid_from_expid_and_counter, \
-    get_sample_name_from_experiment_id
+    get_sample_name_from_experiment_id, get_number_of_runs
 from qcodes.dataset.sqlite.database import get_DB_location, get_DB_debug, \
-    connect, conn_from_dbpath_or_conn
+    conn_from_dbpath_or_conn, connection_pool
 from qcodes.dataset.sqlite.query_helpers import select_one_where, VALUES
 
 log = logging.getLogger(__name__)
@@ -139,10 +140,24 @@ class Experiment(Sized):
         return DataSet(run_id=run_id, conn=self.conn)
 
     def data_sets(self) -> List[DataSet]:
-        """Get all the datasets of this experiment"""
+        """
+        Get all the datasets of this experiment
+
+        Note that all the datasets are loaded from the database, which is
+        slow for experiments with many runs. Use :meth:`runs` to list the
+        runs of the experiment without loading their datasets, and load only
+        the datasets that are needed with :func:`.load_by_id`.
+        """
         runs = get_runs(self.conn, self.exp_id)
         return [load_by_id(run['run_id'], conn=self.conn) for run in runs]
 
+    def runs(self) -> List[RunRecord]:
+        """
+        Get the records of all the runs of this experiment, without loading
+        their datasets, see :func:`.run_catalogue`
+        """
+        return run_catalogue(exp_id=self.exp_id, conn=self.conn)
+
     def last_data_set(self) -> DataSet:
         """Get the last dataset of this experiment"""
         run_id = get_last_run(self.conn, self.exp_id)
@@ -158,7 +173,7 @@ class Experiment(Sized):
         finish_experiment(self.conn, self.exp_id)
 
     def __len__(self) -> int:
-        return len(self.data_sets())
+        return get_number_of_runs(self.conn, self.exp_id)
 
     def __repr__(self) -> str:
         out = [
@@ -166,8 +181,8 @@ class Experiment(Sized):
         ]
         out.append("-" * len(out[0]))
         out += [
-            f"{d.run_id}-{d.name}-{d.counter}-{d.parameters}-{len(d)}"
-            for d in self.data_sets()
+            f"{r.run_id}-{r.name}-{r.counter}-{r.parameters}-{r.length}"
+            for r in self.runs()
         ]
         return "\n".join(out)
 
@@ -208,7 +223,7 @@ def new_experiment(name: str,
     Returns:
         the new experiment
     """
-    conn = conn or connect(get_DB_location())
+    conn = conn or connection_pool.connection(get_DB_location())
     return Experiment(name=name, sample_name=sample_name,
                       format_string=format_string,
                       conn=conn)
@@ -240,7 +255,8 @@ def load_last_experiment() -> Experiment:
     Returns:
         last experiment
     """
-    last_exp_id = get_last_experiment(connect(get_DB_location()))
+    conn = connection_pool.connection(get_DB_location())
+    last_exp_id = get_last_experiment(conn)
     if last_exp_id is None:
         raise ValueError('There are no experiments in the database file')
     return Experiment(exp_id=last_exp_id)
@@ -267,7 +283,7 @@ def load_experiment_by_name(name: str,
     Raises:
         ValueError if the name is not unique and sample name is None.
     """
-    conn = conn or connect(get_DB_location())
+    conn = conn or connection_pool.connection(get_DB_location())
 
     if sample:
         sql = """
@@ -323,7 +339,7 @@ def load_or_create_experiment(experiment_name: str,
     Returns:
         The found or created experiment
     """
-    conn = conn or connect(get_DB_location())
+    conn = conn or connection_pool.connection(get_DB_location())
     try:
         experiment = load_experiment_by_name(experiment_name, sample_name,
                                              conn=conn)
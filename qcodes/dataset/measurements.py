@@ -5,6 +5,7 @@ using the :class:`.Measurement` class.
 """
 
 
+import dataclasses
 import io
 import json
 import logging
@@ -16,15 +17,16 @@ from numbers import Number
 from time import perf_counter
 from types import TracebackType
 from typing import (Any, Callable, Dict, List, Mapping, MutableMapping,
-                    MutableSequence, Optional, Sequence, Tuple, Type, TypeVar,
-                    Union, cast)
+                    MutableSequence, Optional, Sequence, Set, Tuple, Type,
+                    TypeVar, Union, cast)
 
 import numpy as np
 
 import qcodes as qc
 import qcodes.utils.validators as vals
 from qcodes import Station
-from qcodes.dataset.data_set import (VALUE, DataSet, load_by_guid, res_type,
+from qcodes.dataset.data_set import (VALUE, DataSet, WriterStatistics,
+                                     _ResultLayout, load_by_guid, res_type,
                                      setpoints_type, values_type)
 from qcodes.dataset.descriptions.dependencies import (DependencyError,
                                                       InferenceError,
@@ -34,6 +36,7 @@ from qcodes.dataset.descriptions.rundescriber import RunDescriber
 from qcodes.dataset.descriptions.versioning.rundescribertypes import Shapes
 from qcodes.dataset.experiment_container import Experiment
 from qcodes.dataset.linked_datasets.links import Link
+from qcodes.dataset.sqlite.query_helpers import validate_insert_strategy
 from qcodes.instrument.parameter import (ArrayParameter, MultiParameter,
                                          Parameter, ParameterWithSetpoints,
                                          _BaseParameter,
@@ -54,6 +57,110 @@ class ParameterTypeError(Exception):
     pass
 
 
+class AdaptiveWritePeriod:
+    """
+    Flush policy that adapts the write period of a :class:`DataSaver` to the
+    measured cost of flushing results to the database.
+
+    Results wait in memory for at most the write period and then for the
+    duration of the flush itself, so the write period is chosen as long as
+    possible (to write as many rows per transaction as possible) while
+    keeping the sum of the two below ``target_latency``. The flush duration
+    is estimated as an exponentially weighted moving average. If flushing
+    takes longer than half the target latency, the target can not be met
+    and the write period is set to the flush duration, such that at most
+    half of the time is spent flushing. Independently of the write period,
+    results are flushed once more than ``max_pending_bytes`` of results
+    are waiting.
+
+    Args:
+        target_latency: the targeted maximal time in seconds between adding
+            a result and the result being written to the database
+        max_pending_bytes: the maximal number of bytes of results that are
+            kept in memory before flushing
+        initial_period: the write period to use until the first flush has
+            been measured
+    """
+
+    #: the weight of the most recent flush in the flush duration estimate
+    smoothing = 0.3
+    #: the shortest write period that will be chosen in seconds
+    min_period = 0.01
+
+    def __init__(self, target_latency: float, max_pending_bytes: int,
+                 initial_period: float) -> None:
+        if target_latency <= 0:
+            raise ValueError(f'The target latency must be positive, got '
+                             f'{target_latency}.')
+        self.target_latency = float(target_latency)
+        self.max_pending_bytes = int(max_pending_bytes)
+        self.period = max(min(float(initial_period), self.target_latency),
+                          self.min_period)
+        self.pending_bytes = 0
+        self.flush_duration_estimate: Optional[float] = None
+        self.flushes = 0
+        self.flushes_by_size = 0
+        self.rows_flushed = 0
+        self.total_flush_duration = 0.0
+        self.max_flush_duration = 0.0
+
+    def add(self, nbytes: int) -> None:
+        """
+        Account for results of the given size waiting to be flushed
+        """
+        self.pending_bytes += nbytes
+
+    def should_flush(self, time_since_last_flush: float) -> bool:
+        if self.pending_bytes > self.max_pending_bytes:
+            self.flushes_by_size += 1
+            return True
+        return time_since_last_flush > self.period
+
+    def record_flush(self, duration: float, rows: int) -> None:
+        """
+        Record the duration of a flush of the given number of rows and
+        update the write period accordingly
+        """
+        self.pending_bytes = 0
+        self.flushes += 1
+        self.rows_flushed += rows
+        self.total_flush_duration += duration
+        self.max_flush_duration = max(self.max_flush_duration, duration)
+
+        if self.flush_duration_estimate is None:
+            self.flush_duration_estimate = duration
+        else:
+            self.flush_duration_estimate = (
+                self.smoothing * duration
+                + (1 - self.smoothing) * self.flush_duration_estimate)
+
+        self.period = max(self.target_latency - self.flush_duration_estimate,
+                          self.flush_duration_estimate,
+                          self.min_period)
+
+    def to_dict(self) -> Dict[str, Union[int, float, None]]:
+        """
+        The settings and statistics of the policy. When a measurement uses
+        the policy, they are stored in the metadata of its dataset under the
+        ``adaptive_write_period`` tag as a JSON string, which can be read
+        back with ``json.loads(dataset.metadata['adaptive_write_period'])``.
+        """
+        return {
+            'target_latency': self.target_latency,
+            'max_pending_bytes': self.max_pending_bytes,
+            'write_period': self.period,
+            'flushes': self.flushes,
+            'flushes_by_size': self.flushes_by_size,
+            'rows_flushed': self.rows_flushed,
+            'mean_rows_per_flush': (self.rows_flushed / self.flushes
+                                    if self.flushes else None),
+            'flush_duration_estimate': self.flush_duration_estimate,
+            'mean_flush_duration': (self.total_flush_duration / self.flushes
+                                    if self.flushes else None),
+            'max_flush_duration': self.max_flush_duration,
+        }
+
+
 class DataSaver:
     """
     The class used by the :class:`Runner` context manager to handle the
@@ -64,7 +171,8 @@ class DataSaver:
 
     def __init__(self, dataset: DataSet,
                  write_period: float,
-                 interdeps: InterDependencies_) -> None:
+                 interdeps: InterDependencies_,
+                 write_policy: Optional[AdaptiveWritePeriod] = None) -> None:
         self._dataset = dataset
         if DataSaver.default_callback is not None \
                 and 'run_tables_subscription_callback' \
@@ -88,7 +196,9 @@ class DataSaver:
             self._dataset.subscribe_from_config(subscriber)
 
         self._interdeps = interdeps
-        self.write_period = float(write_period)
+        self._write_policy = write_policy
+        self.write_period = (float(write_period) if write_policy is None
+                             else write_policy.period)
         # self._results will be filled by add_result
         self._results: List[Dict[str, VALUE]] = []
         self._last_save_time = perf_counter()
@@ -144,19 +254,8 @@ class DataSaver:
             parameter = partial_result[0]
             data = partial_result[1]
 
-            if (isinstance(parameter, _BaseParameter) and
-                    isinstance(parameter.vals, vals.Arrays)):
-                if not isinstance(data, np.ndarray):
-                    raise TypeError(
-                        f"Expected data for Parameter with Array validator "
-                        f"to be a numpy array but got: {type(data)}")
-
-                if (parameter.vals.shape is not None
-                        and data.shape != parameter.vals.shape):
-                    raise TypeError(
-                        "Expected data with shape {parameter.vals.shape}, "
-                        "but got {data.shape}"
-                    )
+            if isinstance(parameter, _BaseParameter):
+                self._validate_array_validator_shape(parameter, data)
 
             if isinstance(parameter, ArrayParameter):
                 results_dict.update(
@@ -175,15 +274,95 @@ class DataSaver:
                     self._unpack_partial_result(partial_result)
                 )
 
-        self._validate_result_deps(results_dict)
+        self._validate_deps(set(results_dict))
         self._validate_result_shapes(results_dict)
         self._validate_result_types(results_dict)
 
-        self.dataset._enqueue_results(results_dict)
+        self._enqueue_results(results_dict)
 
-        if perf_counter() - self._last_save_time > self.write_period:
+    def prepare(self, *parameters: Union[str, _BaseParameter]
+                ) -> 'ResultAppender':
+        """
+        Prepare adding results for a fixed set of parameters. The returned
+        :class:`ResultAppender` takes the values of the parameters
+        positionally, in the order given here, and skips most of the
+        per-call work of :meth:`add_result`, which makes it suitable for
+        tight measurement loops:
+
+            >>> append = datasaver.prepare(v1, v2, c1, c2)
+            >>> append(0.1, 0.2, 5, -2.1)
+
+        The dependencies of the parameters are validated once by this
+        method. Shapes and types of the values are validated on the first
+        call of the appender and only validated again if the shape or kind
+        of any of the values changes.
+
+        Args:
+            parameters: the parameters (or names of parameters) to add
+                results for. :class:`ArrayParameter` and
+                :class:`MultiParameter` are not supported; all setpoints of
+                a :class:`ParameterWithSetpoints` must be given explicitly.
+
+        Raises:
+            TypeError: If an :class:`ArrayParameter` or
+                :class:`MultiParameter` is given.
+            ValueError: If a parameter is not registered in the parent
+                Measurement object, if a parameter is given more than once
+                or if required setpoints or inferences are missing.
+        """
+        return ResultAppender(self, parameters)
+
+    def _enqueue_results(
+            self, results_dict: Mapping[ParamSpecBase, np.ndarray],
+            layout: Optional[_ResultLayout] = None) -> None:
+        """
+        Enqueue validated results in the dataset and flush them to the
+        database if the write period has passed.
+        """
+        self.dataset._enqueue_results(results_dict, layout)
+
+        policy = self._write_policy
+        if policy is None:
+            if perf_counter() - self._last_save_time > self.write_period:
+                self.flush_data_to_database()
+                self._last_save_time = perf_counter()
+            return
+
+        policy.add(sum(values.nbytes for values in results_dict.values()))
+        if policy.should_flush(perf_counter() - self._last_save_time):
+            rows = self.dataset._number_of_enqueued_rows
+            flush_start = perf_counter()
             self.flush_data_to_database()
             self._last_save_time = perf_counter()
+            policy.record_flush(self._last_save_time - flush_start, rows)
+            self.write_period = policy.period
+
+    @property
+    def write_policy(self) -> Optional[AdaptiveWritePeriod]:
+        """
+        The adaptive write period policy of this datasaver, if any
+        """
+        return self._write_policy
+
+    @staticmethod
+    def _validate_array_validator_shape(parameter: _BaseParameter,
+                                        data: values_type) -> None:
+        """
+        Validate that data for a parameter with an Arrays validator is a
+        numpy array of the expected shape
+        """
+        if isinstance(parameter.vals, vals.Arrays):
+            if not isinstance(data, np.ndarray):
+                raise TypeError(
+                    f"Expected data for Parameter with Array validator "
+                    f"to be a numpy array but got: {type(data)}")
+
+            if (parameter.vals.shape is not None
+                    and data.shape != parameter.vals.shape):
+                raise TypeError(
+                    "Expected data with shape {parameter.vals.shape}, "
+                    "but got {data.shape}"
+                )
 
     def _conditionally_expand_parameter_with_setpoints(
             self, data: values_type, parameter: ParameterWithSetpoints,
@@ -349,15 +528,14 @@ class DataSaver:
 
         return result_dict
 
-    def _validate_result_deps(
-            self, results_dict: Mapping[ParamSpecBase, values_type]) -> None:
+    def _validate_deps(self, paramspecs: Set[ParamSpecBase]) -> None:
         """
-        Validate that the dependencies of the ``results_dict`` are met,
-        meaning that (some) values for all required setpoints and inferences
-        are present
+        Validate that the dependencies of the parameters that results are
+        given for are met, meaning that (some) values for all required
+        setpoints and inferences are present
         """
         try:
-            self._interdeps.validate_subset(list(results_dict.keys()))
+            self._interdeps.validate_subset(list(paramspecs))
         except (DependencyError, InferenceError) as err:
             raise ValueError('Can not add result, some required parameters '
                              'are missing.') from err
@@ -416,6 +594,20 @@ class DataSaver:
     def run_id(self) -> int:
         return self._dataset.run_id
 
+    @property
+    def writer_statistics(self) -> WriterStatistics:
+        """
+        A snapshot of the statistics of the background writer of the
+        database that the dataset is written to, e.g. the depth of the write
+        queue and the latency of writing results. The statistics are shared
+        by all datasets written to the same database and are only updated
+        when writing in the background.
+        """
+        writer_status = self._dataset._writer_status
+        return dataclasses.replace(
+            writer_status.statistics,
+            queue_depth=writer_status.data_write_queue.qsize())
+
     @property
     def points_written(self) -> int:
         return self._dataset.number_of_results
@@ -425,6 +617,87 @@ class DataSaver:
         return self._dataset
 
 
+class ResultAppender:
+    """
+    Fast path for adding results for a fixed set of parameters to a
+    :class:`DataSaver`. Should be created with :meth:`DataSaver.prepare`.
+
+    Args:
+        datasaver: the datasaver to add the results to
+        parameters: the parameters (or names of parameters) that values
+            will be given for, in the order they will be given in
+    """
+
+    def __init__(self, datasaver: DataSaver,
+                 parameters: Sequence[Union[str, _BaseParameter]]) -> None:
+        self._datasaver = datasaver
+        self._parameters: List[Optional[_BaseParameter]] = []
+        paramspecs: List[ParamSpecBase] = []
+
+        for parameter in parameters:
+            if isinstance(parameter, (ArrayParameter, MultiParameter)):
+                raise TypeError(f'Can not prepare adding results for '
+                                f'{parameter.full_name} of type '
+                                f'{type(parameter).__name__}. Use '
+                                f'add_result instead.')
+            try:
+                paramspec = datasaver._interdeps._id_to_paramspec[
+                    str(parameter)]
+            except KeyError:
+                raise ValueError('Can not add result for parameter '
+                                 f'{parameter}, no such parameter registered '
+                                 'with this measurement.')
+            if paramspec in paramspecs:
+                raise ValueError(f'Parameter {paramspec.name} is given more '
+                                 f'than once.')
+            paramspecs.append(paramspec)
+            self._parameters.append(
+                parameter if isinstance(parameter, _BaseParameter) else None)
+
+        datasaver._validate_deps(set(paramspecs))
+
+        self._paramspecs = tuple(paramspecs)
+        self._layout = datasaver.dataset._result_layout(paramspecs)
+        self._validated_signature: Optional[Tuple[Tuple[str, Tuple[int, ...]],
+                                                  ...]] = None
+
+    @property
+    def paramspecs(self) -> Tuple[ParamSpecBase, ...]:
+        """
+        The specs of the parameters that values are expected for, in order
+        """
+        return self._paramspecs
+
+    def __call__(self, *values: values_type) -> None:
+        """
+        Add one result, i.e. one value (or array of values) for each of the
+        prepared parameters in the order they were prepared in.
+        """
+        if len(values) != len(self._paramspecs):
+            raise ValueError(f'Expected {len(self._paramspecs)} values, but '
+                             f'got {len(values)}.')
+
+        arrays = [np.asarray(value) for value in values]
+        signature = tuple((array.dtype.kind, array.shape) for array in arrays)
+        results_dict = dict(zip(self._paramspecs, arrays))
+
+        if signature != self._validated_signature:
+            self._validate(values, results_dict)
+            self._validated_signature = signature
+
+        self._datasaver._enqueue_results(results_dict, self._layout)
+
+    append = __call__
+
+    def _validate(self, values: Sequence[values_type],
+                  results_dict: Mapping[ParamSpecBase, np.ndarray]) -> None:
+        for parameter, value in zip(self._parameters, values):
+            if parameter is not None:
+                DataSaver._validate_array_validator_shape(parameter, value)
+        self._datasaver._validate_result_shapes(results_dict)
+        self._datasaver._validate_result_types(results_dict)
+
+
 class Runner:
     """
     Context manager for the measurement.
@@ -449,11 +722,20 @@ class Runner:
             subscribers: Optional[Sequence[SubscriberType]] = None,
             parent_datasets: Sequence[Dict[Any, Any]] = (),
             extra_log_info: str = '',
-            write_in_background: bool = False,
-            shapes: Optional[Shapes] = None) -> None:
+            write_in_background: Union[bool, str] = False,
+            shapes: Optional[Shapes] = None,
+            insert_strategy: Optional[str] = None,
+            adaptive_write_period: bool = False) -> None:
 
         self.write_period = self._calculate_write_period(write_in_background,
                                                          write_period)
+        # writing in the background flushes on every add_result, so there
+        # is no write period to adapt
+        if adaptive_write_period and write_in_background:
+            warnings.warn("The write period will not be adapted, since "
+                          "write_in_background==True")
+        self._adaptive_write_period = (adaptive_write_period
+                                       and not write_in_background)
 
         self.enteractions = enteractions
         self.exitactions = exitactions
@@ -470,10 +752,11 @@ class Runner:
         self._parent_datasets = parent_datasets
         self._extra_log_info = extra_log_info
         self._write_in_background = write_in_background
+        self._insert_strategy = insert_strategy
 
     @staticmethod
     def _calculate_write_period(
-            write_in_background: bool,
+            write_in_background: Union[bool, str],
             write_period: Optional[float]
     ) -> float:
         write_period_changed_from_default = (
@@ -523,7 +806,8 @@ class Runner:
         links = [Link(head=self.ds.guid, **pdict)
                  for pdict in self._parent_datasets]
         self.ds.parent_dataset_links = links
-        self.ds.mark_started(start_bg_writer=self._write_in_background)
+        self.ds.mark_started(start_bg_writer=self._write_in_background,
+                             insert_strategy=self._insert_strategy)
 
         # register all subscribers
         for (callble, state) in self.subscribers:
@@ -539,10 +823,18 @@ class Runner:
                  f' {self._extra_log_info}')
         log.info(f'Using background writing: {self._write_in_background}')
 
+        write_policy = None
+        if self._adaptive_write_period:
+            write_policy = AdaptiveWritePeriod(
+                target_latency=qc.config.dataset.write_latency_target,
+                max_pending_bytes=qc.config.dataset.write_max_pending_bytes,
+                initial_period=self.write_period)
+
         self.datasaver = DataSaver(
                             dataset=self.ds,
                             write_period=self.write_period,
-                            interdeps=self._interdependencies)
+                            interdeps=self._interdependencies,
+                            write_policy=write_policy)
 
         return self.datasaver
 
@@ -554,6 +846,11 @@ class Runner:
         with DelayedKeyboardInterrupt():
             self.datasaver.flush_data_to_database(block=True)
 
+            write_policy = self.datasaver.write_policy
+            if write_policy is not None:
+                self.ds.add_metadata('adaptive_write_period',
+                                     json.dumps(write_policy.to_dict()))
+
             # perform the "teardown" events
             for func, args in self.exitactions:
                 func(*args)
@@ -702,7 +999,8 @@ class Measurement:
             self: T, parameter: _BaseParameter,
             setpoints: Optional[setpoints_type] = None,
             basis: Optional[setpoints_type] = None,
-            paramtype: Optional[str] = None) -> T:
+            paramtype: Optional[str] = None,
+            codec: Optional[str] = None) -> T:
         """
         Add QCoDeS Parameter to the dataset produced by running this
         measurement.
@@ -718,6 +1016,11 @@ class Measurement:
             paramtype: Type of the parameter, i.e. the SQL storage class,
                 If None the paramtype will be inferred from the parameter type
                 and the validator of the supplied parameter.
+            codec: The codec to compress the values of the parameter with
+                when storing them, e.g. 'zlib' or 'shuffle+zlib'. See
+                :mod:`qcodes.dataset.array_codecs` for the available
+                codecs. Only parameters of type 'array' can be compressed.
+                The codec is not applied to the setpoints of the parameter.
         """
         if not isinstance(parameter, _BaseParameter):
             raise ValueError('Can not register object of type {}. Can only '
@@ -739,24 +1042,26 @@ class Measurement:
             self._register_arrayparameter(parameter,
                                           setpoints,
                                           basis,
-                                          paramtype)
+                                          paramtype,
+                                          codec)
         elif isinstance(parameter, ParameterWithSetpoints):
             self._register_parameter_with_setpoints(parameter,
                                                     setpoints,
                                                     basis,
-                                                    paramtype)
+                                                    paramtype,
+                                                    codec)
         elif isinstance(parameter, MultiParameter):
             self._register_multiparameter(parameter,
                                           setpoints,
                                           basis,
                                           paramtype,
-                                          )
+                                          codec)
         elif isinstance(parameter, Parameter):
             self._register_parameter(parameter.full_name,
                                      parameter.label,
                                      parameter.unit,
                                      setpoints,
-                                     basis, paramtype)
+                                     basis, paramtype, codec)
         else:
             raise RuntimeError("Does not know how to register a parameter"
                                f"of type {type(parameter)}")
@@ -798,7 +1103,8 @@ class Measurement:
                             unit: Optional[str],
                             setpoints: Optional[setpoints_type],
                             basis: Optional[setpoints_type],
-                            paramtype: str) -> T:
+                            paramtype: str,
+                            codec: Optional[str] = None) -> T:
         """
         Update the interdependencies object with a new group
         """
@@ -813,7 +1119,8 @@ class Measurement:
         paramspec = ParamSpecBase(name=name,
                                   paramtype=paramtype,
                                   label=label,
-                                  unit=unit)
+                                  unit=unit,
+                                  codec=codec)
 
         # We want to allow the registration of the exact same parameter twice,
         # the reason being that e.g. two ArrayParameters could share the same
@@ -856,7 +1163,8 @@ class Measurement:
                                  parameter: ArrayParameter,
                                  setpoints: Optional[setpoints_type],
                                  basis: Optional[setpoints_type],
-                                 paramtype: str, ) -> None:
+                                 paramtype: str,
+                                 codec: Optional[str] = None) -> None:
         """
         Register an ArrayParameter and the setpoints belonging to that
         ArrayParameter
@@ -891,13 +1199,16 @@ class Measurement:
                                  parameter.unit,
                                  my_setpoints,
                                  basis,
-                                 paramtype)
+                                 paramtype,
+                                 codec)
 
     def _register_parameter_with_setpoints(self,
                                            parameter: ParameterWithSetpoints,
                                            setpoints: Optional[setpoints_type],
                                            basis: Optional[setpoints_type],
-                                           paramtype: str) -> None:
+                                           paramtype: str,
+                                           codec: Optional[str] = None
+                                           ) -> None:
         """
         Register an ParameterWithSetpoints and the setpoints belonging to the
         Parameter
@@ -926,13 +1237,15 @@ class Measurement:
                                  parameter.unit,
                                  my_setpoints,
                                  basis,
-                                 paramtype)
+                                 paramtype,
+                                 codec)
 
     def _register_multiparameter(self,
                                  multiparameter: MultiParameter,
                                  setpoints: Optional[setpoints_type],
                                  basis: Optional[setpoints_type],
-                                 paramtype: str) -> None:
+                                 paramtype: str,
+                                 codec: Optional[str] = None) -> None:
         """
         Find the individual multiparameter components and their setpoints
         and register those as individual parameters
@@ -979,14 +1292,16 @@ class Measurement:
                                      multiparameter.units[i],
                                      setpoints,
                                      basis,
-                                     paramtype)
+                                     paramtype,
+                                     codec)
 
     def register_custom_parameter(
             self: T, name: str,
             label: Optional[str] = None, unit: Optional[str] = None,
             basis: Optional[setpoints_type] = None,
             setpoints: Optional[setpoints_type] = None,
-            paramtype: str = 'numeric') -> T:
+            paramtype: str = 'numeric',
+            codec: Optional[str] = None) -> T:
         """
         Register a custom parameter with this measurement
 
@@ -1003,13 +1318,16 @@ class Measurement:
                 of parameters already registered in the measurement that
                 are the setpoints of this parameter
             paramtype: Type of the parameter, i.e. the SQL storage class
+            codec: The codec to compress the values of the parameter with
+                when storing them, see :meth:`register_parameter`
         """
         return self._register_parameter(name,
                                         label,
                                         unit,
                                         setpoints,
                                         basis,
-                                        paramtype)
+                                        paramtype,
+                                        codec)
 
     def unregister_parameter(self,
                              parameter: setpoints_type) -> None:
@@ -1102,7 +1420,9 @@ class Measurement:
                                              shapes=shapes)
         self._shapes = shapes
 
-    def run(self, write_in_background: Optional[bool] = None) -> Runner:
+    def run(self, write_in_background: Optional[Union[bool, str]] = None,
+            insert_strategy: Optional[str] = None,
+            adaptive_write_period: Optional[bool] = None) -> Runner:
         """
         Returns the context manager for the experimental run
 
@@ -1111,11 +1431,37 @@ class Measurement:
                 within the context manager with ``DataSaver.add_result``
                 will be stored in background, without blocking the
                 main thread that is executing the context manager.
+                If 'process', the results will be stored by a separate
+                process, such that writing them does not compete with the
+                measurement for the GIL.
                 By default the setting for write in background will be
                 read from the ``qcodesrc.json`` config file.
+            insert_strategy: how results are inserted into the database,
+                either 'values' (multi-row INSERT statements) or
+                'executemany' (one prepared INSERT statement executed for
+                every row). By default the setting for the insert strategy
+                will be read from the ``qcodesrc.json`` config file.
+            adaptive_write_period: if True, the write period is adapted to
+                the measured cost of writing results to the database, such
+                that results are written within the target latency given by
+                the ``dataset.write_latency_target`` config setting using
+                as few transactions as possible. See
+                :class:`AdaptiveWritePeriod`. The write period of the
+                measurement is used until the cost has been measured. Has no
+                effect when writing in the background, in which case a
+                warning is issued. The chosen write period and statistics
+                are stored as a JSON string in the metadata of the dataset
+                under the ``adaptive_write_period`` tag, see
+                :meth:`AdaptiveWritePeriod.to_dict`. By default the setting
+                will be read from the ``qcodesrc.json`` config file.
         """
         if write_in_background is None:
             write_in_background = qc.config.dataset.write_in_background
+        if insert_strategy is not None:
+            # validate before a run is created in the database
+            validate_insert_strategy(insert_strategy)
+        if adaptive_write_period is None:
+            adaptive_write_period = qc.config.dataset.adaptive_write_period
         return Runner(self.enteractions, self.exitactions,
                       self.experiment, station=self.station,
                       write_period=self._write_period,
@@ -1125,4 +1471,6 @@ class Measurement:
                       parent_datasets=self._parent_datasets,
                       extra_log_info=self._extra_log_info,
                       write_in_background=write_in_background,
-                      shapes=self._shapes)
+                      shapes=self._shapes,
+                      insert_strategy=insert_strategy,
+                      adaptive_write_period=adaptive_write_period)
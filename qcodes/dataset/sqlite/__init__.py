@@ -7,16 +7,16 @@ The dependency structure of the sub-modules is the following:
 ::
 
          .connection     .settings
-           /   |   \         |
-          /    |    \        |
-         /     |     V       V
-        |      |  .query_helpers
-        |      |   |       |
-        |      V   V       |
-        |  .db_upgrades    |
-        |      /           V
-        |     /        .queries
-        v    v
-      .database
+        /  /   |   \         |
+       /  /    |    \        |
+      |  /     |     V       V
+      | |      |  .query_helpers
+      | |      |   |       |
+      | |      V   V       |
+      | |  .db_upgrades    |
+      V |      /           V
+   .pool|     /        .queries
+      \ v    v            ^
+       .database --> .result_shards
 
 """
@@ -5,44 +5,166 @@ database version and possibly perform database upgrades.
 """
 import io
 import sqlite3
+import struct
 import sys
 from contextlib import contextmanager
 from os.path import expanduser, normpath
-from typing import Union, Iterator, Tuple, Optional
+from pathlib import Path
+from typing import Dict, Union, Iterator, Tuple, Optional, Sequence
 
 import numpy as np
 from numpy import ndarray
 
+from qcodes.dataset import array_codecs
 from qcodes.dataset.sqlite.connection import ConnectionPlus
 from qcodes.dataset.sqlite.db_upgrades import _latest_available_version, \
     get_user_version, perform_db_upgrade
 from qcodes.dataset.sqlite.initial_schema import init_db
+from qcodes.dataset.sqlite.pool import ConnectionPool
 import qcodes
 from qcodes.utils.types import complex_types, complex_type_union
 
 
-# utility function to allow sqlite/numpy type
-def _adapt_array(arr: ndarray) -> sqlite3.Binary:
+# Arrays (and complex numbers) are stored in a compact binary format: a small
+# fixed header holding the dtype, the shape of the array and the codec that
+# the data is compressed with (if any) followed by the raw (C-ordered) data
+# buffer. This allows decoding the data with np.frombuffer without parsing
+# the (comparatively slow to parse) header of the .npy format. Blobs written
+# with np.save by older versions of QCoDeS are recognized by the .npy magic
+# string and are still read with np.load. Databases that may hold blobs in
+# the compact format are of version 12 or later, such that older versions
+# of QCoDeS refuse to open them rather than failing to read the blobs.
+_ARRAY_MAGIC = b'\x93QCARR'
+_ARRAY_FORMAT_VERSION = 1
+# magic, format version, length of the dtype string, number of dimensions,
+# length of the codec string
+_ARRAY_HEADER = struct.Struct(f'<{len(_ARRAY_MAGIC)}sBBBB')
+# the data buffer is aligned to this many bytes
+_ARRAY_ALIGNMENT = 16
+
+
+def _encode_array(arr: ndarray, codec: Optional[str] = None
+                  ) -> Optional[bytes]:
     """
-    See this:
-    https://stackoverflow.com/questions/3425320/sqlite3-programmingerror-you-must-not-use-8-bit-bytestrings-unless-you-use-a-te
+    Encode an array in the compact binary format, optionally compressing
+    the data with the given codec (see :mod:`qcodes.dataset.array_codecs`).
+    Returns None if the array can not be represented in that format, i.e. if
+    it has an object or a structured dtype.
+    """
+    dtype = arr.dtype
+    if dtype.hasobject or dtype.fields is not None or dtype.subdtype:
+        return None
+    dtype_str = dtype.str.encode('ascii')
+    codec_str = b'' if codec is None else codec.encode('ascii')
+    header = (_ARRAY_HEADER.pack(_ARRAY_MAGIC, _ARRAY_FORMAT_VERSION,
+                                 len(dtype_str), arr.ndim, len(codec_str))
+              + dtype_str
+              + struct.pack(f'<{arr.ndim}q', *arr.shape)
+              + codec_str)
+    data = arr.tobytes()
+    if codec is not None:
+        data = array_codecs.encode(data, codec, dtype.itemsize)
+    padding = -len(header) % _ARRAY_ALIGNMENT
+    return b''.join((header, b'\x00' * padding, data))
+
+
+def _decode_array(blob: bytes) -> ndarray:
     """
+    Decode an array stored in the compact binary format. The returned array
+    owns its data and is writable, like the arrays read with np.load.
+    """
+    version = blob[len(_ARRAY_MAGIC)]
+    if version != _ARRAY_FORMAT_VERSION:
+        raise ValueError(f'Unknown array format version {version}. The data '
+                         f'may have been written by a newer version of '
+                         f'QCoDeS.')
+    _, _, dtype_len, ndim, codec_len = _ARRAY_HEADER.unpack_from(blob)
+    offset = _ARRAY_HEADER.size
+    dtype = np.dtype(blob[offset:offset + dtype_len].decode('ascii'))
+    offset += dtype_len
+    shape = struct.unpack_from(f'<{ndim}q', blob, offset)
+    offset += 8 * ndim
+    codec = blob[offset:offset + codec_len].decode('ascii')
+    offset += codec_len
+    offset += -offset % _ARRAY_ALIGNMENT
+    if codec:
+        data = bytearray(array_codecs.decode(blob[offset:], codec,
+                                             dtype.itemsize))
+    else:
+        data = bytearray(memoryview(blob)[offset:])
+    return np.frombuffer(data, dtype=dtype).reshape(shape)
+
+
+def _encode_array_npy(arr: ndarray) -> bytes:
     out = io.BytesIO()
     np.save(out, arr)
     out.seek(0)
-    return sqlite3.Binary(out.read())
+    return out.read()
 
 
-def _convert_array(text: bytes) -> ndarray:
-    out = io.BytesIO(text)
+def _decode_array_npy(blob: bytes) -> ndarray:
+    out = io.BytesIO(blob)
     out.seek(0)
     return np.load(out)
 
 
+# utility function to allow sqlite/numpy type
+def _adapt_array(arr: ndarray, codec: Optional[str] = None) -> sqlite3.Binary:
+    """
+    See this:
+    https://stackoverflow.com/questions/3425320/sqlite3-programmingerror-you-must-not-use-8-bit-bytestrings-unless-you-use-a-te
+
+    Arrays that can not be stored in the compact binary format are stored
+    uncompressed in the npy format, regardless of the codec.
+    """
+    blob = _encode_array(arr, codec)
+    if blob is None:
+        blob = _encode_array_npy(arr)
+    return sqlite3.Binary(blob)
+
+
+def _convert_array(text: bytes) -> ndarray:
+    if text.startswith(_ARRAY_MAGIC):
+        return _decode_array(text)
+    return _decode_array_npy(text)
+
+
 def _convert_complex(text: bytes) -> complex_type_union:
-    out = io.BytesIO(text)
-    out.seek(0)
-    return np.load(out)[0]
+    return _convert_array(text)[0]
+
+
+def _convert_complex_column(values: Sequence[Optional[bytes]]) -> ndarray:
+    """
+    Convert a column of complex values as stored by :func:`_adapt_complex`
+    into an array. If all values are stored in the same format (which is
+    the case unless the data was written by different versions of QCoDeS),
+    the blobs only differ in the trailing bytes holding the value, so the
+    values are extracted from all blobs at once. Otherwise, the values are
+    converted one by one and NULL values are kept as None.
+    """
+    first = values[0] if len(values) > 0 else None
+    if isinstance(first, bytes):
+        try:
+            joined = b''.join(values)  # type: ignore[arg-type]
+        except TypeError:
+            # some values are NULL
+            joined = b''
+        size = len(first)
+        if len(joined) == size * len(values):
+            first_value = _convert_array(first)
+            itemsize = first_value.dtype.itemsize
+            offset = size - itemsize
+            blobs = np.frombuffer(joined, dtype=np.uint8).reshape(-1, size)
+            if (first_value.shape == (1,)
+                    and (blobs[:, :offset] == blobs[0, :offset]).all()):
+                column = (blobs[:, offset:].copy()
+                          .view(first_value.dtype).ravel()
+                          .astype(np.complex128))
+                if column[:1].tobytes() == first_value.astype(
+                        np.complex128).tobytes():
+                    return column
+    return np.array([None if value is None else _convert_complex(value)
+                     for value in values])
 
 
 this_session_default_encoding = sys.getdefaultencoding()
@@ -101,14 +223,13 @@ def _adapt_float(fl: float) -> Union[float, str]:
 
 
 def _adapt_complex(value: complex_type_union) -> sqlite3.Binary:
-    out = io.BytesIO()
-    np.save(out, np.array([value]))
-    out.seek(0)
-    return sqlite3.Binary(out.read())
+    return _adapt_array(np.array([value]))
 
 
 def connect(name: str, debug: bool = False,
-            version: int = -1) -> ConnectionPlus:
+            version: int = -1,
+            check_same_thread: bool = True,
+            profile: Optional[str] = None) -> ConnectionPlus:
     """
     Connect or create  database. If debug the queries will be echoed back.
     This function takes care of registering the numpy/sqlite type
@@ -119,22 +240,21 @@ def connect(name: str, debug: bool = False,
         debug: whether or not to turn on tracing
         version: which version to create. We count from 0. -1 means 'latest'.
             Should always be left at -1 except when testing.
+        check_same_thread: whether the connection may only be used in the
+            thread that it is made in
+        profile: name of the sqlite pragma profile to set up the connection
+            with, see :func:`apply_pragma_profile`. If None, the profile
+            ``config['dataset']['sqlite_profile']`` is used.
 
     Returns:
         conn: connection object to the database (note, it is
             `ConnectionPlus`, not `sqlite3.Connection`
 
     """
-    # register numpy->binary(TEXT) adapter
-    # the typing here is ignored due to what we think is a flaw in typeshed
-    # see https://github.com/python/typeshed/issues/2429
-    sqlite3.register_adapter(np.ndarray, _adapt_array)
-    # register binary(TEXT) -> numpy converter
-    # for some reasons mypy complains about this
-    sqlite3.register_converter("array", _convert_array)
+    _register_adapters_and_converters()
 
     sqlite3_conn = sqlite3.connect(name, detect_types=sqlite3.PARSE_DECLTYPES,
-                                   check_same_thread=True)
+                                   check_same_thread=check_same_thread)
     conn = ConnectionPlus(sqlite3_conn)
 
     latest_supported_version = _latest_available_version()
@@ -148,6 +268,76 @@ def connect(name: str, debug: bool = False,
     # sqlite3 options
     conn.row_factory = sqlite3.Row
 
+    if debug:
+        conn.set_trace_callback(print)
+
+    # the page size of a database can only be set before its tables are
+    # created, so the profile is applied before initialising the database
+    apply_pragma_profile(conn, profile)
+    init_db(conn)
+    perform_db_upgrade(conn, version=version)
+    return conn
+
+
+def _connect_to_pool(name: str, debug: bool,
+                     check_same_thread: bool) -> ConnectionPlus:
+    return connect(name, debug, check_same_thread=check_same_thread)
+
+
+#: the pool of connections to databases used by the dataset, see
+#: :class:`.ConnectionPool`
+connection_pool = ConnectionPool(_connect_to_pool)
+
+
+def connect_read_only(name: str) -> ConnectionPlus:
+    """
+    Connect to an existing database for reading only. The database is
+    neither created nor upgraded, so it must be of the latest version, e.g.
+    because it has been connected to with :func:`connect` before.
+
+    The returned connection may be used from another thread than the one
+    that it is created in (but only from one thread at a time), such that
+    connections for worker threads can be created and closed by the main
+    thread.
+
+    Args:
+        name: path to the sqlite file
+
+    Returns:
+        conn: read-only connection object to the database
+    """
+    _register_adapters_and_converters()
+
+    uri = f'{Path(name).absolute().as_uri()}?mode=ro'
+    sqlite3_conn = sqlite3.connect(uri, uri=True,
+                                   detect_types=sqlite3.PARSE_DECLTYPES,
+                                   check_same_thread=False)
+    sqlite3_conn.row_factory = sqlite3.Row
+    conn = ConnectionPlus(sqlite3_conn)
+
+    db_version = get_user_version(conn)
+    if db_version != _latest_available_version():
+        conn.close()
+        raise RuntimeError(f"Database {name} is version {db_version} and can "
+                           f"not be upgraded to the latest version when "
+                           f"connecting to it read-only.")
+
+    apply_pragma_profile(conn)
+    return conn
+
+
+def _register_adapters_and_converters() -> None:
+    """
+    Register the numpy/sqlite type adapters and converters that we need
+    """
+    # register numpy->binary(TEXT) adapter
+    # the typing here is ignored due to what we think is a flaw in typeshed
+    # see https://github.com/python/typeshed/issues/2429
+    sqlite3.register_adapter(np.ndarray, _adapt_array)
+    # register binary(TEXT) -> numpy converter
+    # for some reasons mypy complains about this
+    sqlite3.register_converter("array", _convert_array)
+
     # Make sure numpy ints and floats types are inserted properly
     for numpy_int in [
         np.int, np.int8, np.int16, np.int32, np.int64,
@@ -164,13 +354,6 @@ def connect(name: str, debug: bool = False,
         sqlite3.register_adapter(complex_type, _adapt_complex)
     sqlite3.register_converter("complex", _convert_complex)
 
-    if debug:
-        conn.set_trace_callback(print)
-
-    init_db(conn)
-    perform_db_upgrade(conn, version=version)
-    return conn
-
 
 def get_db_version_and_newest_available_version(path_to_db: str) -> Tuple[int,
                                                                           int]:
@@ -241,6 +424,86 @@ def set_journal_mode(conn: ConnectionPlus, journal_mode: str) -> None:
     cursor.execute(query)
 
 
+#: the pragmas that may be set by a sqlite pragma profile, in the order in
+#: which they are set, with the values that they can take. Pragmas with no
+#: values take an integer.
+_PROFILE_PRAGMAS: Dict[str, Tuple[str, ...]] = {
+    'page_size': (),
+    'synchronous': ('OFF', 'NORMAL', 'FULL', 'EXTRA'),
+    'cache_size': (),
+    'mmap_size': (),
+    'temp_store': ('DEFAULT', 'FILE', 'MEMORY'),
+    'wal_autocheckpoint': (),
+}
+
+
+def get_pragma_profile(profile: Optional[str] = None
+                       ) -> Dict[str, Union[int, str]]:
+    """
+    Get the pragmas of a sqlite pragma profile from the config, see
+    :func:`apply_pragma_profile`
+
+    Args:
+        profile: name of the profile in
+            ``config['dataset']['sqlite_profiles']``. If None, the profile
+            ``config['dataset']['sqlite_profile']`` is used.
+
+    Returns:
+        Dictionary from the names of the pragmas to their values
+    """
+    if profile is None:
+        profile = qcodes.config.dataset.sqlite_profile
+    profiles = qcodes.config.dataset.sqlite_profiles
+    if profile not in profiles:
+        raise RuntimeError(f"Invalid sqlite profile {profile}. Valid "
+                           f"profiles are {list(profiles)}")
+    pragmas = dict(profiles[profile])
+    for name, value in pragmas.items():
+        if name not in _PROFILE_PRAGMAS:
+            raise RuntimeError(f"Invalid pragma {name} in sqlite profile "
+                               f"{profile}. Valid pragmas are "
+                               f"{list(_PROFILE_PRAGMAS)}")
+        valid_values = _PROFILE_PRAGMAS[name]
+        if valid_values:
+            valid = isinstance(value, str) and value.upper() in valid_values
+        else:
+            valid = isinstance(value, int) and not isinstance(value, bool)
+        if not valid:
+            raise RuntimeError(f"Invalid value {value!r} of pragma {name} "
+                               f"in sqlite profile {profile}")
+    return pragmas
+
+
+def apply_pragma_profile(conn: ConnectionPlus,
+                         profile: Optional[str] = None,
+                         schema: Optional[str] = None) -> None:
+    """
+    Set up a connection with the pragmas of a sqlite pragma profile. The
+    profiles are defined in ``config['dataset']['sqlite_profiles']``, e.g.
+    "acquisition" trades durability on power loss for fast commits, and
+    "analysis" uses a large page cache and memory mapped reads. Pragmas
+    that are left out of a profile keep the sqlite defaults.
+
+    The pragmas ``synchronous``, ``cache_size``, ``mmap_size``,
+    ``temp_store`` and ``wal_autocheckpoint`` apply to the connection only.
+    The ``page_size`` only applies to databases that have no tables yet.
+    See https://www.sqlite.org/pragma.html for details.
+
+    Args:
+        conn: Connection to the database.
+        profile: name of the profile. If None, the profile
+            ``config['dataset']['sqlite_profile']`` is used.
+        schema: name of the attached database to set up. If None, the main
+            database of the connection is set up.
+    """
+    pragmas = get_pragma_profile(profile)
+    prefix = '' if schema is None else f'{schema}.'
+    cursor = conn.cursor()
+    for name in _PROFILE_PRAGMAS:
+        if name in pragmas:
+            cursor.execute(f"PRAGMA {prefix}{name}={pragmas[name]};")
+
+
 def initialise_or_create_database_at(db_file_with_abs_path: str,
                                      journal_mode: Optional[str] = 'WAL') -> None:
     """
@@ -301,7 +564,7 @@ def conn_from_dbpath_or_conn(conn: Optional[ConnectionPlus],
         path_to_db = get_DB_location()
 
     if conn is None and path_to_db is not None:
-        conn = connect(path_to_db, get_DB_debug())
+        conn = connection_pool.connection(path_to_db, get_DB_debug())
     elif conn is not None:
         conn = conn
     else:
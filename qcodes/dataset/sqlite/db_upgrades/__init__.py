@@ -347,3 +347,92 @@ def perform_db_upgrade_8_to_9(conn: ConnectionPlus) -> None:
                 transaction(connection, _IX_runs_captured_run_id)
     else:
         raise RuntimeError(f"found {n_run_tables} runs tables expected 1")
+
+
+@upgrader
+def perform_db_upgrade_9_to_10(conn: ConnectionPlus) -> None:
+    """
+    Perform the upgrade from version 9 to version 10.
+
+    Add indices on the runs table for run_timestamp and completed_timestamp
+    """
+
+    sql = "SELECT name FROM sqlite_master WHERE type='table' AND name='runs'"
+    cur = atomic_transaction(conn, sql)
+    n_run_tables = len(cur.fetchall())
+
+    pbar = tqdm(range(1), file=sys.stdout)
+    pbar.set_description("Upgrading database; v9 -> v10")
+
+    if n_run_tables == 1:
+        _IX_runs_run_timestamp = """
+                                 CREATE INDEX
+                                 IF NOT EXISTS IX_runs_run_timestamp
+                                 ON runs (run_timestamp DESC)
+                                 """
+        _IX_runs_completed_timestamp = """
+                                       CREATE INDEX
+                                       IF NOT EXISTS IX_runs_completed_timestamp
+                                       ON runs (completed_timestamp DESC)
+                                       """
+        with atomic(conn) as connection:
+            # iterate through the pbar for the sake of the side effect; it
+            # prints that the database is being upgraded
+            for _ in pbar:
+                transaction(connection, _IX_runs_run_timestamp)
+                transaction(connection, _IX_runs_completed_timestamp)
+    else:
+        raise RuntimeError(f"found {n_run_tables} runs tables expected 1")
+
+
+@upgrader
+def perform_db_upgrade_10_to_11(conn: ConnectionPlus) -> None:
+    """
+    Perform the upgrade from version 10 to version 11.
+
+    Add the result_shards table, which holds the paths of the files that
+    the results tables of sharded runs are stored in
+    """
+
+    sql = "SELECT name FROM sqlite_master WHERE type='table' AND name='runs'"
+    cur = atomic_transaction(conn, sql)
+    n_run_tables = len(cur.fetchall())
+
+    pbar = tqdm(range(1), file=sys.stdout)
+    pbar.set_description("Upgrading database; v10 -> v11")
+
+    if n_run_tables == 1:
+        _result_shards_table_schema = """
+                                      CREATE TABLE IF NOT EXISTS
+                                      result_shards (
+                                          run_id INTEGER PRIMARY KEY,
+                                          path TEXT NOT NULL,
+                                          FOREIGN KEY(run_id)
+                                          REFERENCES runs(run_id)
+                                      )
+                                      """
+        with atomic(conn) as connection:
+            # iterate through the pbar for the sake of the side effect; it
+            # prints that the database is being upgraded
+            for _ in pbar:
+                transaction(connection, _result_shards_table_schema)
+    else:
+        raise RuntimeError(f"found {n_run_tables} runs tables expected 1")
+
+
+@upgrader
+def perform_db_upgrade_11_to_12(conn: ConnectionPlus) -> None:
+    """
+    Perform the upgrade from version 11 to version 12.
+
+    The schema is unchanged. From version 12 on, array and complex cells may
+    be stored in the compact binary array format rather than the npy format,
+    which older versions of QCoDeS can not read. Bumping the version makes
+    them refuse to open the database instead.
+    """
+    pbar = tqdm(range(1), file=sys.stdout)
+    pbar.set_description("Upgrading database; v11 -> v12")
+    # iterate through the pbar for the sake of the side effect; it
+    # prints that the database is being upgraded
+    for _ in pbar:
+        pass
@@ -0,0 +1,276 @@
+"""
+This module provides a pool of connections to QCoDeS databases, such that
+the connections are reused rather than every call that needs a connection
+(e.g. :func:`.load_by_id`) registering the type converters, checking the
+version of the database and setting up the connection again.
+
+The pool keeps one connection per thread and database file, which is
+shared by everything that runs in the thread, and one writer connection
+per database file, which may be used from any thread but only by one
+thread at a time. The connections of the threads are handed out as
+handles, such that closing one handle does not close the connection for
+the other holders of handles.
+"""
+import os
+import sqlite3
+import threading
+import weakref
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import wrapt
+
+from qcodes.dataset.sqlite.connection import ConnectionPlus
+
+#: the database file names that can not be shared by connections, because
+#: every connection to them opens a new database
+_UNSHAREABLE_NAMES = ('', ':memory:')
+
+_FileId = Tuple[int, int]
+
+
+@dataclass
+class PoolStatistics:
+    """
+    Statistics of the connections handed out by a :class:`ConnectionPool`
+
+    Attributes:
+        hits: number of times that a cached connection has been handed out
+        misses: number of times that a new connection has been made
+    """
+    hits: int = 0
+    misses: int = 0
+
+
+def _file_id(path: str) -> Optional[_FileId]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_dev, stat.st_ino
+
+
+def _is_open(conn: ConnectionPlus) -> bool:
+    try:
+        conn.total_changes
+    except sqlite3.ProgrammingError:
+        return False
+    return True
+
+
+class _SharedConnection:
+    """
+    A connection of a thread in a :class:`ConnectionPool` along with the
+    id of the database file it has been made to and the number of handles
+    to it that have not been released
+    """
+
+    def __init__(self, conn: ConnectionPlus,
+                 file_id: Optional[_FileId]) -> None:
+        self.conn = conn
+        self.file_id = file_id
+        self.handles = 0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        with self._lock:
+            self.handles += 1
+
+    def release(self, close: bool) -> None:
+        """
+        Release a handle and close the connection if it has been closed by
+        the holder of the last handle
+        """
+        with self._lock:
+            self.handles -= 1
+            last_handle = self.handles == 0
+        if close and last_handle:
+            self.conn.close()
+
+
+class _ConnectionHandle(ConnectionPlus):
+    """
+    A handle to a connection of a :class:`ConnectionPool`. The handle
+    behaves like the connection, except that closing it only releases the
+    handle, unless it is the last handle that has not been released, in
+    which case the connection is closed. Handles are also released when
+    they are garbage collected. A closed handle can not be used any more.
+    """
+
+    def __init__(self, shared: _SharedConnection) -> None:
+        # the path of the database file is taken from the shared connection
+        # rather than queried again as by the ConnectionPlus initializer
+        wrapt.ObjectProxy.__init__(self, shared.conn.__wrapped__)
+        self.path_to_dbfile = shared.conn.path_to_dbfile
+        self._self_shared = shared
+        self._self_closed = False
+        shared.acquire()
+        self._self_finalizer = weakref.finalize(self, shared.release, False)
+
+    # the state of atomic blocks is that of the connection, which may be
+    # used through other handles within an atomic block
+    @property
+    def atomic_in_progress(self) -> bool:
+        return self._self_shared.conn.atomic_in_progress
+
+    @atomic_in_progress.setter
+    def atomic_in_progress(self, value: bool) -> None:
+        self._self_shared.conn.atomic_in_progress = value
+
+    def __getattr__(self, name: str) -> Any:
+        if self._self_closed and not name.startswith('_self_'):
+            raise sqlite3.ProgrammingError(
+                'Cannot operate on a closed database.')
+        return super().__getattr__(name)
+
+    def close(self) -> None:
+        if self._self_closed:
+            return
+        self._self_closed = True
+        self._self_finalizer.detach()
+        self._self_shared.release(close=True)
+
+
+class ConnectionPool:
+    """
+    A pool of connections to database files, made with the given connect
+    function. Connections are keyed by the absolute path of the database
+    file. A cached connection is only handed out if it is still open and
+    the database file has not been replaced since the connection was
+    made, otherwise a new connection is made. Connections to in-memory
+    databases are never cached.
+
+    The connections of the threads are handed out as handles, see
+    :class:`_ConnectionHandle`. Closing a handle does not close the
+    connection for the other holders of handles to it.
+
+    Args:
+        connect: function that makes a connection to a database file given
+            its path, whether to echo queries, and whether the connection
+            may be used from threads other than the one it is made in
+    """
+
+    def __init__(self,
+                 connect: Callable[[str, bool, bool], ConnectionPlus]
+                 ) -> None:
+        self._connect = connect
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._writers: Dict[str, Tuple[ConnectionPlus, Optional[_FileId]]] = {}
+        self._writer_locks: Dict[str, threading.Lock] = {}
+        #: the keys of the writer connections that are checked out by id
+        self._checked_out: Dict[int, str] = {}
+        self.statistics = PoolStatistics()
+
+    @staticmethod
+    def _key(path: str) -> Optional[str]:
+        if path in _UNSHAREABLE_NAMES or path.startswith('file:'):
+            return None
+        return os.path.abspath(path)
+
+    def _record(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.statistics.hits += 1
+            else:
+                self.statistics.misses += 1
+
+    def connection(self, path: str, debug: bool = False) -> ConnectionPlus:
+        """
+        Get the connection of the calling thread to a database file
+
+        Args:
+            path: path to the database file
+            debug: whether the queries of the connection are echoed back
+
+        Returns:
+            A handle to the connection, which may only be used in the
+            calling thread
+        """
+        key = self._key(path)
+        if key is None:
+            self._record(hit=False)
+            return self._connect(path, debug, True)
+
+        connections: Dict[Tuple[str, bool], _SharedConnection] = \
+            self._local.__dict__.setdefault('connections', {})
+        shared = connections.get((key, debug))
+        if (shared is not None and _is_open(shared.conn)
+                and shared.file_id == _file_id(key)):
+            self._record(hit=True)
+            return _ConnectionHandle(shared)
+        self._record(hit=False)
+        shared = _SharedConnection(self._connect(key, debug, True),
+                                   _file_id(key))
+        connections[(key, debug)] = shared
+        return _ConnectionHandle(shared)
+
+    def acquire_writer(self, path: str) -> ConnectionPlus:
+        """
+        Check out the writer connection to a database file, waiting until
+        it is released if another thread has checked it out. The connection
+        must be released with :meth:`release_writer` when done.
+
+        Args:
+            path: path to the database file
+
+        Returns:
+            The writer connection, which may be used from any thread until
+            it is released
+        """
+        key = self._key(path)
+        if key is None:
+            self._record(hit=False)
+            return self._connect(path, False, False)
+
+        with self._lock:
+            writer_lock = self._writer_locks.setdefault(key,
+                                                        threading.Lock())
+        writer_lock.acquire()
+        cached = self._writers.get(key)
+        if cached is not None:
+            conn, file_id = cached
+            if _is_open(conn) and file_id == _file_id(key):
+                self._record(hit=True)
+                self._checked_out[id(conn)] = key
+                return conn
+        self._record(hit=False)
+        try:
+            conn = self._connect(key, False, False)
+        except BaseException:
+            writer_lock.release()
+            raise
+        self._writers[key] = (conn, _file_id(key))
+        self._checked_out[id(conn)] = key
+        return conn
+
+    def release_writer(self, conn: ConnectionPlus) -> None:
+        """
+        Release a writer connection that has been checked out with
+        :meth:`acquire_writer`
+
+        Args:
+            conn: the writer connection
+        """
+        key = self._checked_out.pop(id(conn), None)
+        if key is None:
+            # the connection is not pooled
+            conn.close()
+            return
+        self._writer_locks[key].release()
+
+    def close_all(self) -> None:
+        """
+        Close the connections of the calling thread and the writer
+        connections that are not checked out, and remove them from the pool
+        """
+        connections = self._local.__dict__.pop('connections', {})
+        for shared in connections.values():
+            shared.conn.close()
+        with self._lock:
+            for key, writer_lock in self._writer_locks.items():
+                if key in self._writers and writer_lock.acquire(
+                        blocking=False):
+                    conn, _ = self._writers.pop(key)
+                    conn.close()
+                    writer_lock.release()
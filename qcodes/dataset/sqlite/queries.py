@@ -2,13 +2,16 @@
 This module contains useful SQL queries and their combinations which are
 specific to the domain of QCoDeS database.
 """
+import gc
+import itertools
 import logging
 import sqlite3
 import time
 import unicodedata
 import warnings
-from typing import (Any, Callable, Dict, List, Mapping, Optional, Sequence,
-                    Tuple, Union, cast)
+from contextlib import contextmanager
+from typing import (Any, Callable, Collection, Dict, Iterator, List,
+                    Mapping, Optional, Sequence, Tuple, Union, cast)
 from copy import copy
 import numpy as np
 from numpy import VisibleDeprecationWarning
@@ -21,6 +24,8 @@ from qcodes.dataset.descriptions.versioning import serialization as serial
 from qcodes.dataset.descriptions.versioning import v0
 from qcodes.dataset.descriptions.versioning.converters import old_to_new
 from qcodes.dataset.guids import generate_guid, parse_guid
+from qcodes.dataset.sqlite.database import (_convert_complex_column,
+                                            _convert_numeric)
 from qcodes.dataset.sqlite.connection import (ConnectionPlus, atomic,
                                               atomic_transaction, transaction)
 from qcodes.dataset.sqlite.query_helpers import (VALUES, insert_column,
@@ -31,6 +36,12 @@ from qcodes.dataset.sqlite.query_helpers import (VALUES, insert_column,
                                                  select_one_where,
                                                  sql_placeholder_string,
                                                  update_where)
+from qcodes.dataset.sqlite.result_shards import (add_result_shard,
+                                                 create_result_shard,
+                                                 get_result_shards_of_tables,
+                                                 new_result_shard_path,
+                                                 remove_result_shard,
+                                                 result_shard_length)
 from qcodes.utils.deprecate import deprecate
 
 log = logging.getLogger(__name__)
@@ -38,6 +49,15 @@ log = logging.getLogger(__name__)
 
 _unicode_categories = ('Lu', 'Ll', 'Lt', 'Lm', 'Lo', 'Nd', 'Pc', 'Pd', 'Zs')
 
+# ranges of the values of parameters given as the lowest and highest value
+# (both included) by the name of the parameter, None meaning no limit
+ParameterRanges = Mapping[str, Tuple[Any, Any]]
+
+# window functions (used to take every n-th row of a query in sqlite) are
+# available from SQLite 3.25.0, on older versions the rows are strided in
+# python after they have been fetched
+_WINDOW_FUNCTIONS_SUPPORTED = sqlite3.sqlite_version_info >= (3, 25, 0)
+
 
 # in the current version, these are the standard columns of the "runs" table
 # Everything else is metadata
@@ -142,7 +162,9 @@ def get_parameter_data(conn: ConnectionPlus,
                        table_name: str,
                        columns: Sequence[str] = (),
                        start: Optional[int] = None,
-                       end: Optional[int] = None) -> \
+                       end: Optional[int] = None,
+                       ranges: Optional[ParameterRanges] = None,
+                       stride: Optional[int] = None) -> \
         Dict[str, Dict[str, np.ndarray]]:
     """
     Get data for one or more parameters and its dependencies. The data
@@ -168,7 +190,16 @@ def get_parameter_data(conn: ConnectionPlus,
             are returned.
         start: start of range; if None, then starts from the top of the table
         end: end of range; if None, then ends at the bottom of the table
-    """
+        ranges: mapping from parameter names to ranges of values given as
+            tuples of the lowest and highest value (both included, None for
+            no limit). Only the rows where the values of the parameters are
+            within the ranges are returned. The range filter is applied
+            BEFORE the start and end range. Ranges are only applied to the
+            parameter trees that the parameter is part of.
+        stride: return only every stride-th row of the rows selected by the
+            other arguments
+    """
+    _validate_stride(stride)
     rundescriber = get_rundescriber_from_result_table_name(conn, table_name)
 
     output = {}
@@ -183,17 +214,28 @@ def get_parameter_data(conn: ConnectionPlus,
             rundescriber,
             output_param,
             start,
-            end)
+            end,
+            ranges=ranges,
+            stride=stride)
     return output
 
 
+def _validate_stride(stride: Optional[int]) -> None:
+    if stride is not None and (not isinstance(stride, (int, np.integer))
+                               or stride < 1):
+        raise ValueError(f'Invalid stride {stride!r}. The stride must be a '
+                         f'positive integer.')
+
+
 def get_shaped_parameter_data_for_one_paramtree(
         conn: ConnectionPlus,
         table_name: str,
         rundescriber: RunDescriber,
         output_param: str,
         start: Optional[int],
-        end: Optional[int]
+        end: Optional[int],
+        ranges: Optional[ParameterRanges] = None,
+        stride: Optional[int] = None
 ) -> Dict[str, np.ndarray]:
     """
     Get the data for a parameter tree and reshape it according to the
@@ -210,8 +252,26 @@ def get_shaped_parameter_data_for_one_paramtree(
         rundescriber,
         output_param,
         start,
-        end
+        end,
+        ranges=ranges,
+        stride=stride
     )
+    return reshape_parameter_data_for_one_paramtree(
+        rundescriber, output_param, one_param_output)
+
+
+def reshape_parameter_data_for_one_paramtree(
+        rundescriber: RunDescriber,
+        output_param: str,
+        one_param_output: Mapping[str, np.ndarray]
+) -> Dict[str, np.ndarray]:
+    """
+    Reshape the data of a parameter tree, as returned by
+    :func:`get_parameter_data_for_one_paramtree`, according to the metadata
+    about the dataset, see :func:`get_shaped_parameter_data_for_one_paramtree`.
+    The given data is not modified.
+    """
+    reshaped_output = dict(one_param_output)
     if rundescriber.shapes is not None:
         shape = rundescriber.shapes.get(output_param)
 
@@ -220,14 +280,14 @@ def get_shaped_parameter_data_for_one_paramtree(
             for name, paramdata in one_param_output.items():
                 total_data_shape = np.prod(paramdata.shape)
                 if total_data_shape == total_len_shape:
-                    one_param_output[name] = paramdata.reshape(shape)
+                    reshaped_output[name] = paramdata.reshape(shape)
                 elif total_data_shape > total_len_shape:
                     log.warning(f"Tried to set data shape for {name} in "
                                 f"dataset {output_param} "
                                 f"from metadata when "
                                 f"loading but found inconsistent lengths "
                                 f"{total_data_shape} and {total_len_shape}")
-    return one_param_output
+    return reshaped_output
 
 
 def get_rundescriber_from_result_table_name(
@@ -255,16 +315,38 @@ def get_parameter_data_for_one_paramtree(
         rundescriber: RunDescriber,
         output_param: str,
         start: Optional[int],
-        end: Optional[int]
+        end: Optional[int],
+        ranges: Optional[ParameterRanges] = None,
+        stride: Optional[int] = None
 ) -> Tuple[Dict[str, np.ndarray], int]:
     interdeps = rundescriber.interdeps
+    typed_columns = _get_typed_columns_for_one_param_tree(
+        conn, table_name, interdeps, output_param, start, end,
+        ranges=ranges, stride=stride
+    )
+    if typed_columns is not None:
+        return typed_columns
+
     data, paramspecs, n_rows = _get_data_for_one_param_tree(
-        conn, table_name, interdeps, output_param, start, end
+        conn, table_name, interdeps, output_param, start, end,
+        ranges=ranges, stride=stride
     )
     if not paramspecs[0].name == output_param:
         raise ValueError("output_param should always be the first "
                          "parameter in a parameter tree. It is not")
-    _expand_data_to_arrays(data, paramspecs)
+    return _convert_rows_to_columns(data, paramspecs), n_rows
+
+
+def _convert_rows_to_columns(data: List[List[Any]],
+                             paramspecs: Sequence[ParamSpecBase]
+                             ) -> Dict[str, np.ndarray]:
+    """
+    Convert rows of values of the parameters of a parameter tree, as read
+    with the sqlite converters, to one array per parameter
+    """
+    array_shape = _regular_array_shape(data, paramspecs)
+    if array_shape is None:
+        _expand_data_to_arrays(data, paramspecs)
 
     param_data = {}
     # Benchmarking shows that transposing the data with python types is
@@ -272,6 +354,10 @@ def get_parameter_data_for_one_paramtree(
     res_t = map(list, zip(*data))
 
     for paramspec, column_data in zip(paramspecs, res_t):
+        if array_shape is not None and paramspec.type != 'array':
+            param_data[paramspec.name] = _broadcast_column_to_arrays(
+                column_data, paramspec, array_shape)
+            continue
         try:
             if paramspec.type == "numeric":
                 # there is no reliable way to
@@ -298,7 +384,219 @@ def get_parameter_data_for_one_paramtree(
             # Not clear which error to catch here. This will only be clarified
             # once numpy actually starts to raise here.
             param_data[paramspec.name] = np.array(column_data, dtype=np.object)
-    return param_data, n_rows
+    return param_data
+
+
+def iter_parameter_data_for_one_paramtree(
+        conn: ConnectionPlus,
+        table_name: str,
+        rundescriber: RunDescriber,
+        output_param: str,
+        chunk_rows: int,
+        ranges: Optional[ParameterRanges] = None,
+        stride: Optional[int] = None
+) -> Iterator[Dict[str, np.ndarray]]:
+    """
+    Iterate over the data of a parameter tree in chunks of at most
+    ``chunk_rows`` rows, as read from a single query that is stepped
+    through chunk by chunk. The chunks are in the format of the data
+    returned for one parameter tree by :func:`get_parameter_data` but are
+    never reshaped. Ranges and stride select the rows like for
+    :func:`get_parameter_data`.
+    """
+    if chunk_rows < 1:
+        raise ValueError(f'Invalid chunk_rows {chunk_rows!r}. The number of '
+                         f'rows per chunk must be a positive integer.')
+    _validate_stride(stride)
+    paramspecs = _get_paramspecs_of_one_param_tree(rundescriber.interdeps,
+                                                   output_param)
+    typed = _can_read_typed_columns(paramspecs)
+    sql, args, remaining_stride = _build_parameter_tree_values_query(
+        conn, table_name, [ps.name for ps in paramspecs], None, None,
+        ranges=ranges, stride=stride,
+        bypass_converters=typed or _numeric_column_names(paramspecs))
+
+    cursor = conn.cursor()
+    cursor.row_factory = None
+    cursor.execute(sql, args)
+    try:
+        while True:
+            # fetching a multiple of the remaining stride keeps the strided
+            # rows of consecutive chunks in step
+            with _garbage_collection_paused():
+                rows = cursor.fetchmany(chunk_rows * remaining_stride)
+                if remaining_stride > 1:
+                    rows = rows[::remaining_stride]
+                if typed:
+                    columns = list(zip(*rows))
+            if len(rows) == 0:
+                return
+            if typed:
+                yield _convert_columns_to_typed_arrays(columns, paramspecs)
+            else:
+                yield _convert_rows_to_columns(
+                    _convert_raw_numeric_values_of_rows(rows, paramspecs),
+                    paramspecs)
+    finally:
+        cursor.close()
+
+
+@contextmanager
+def _garbage_collection_paused() -> Iterator[None]:
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _get_typed_columns_for_one_param_tree(
+        conn: ConnectionPlus, table_name: str,
+        interdeps: InterDependencies_, output_param: str,
+        start: Optional[int], end: Optional[int],
+        ranges: Optional[ParameterRanges] = None,
+        stride: Optional[int] = None
+) -> Optional[Tuple[Dict[str, np.ndarray], int]]:
+    """
+    Get the data of a parameter tree without array parameters as one array
+    per parameter, with the dtype given by the type of the parameter. The
+    values are read without the sqlite converters registered for numeric
+    and complex columns, which would be called for every value, and are
+    converted to arrays column by column instead.
+
+    Returns:
+        The arrays by parameter name and the number of rows read, or None
+        if the tree contains array parameters.
+    """
+    paramspecs = _get_paramspecs_of_one_param_tree(interdeps, output_param)
+    if not _can_read_typed_columns(paramspecs):
+        return None
+
+    # selecting the expression "+column" (which is a no-op in sqlite) rather
+    # than the column means that the values are not passed to the converter
+    # of the declared type of the column
+    sql, args, remaining_stride = _build_parameter_tree_values_query(
+        conn, table_name, [ps.name for ps in paramspecs], start, end,
+        ranges=ranges, stride=stride, bypass_converters=True)
+    cursor = conn.cursor()
+    cursor.row_factory = None
+    # none of the many tuples created for the rows are garbage, so there is
+    # no point in letting them trigger the garbage collector over and over
+    with _garbage_collection_paused():
+        cursor.execute(sql, args)
+        rows = cursor.fetchall()
+        if remaining_stride > 1:
+            rows = rows[::remaining_stride]
+        columns = list(zip(*rows))
+    n_rows = len(rows)
+    del rows
+    if n_rows == 0:
+        return {}, 0
+
+    return _convert_columns_to_typed_arrays(columns, paramspecs), n_rows
+
+
+def _get_paramspecs_of_one_param_tree(interdeps: InterDependencies_,
+                                      output_param: str
+                                      ) -> List[ParamSpecBase]:
+    output_param_spec = interdeps._id_to_paramspec[output_param]
+    dependency_params = list(interdeps.dependencies.get(output_param_spec, ()))
+    return [output_param_spec] + dependency_params
+
+
+def _can_read_typed_columns(paramspecs: Sequence[ParamSpecBase]) -> bool:
+    return all(ps.type in ('numeric', 'text', 'complex') for ps in paramspecs)
+
+
+def _convert_columns_to_typed_arrays(
+        columns: Sequence[Sequence[Any]],
+        paramspecs: Sequence[ParamSpecBase]
+) -> Dict[str, np.ndarray]:
+    """
+    Convert columns of values read without the sqlite converters to arrays
+    with the dtype given by the type of the parameter. If the values of a
+    numeric parameter can not be converted to floats (i.e. if text has been
+    stored for it), they are converted like the sqlite converter would and
+    returned in an array of objects.
+    """
+    param_data = {}
+    for paramspec, column_data in zip(paramspecs, columns):
+        if paramspec.type == 'numeric':
+            # NaN is stored as the text 'nan' which numpy converts to NaN
+            # just like NULL values are converted to NaN
+            try:
+                param_data[paramspec.name] = np.array(column_data,
+                                                      dtype=np.float64)
+            except (ValueError, TypeError):
+                param_data[paramspec.name] = np.array(
+                    [_convert_raw_numeric_value(value)
+                     for value in column_data],
+                    dtype=object)
+        elif paramspec.type == 'complex':
+            param_data[paramspec.name] = _convert_complex_column(column_data)
+        else:
+            param_data[paramspec.name] = np.array(column_data)
+    return param_data
+
+
+def _convert_raw_numeric_value(value: Any) -> Any:
+    """
+    Convert a value of a numeric column read without the sqlite converter
+    like the converter would have
+    """
+    if value is None:
+        return None
+    if type(value) is float:
+        # the converter returns floats with integral values as ints
+        return int(value) if value.is_integer() else value
+    if isinstance(value, str):
+        return _convert_numeric(value.encode())
+    if isinstance(value, bytes):
+        return _convert_numeric(value)
+    return _convert_numeric(repr(value).encode())
+
+
+def _regular_array_shape(data: Sequence[Sequence[Any]],
+                         paramspecs: Sequence[ParamSpecBase]
+                         ) -> Optional[Tuple[int, ...]]:
+    """
+    Return the shape of the arrays that the values of the scalar parameters
+    of a parameter tree with array parameters are expanded to, i.e. the
+    number of rows followed by the shape of the values of the first array
+    parameter. Returns None if there is nothing to expand or the values of
+    the first array parameter do not all have the same shape, in which case
+    the values must be expanded row by row with
+    :func:`_expand_data_to_arrays`.
+    """
+    types = [param.type for param in paramspecs]
+    if 'array' not in types or all(type_ == 'array' for type_ in types):
+        return None
+    first_array_element = types.index('array')
+    shapes = {np.shape(row[first_array_element]) for row in data}
+    if len(shapes) != 1:
+        return None
+    return (len(data),) + shapes.pop()
+
+
+def _broadcast_column_to_arrays(column_data: Sequence[Any],
+                                paramspec: ParamSpecBase,
+                                array_shape: Tuple[int, ...]) -> np.ndarray:
+    """
+    Expand the values of a scalar parameter to one contiguous array of the
+    given shape, with the value of each row repeated along all but the
+    first axis
+    """
+    if paramspec.type == 'numeric':
+        dtype: Optional[type] = np.float64
+    elif paramspec.type == 'complex':
+        dtype = np.complex128
+    else:
+        dtype = None
+    values = np.array(column_data, dtype=dtype)
+    values = values.reshape((-1,) + (1,) * (len(array_shape) - 1))
+    return np.ascontiguousarray(np.broadcast_to(values, array_shape))
 
 
 def _expand_data_to_arrays(data: List[List[Any]], paramspecs: Sequence[ParamSpecBase]) -> None:
@@ -337,24 +635,56 @@ def _expand_data_to_arrays(data: List[List[Any]], paramspecs: Sequence[ParamSpec
 
 def _get_data_for_one_param_tree(conn: ConnectionPlus, table_name: str,
                                  interdeps: InterDependencies_, output_param: str,
-                                 start: Optional[int], end: Optional[int]) \
+                                 start: Optional[int], end: Optional[int],
+                                 ranges: Optional[ParameterRanges] = None,
+                                 stride: Optional[int] = None) \
         -> Tuple[List[List[Any]], List[ParamSpecBase], int]:
     output_param_spec = interdeps._id_to_paramspec[output_param]
     # find all the dependencies of this param
 
     dependency_params = list(interdeps.dependencies.get(output_param_spec, ()))
-    dependency_names = [param.name for param in dependency_params]
     paramspecs = [output_param_spec] + dependency_params
-    res = get_parameter_tree_values(conn,
-                                    table_name,
-                                    output_param,
-                                    *dependency_names,
-                                    start=start,
-                                    end=end)
+    sql, args, remaining_stride = _build_parameter_tree_values_query(
+        conn, table_name, [ps.name for ps in paramspecs], start, end,
+        ranges=ranges, stride=stride,
+        bypass_converters=_numeric_column_names(paramspecs))
+    cursor = conn.cursor()
+    cursor.row_factory = None
+    cursor.execute(sql, args)
+    rows = cursor.fetchall()
+    if remaining_stride > 1:
+        rows = rows[::remaining_stride]
+    res = _convert_raw_numeric_values_of_rows(rows, paramspecs)
     n_rows = len(res)
     return res, paramspecs, n_rows
 
 
+def _numeric_column_names(paramspecs: Sequence[ParamSpecBase]) -> List[str]:
+    return [ps.name for ps in paramspecs if ps.type == 'numeric']
+
+
+def _convert_raw_numeric_values_of_rows(
+        rows: Sequence[Sequence[Any]],
+        paramspecs: Sequence[ParamSpecBase]
+) -> List[List[Any]]:
+    """
+    Convert the values of the numeric parameters in rows that have been
+    read without the sqlite converter for numeric columns, see
+    :func:`_numeric_column_names`. The converter is given the values as
+    text, which sqlite formats with 15 significant digits only, so the
+    values of these columns are read raw and converted here.
+    """
+    numeric_indices = [i for i, ps in enumerate(paramspecs)
+                       if ps.type == 'numeric']
+    converted_rows = []
+    for row in rows:
+        converted_row = list(row)
+        for i in numeric_indices:
+            converted_row[i] = _convert_raw_numeric_value(converted_row[i])
+        converted_rows.append(converted_row)
+    return converted_rows
+
+
 @deprecate('This method does not accurately represent the dataset.',
            'Use `get_parameter_data` instead.')
 def get_values(conn: ConnectionPlus,
@@ -386,7 +716,10 @@ def get_parameter_tree_values(conn: ConnectionPlus,
                               toplevel_param_name: str,
                               *other_param_names: str,
                               start: Optional[int] = None,
-                              end: Optional[int] = None) -> List[List[Any]]:
+                              end: Optional[int] = None,
+                              ranges: Optional[ParameterRanges] = None,
+                              stride: Optional[int] = None
+                              ) -> List[List[Any]]:
     """
     Get the values of one or more columns from a data table. The rows
     retrieved are the rows where the 'toplevel_param_name' column has
@@ -406,12 +739,54 @@ def get_parameter_tree_values(conn: ConnectionPlus,
         end: The (1-indexed) result to include as the last result to be
             returned. None is equivalent to "all the rest". If start > end,
             nothing is returned.
+        ranges: Ranges of the values of the columns (by column name) given
+            as tuples of the lowest and highest value (both included, None
+            for no limit). Only the rows with values within the ranges are
+            returned. ``start`` and ``end`` count the rows within the ranges.
+        stride: Only return every stride-th row of the rows selected by the
+            other arguments.
 
     Returns:
         A list of list. The outer list index is row number, the inner list
         index is parameter value (first toplevel_param, then other_param_names)
     """
 
+    columns = [toplevel_param_name] + list(other_param_names)
+    sql, args, remaining_stride = _build_parameter_tree_values_query(
+        conn, result_table_name, columns, start, end,
+        ranges=ranges, stride=stride)
+
+    cursor = conn.cursor()
+    cursor.execute(sql, args)
+    res = many_many(cursor, *columns)
+
+    if remaining_stride > 1:
+        res = res[::remaining_stride]
+    return res
+
+
+def _build_parameter_tree_values_query(
+        conn: ConnectionPlus,
+        result_table_name: str,
+        columns: Sequence[str],
+        start: Optional[int],
+        end: Optional[int],
+        ranges: Optional[ParameterRanges] = None,
+        stride: Optional[int] = None,
+        bypass_converters: Union[bool, Collection[str]] = False
+) -> Tuple[str, List[Any], int]:
+    """
+    Build the query for :func:`get_parameter_tree_values` and return it
+    together with the values for its placeholders and the stride that
+    remains to be applied to the fetched rows (1 if the query takes care
+    of the stride). The first column is the top level parameter. The ranges
+    are only applied to the columns that are selected. If
+    ``bypass_converters`` is True, the columns are selected as the
+    expressions "+column", which have no declared type, such that the
+    values are not passed to the sqlite converter of the type of the column.
+    If it is a collection of column names, only those columns are selected
+    that way.
+    """
     offset = max((start - 1), 0) if start is not None else 0
     limit = max((end - offset), 0) if end is not None else -1
 
@@ -424,25 +799,79 @@ def get_parameter_tree_values(conn: ConnectionPlus,
     #
     # Also, placeholders seem to be ignored in the WHERE X IS NOT NULL line
 
-    columns = [toplevel_param_name] + list(other_param_names)
+    conditions = [f'{columns[0]} IS NOT NULL']
+    args: List[Any] = []
+    for name, (low, high) in (ranges or {}).items():
+        if name not in columns:
+            continue
+        if any(bound is not None and not isinstance(bound, str)
+               for bound in (low, high)):
+            # NaN is stored as the text 'nan', which sqlite sorts after
+            # all numbers, so it would otherwise be within any range
+            # without an upper limit
+            conditions.append(f"typeof({name}) != 'text'")
+        if low is not None:
+            conditions.append(f'{name} >= ?')
+            args.append(low)
+        if high is not None:
+            conditions.append(f'{name} <= ?')
+            args.append(high)
+    where = ' AND '.join(conditions)
+
     columns_for_select = ','.join(columns)
+    if bypass_converters is True:
+        bypass_converters = columns
+    elif bypass_converters is False:
+        bypass_converters = ()
+    outer_columns_for_select = ','.join(
+        f'+{column}' if column in bypass_converters else column
+        for column in columns)
+
+    # the rows are explicitly ordered since the rows of a query that makes
+    # use of an index on one of the columns come in the order of the index
+    selection = f"""
+                FROM "{result_table_name}"
+                WHERE {where}
+                ORDER BY rowid
+                LIMIT {limit} OFFSET {offset}
+                """
+    if stride is None or stride == 1:
+        sql = f"SELECT {outer_columns_for_select} {selection}"
+        return sql, args, 1
+
+    # numbering the rows with a window function is slow, so if the selected
+    # rows are a block of consecutive rows, which is the case for datasets
+    # with a single parameter tree and for ranges of the outermost setpoint,
+    # every stride-th row is selected by its rowid instead
+    first_rowid, last_rowid, n_rows = transaction(
+        conn,
+        f"SELECT min(rowid), max(rowid), count(*) "
+        f"FROM (SELECT rowid {selection})",
+        *args).fetchone()
+    if n_rows == 0 or last_rowid - first_rowid + 1 == n_rows:
+        sql = f"""
+              SELECT {outer_columns_for_select}
+              FROM "{result_table_name}"
+              WHERE rowid BETWEEN ? AND ?
+              AND (rowid - ?) % {int(stride)} = 0
+              ORDER BY rowid
+              """
+        return sql, [first_rowid, last_rowid, first_rowid], 1
+
+    if not _WINDOW_FUNCTIONS_SUPPORTED:
+        sql = f"SELECT {outer_columns_for_select} {selection}"
+        return sql, args, stride
 
-    sql_subquery = f"""
-                   (SELECT {columns_for_select}
-                    FROM "{result_table_name}"
-                    WHERE {toplevel_param_name} IS NOT NULL)
-                   """
     sql = f"""
-          SELECT {columns_for_select}
-          FROM {sql_subquery}
-          LIMIT {limit} OFFSET {offset}
+          SELECT {outer_columns_for_select}
+          FROM (SELECT {columns_for_select}, _row_id,
+                       ROW_NUMBER() OVER (ORDER BY _row_id) AS _row_number
+                FROM (SELECT {columns_for_select}, rowid AS _row_id
+                      {selection}))
+          WHERE (_row_number - 1) % {int(stride)} = 0
+          ORDER BY _row_id
           """
-
-    cursor = conn.cursor()
-    cursor.execute(sql, ())
-    res = many_many(cursor, *columns)
-
-    return res
+    return sql, args, 1
 
 
 @deprecate(alternative="get_parameter_data")
@@ -967,6 +1396,112 @@ def get_runs(conn: ConnectionPlus,
     return c.fetchall()
 
 
+def get_number_of_runs(conn: ConnectionPlus,
+                       exp_id: Optional[int] = None) -> int:
+    """
+    Get the number of runs
+
+    Args:
+        conn: database connection
+        exp_id: id of the experiment to count the runs of.
+            If None the runs of all experiments are counted
+    """
+    if exp_id is not None:
+        sql = "SELECT COUNT(*) FROM runs WHERE exp_id = ?"
+        c = atomic_transaction(conn, sql, exp_id)
+    else:
+        c = atomic_transaction(conn, "SELECT COUNT(*) FROM runs")
+    return one(c, 'COUNT(*)')
+
+
+#: the columns of the runs table that are part of the catalogue of runs
+_RUN_CATALOGUE_COLUMNS = ("run_id", "exp_id", "name", "guid",
+                          "result_table_name", "result_counter",
+                          "captured_run_id", "captured_counter",
+                          "parameters", "run_timestamp",
+                          "completed_timestamp", "is_completed")
+
+
+def get_run_catalogue(conn: ConnectionPlus,
+                      exp_id: Optional[int] = None,
+                      started_after: Optional[float] = None,
+                      started_before: Optional[float] = None
+                      ) -> List[sqlite3.Row]:
+    """
+    Get the metadata of runs that is stored in the runs table, without the
+    snapshot, the run description and other metadata of arbitrary size,
+    ordered by run id. The selection by experiment and timestamps uses the
+    indices on the runs table.
+
+    Args:
+        conn: database connection
+        exp_id: id of the experiment to get the runs of.
+            If None the runs of all experiments are included
+        started_after: only include runs with a run timestamp at or after
+            this time (in seconds since the Epoch); ignored if None
+        started_before: only include runs with a run timestamp at or before
+            this time (in seconds since the Epoch); ignored if None
+
+    Returns:
+        list of rows with the columns in ``_RUN_CATALOGUE_COLUMNS``
+    """
+    conditions = []
+    values: List[Any] = []
+    if exp_id is not None:
+        conditions.append("exp_id = ?")
+        values.append(exp_id)
+    if started_after is not None:
+        conditions.append("run_timestamp >= ?")
+        values.append(started_after)
+    if started_before is not None:
+        conditions.append("run_timestamp <= ?")
+        values.append(started_before)
+    sql = f"SELECT {', '.join(_RUN_CATALOGUE_COLUMNS)} FROM runs"
+    if conditions:
+        sql += f" WHERE {' AND '.join(conditions)}"
+    sql += " ORDER BY run_id"
+    c = atomic_transaction(conn, sql, *values)
+    return c.fetchall()
+
+
+#: the maximal number of tables whose lengths are queried with one
+#: statement, which is limited by the maximal number of terms of a compound
+#: SELECT statement (SQLITE_MAX_COMPOUND_SELECT)
+_MAX_TABLES_PER_LENGTH_QUERY = 500
+
+
+def get_result_table_lengths(conn: ConnectionPlus,
+                             formatted_names: Sequence[str]
+                             ) -> Dict[str, int]:
+    """
+    Get the lengths of many results tables, as given by
+    :func:`.query_helpers.length`, with few queries
+
+    Args:
+        conn: database connection
+        formatted_names: the names of the results tables
+
+    Returns:
+        The lengths of the tables by their names
+    """
+    # the results tables in result shards are not in the database file
+    shards = get_result_shards_of_tables(conn)
+    lengths = {name: result_shard_length(conn, shards[name][1], name)
+               for name in formatted_names if name in shards}
+    formatted_names = [name for name in formatted_names
+                       if name not in shards]
+    for start in range(0, len(formatted_names),
+                       _MAX_TABLES_PER_LENGTH_QUERY):
+        names = formatted_names[start:start + _MAX_TABLES_PER_LENGTH_QUERY]
+        sql = " UNION ALL ".join(
+            f'SELECT ? AS name, MAX(id) AS length FROM "{name}"'
+            for name in names)
+        c = atomic_transaction(conn, sql, *names)
+        for row in c.fetchall():
+            lengths[row['name']] = row['length'] or 0
+    return lengths
+
+
 def get_last_run(conn: ConnectionPlus,
                  exp_id: Optional[int] = None) -> Optional[int]:
     """
@@ -1352,6 +1887,31 @@ def set_run_timestamp(conn: ConnectionPlus, run_id: int) -> None:
                      f"{current_time}")
 
 
+def create_index_on_parameters(conn: ConnectionPlus,
+                               formatted_name: str,
+                               *param_names: str) -> None:
+    """
+    Create an index on the columns of the given parameters in a results
+    table, unless it exists already. An index makes it fast to select the
+    rows by ranges of the values of its first parameter, see
+    :func:`get_parameter_data`, but makes inserting the results slower.
+
+    Args:
+        conn: the connection to the sqlite database
+        formatted_name: name of the table
+        param_names: names of the parameters to index, the order matters
+    """
+    if len(param_names) == 0:
+        raise ValueError('At least one parameter is needed to create an '
+                         'index.')
+    index_name = f'IX_{formatted_name}_{"_".join(param_names)}'
+    sql = f"""
+          CREATE INDEX IF NOT EXISTS "{index_name}"
+          ON "{formatted_name}" ({','.join(param_names)})
+          """
+    atomic_transaction(conn, sql)
+
+
 def add_parameter(conn: ConnectionPlus,
                   formatted_name: str,
                   *parameter: ParamSpec) -> None:
@@ -1507,7 +2067,8 @@ def create_run(conn: ConnectionPlus, exp_id: int, name: str,
                metadata: Optional[Mapping[str, Any]] = None,
                captured_run_id: Optional[int] = None,
                captured_counter: Optional[int] = None,
-               parent_dataset_links: str = "[]"
+               parent_dataset_links: str = "[]",
+               shard: bool = False
                ) -> Tuple[int, int, str]:
     """ Create a single run for the experiment.
 
@@ -1529,6 +2090,9 @@ def create_run(conn: ConnectionPlus, exp_id: int, name: str,
         - captured_counter: The counter this data was originally captured with.
             Should only be supplied when inserting an already completed run
             from another database into this database. Otherwise leave as None.
+        - shard: whether to create the results table in a result shard of
+            its own rather than in the database file, see
+            :mod:`.result_shards`. Requires a database file.
 
     Returns:
         - run_counter: the id of the newly created run (not unique)
@@ -1536,19 +2100,35 @@ def create_run(conn: ConnectionPlus, exp_id: int, name: str,
         - formatted_name: the name of the newly created table
     """
 
-    with atomic(conn):
-        run_counter, formatted_name, run_id = _insert_run(conn,
-                                                          exp_id,
-                                                          name,
-                                                          guid,
-                                                          parameters,
-                                                          captured_run_id,
-                                                          captured_counter,
-                                                          parent_dataset_links)
-        if metadata:
-            add_meta_data(conn, run_id, metadata)
-        _update_experiment_run_counter(conn, exp_id, run_counter)
-        _create_run_table(conn, formatted_name, parameters, values)
+    # the shard is created within the transaction that inserts the run,
+    # such that the results table exists once the run does. If the
+    # transaction fails, the shard is removed again, since the run id may
+    # be reused by the next run.
+    shard_path: Optional[str] = None
+    try:
+        with atomic(conn):
+            run_counter, formatted_name, run_id = _insert_run(
+                conn, exp_id, name, guid, parameters, captured_run_id,
+                captured_counter, parent_dataset_links)
+            if metadata:
+                add_meta_data(conn, run_id, metadata)
+            _update_experiment_run_counter(conn, exp_id, run_counter)
+            if shard:
+                shard_path = new_result_shard_path(conn.path_to_dbfile,
+                                                   run_id, guid)
+                add_result_shard(conn, run_id, shard_path)
+                shard_conn = create_result_shard(conn, shard_path)
+                try:
+                    _create_run_table(shard_conn, formatted_name, parameters,
+                                      values)
+                finally:
+                    shard_conn.close()
+            else:
+                _create_run_table(conn, formatted_name, parameters, values)
+    except BaseException:
+        if shard_path is not None:
+            remove_result_shard(conn, shard_path)
+        raise
 
     return run_counter, run_id, formatted_name
 
@@ -1803,6 +2383,7 @@ def append_shaped_parameter_data_to_existing_arrays(
         write_status: Dict[str, Optional[int]],
         read_status: Dict[str, int],
         data: Dict[str, Dict[str, np.ndarray]],
+        buffers: Optional[Dict[str, Dict[str, np.ndarray]]] = None
 ) -> Tuple[Dict[str, Optional[int]],
            Dict[str, int],
            Dict[str, Dict[str, np.ndarray]]]:
@@ -1820,6 +2401,59 @@ def append_shaped_parameter_data_to_existing_arrays(
         data: Mapping from dependent parameter name to mapping
           from parameter name to numpy arrays that the data should be
           inserted into.
+        buffers: Mapping from dependent parameter name to mapping
+          from parameter name to the buffers backing the arrays in ``data``
+          of parameters without a known shape. If given, data of such
+          parameters is appended to buffers whose capacity grows
+          geometrically, and the arrays in the returned ``data`` are views
+          on them. This avoids copying all existing data on every append.
+          The mapping is updated in place.
+
+    Returns:
+        Updated write and read status, and the updated ``data``
+    """
+    new_data = {}
+    for meas_parameter in rundescriber.interdeps.non_dependencies:
+        start = read_status.get(meas_parameter.name, 0) + 1
+        new_data[meas_parameter.name] = get_parameter_data_for_one_paramtree(
+            conn,
+            table_name,
+            rundescriber=rundescriber,
+            output_param=meas_parameter.name,
+            start=start,
+            end=None
+        )
+    return append_parameter_data_to_existing_arrays(
+        rundescriber, write_status, read_status, data, new_data, buffers)
+
+
+def append_parameter_data_to_existing_arrays(
+        rundescriber: RunDescriber,
+        write_status: Dict[str, Optional[int]],
+        read_status: Dict[str, int],
+        data: Dict[str, Dict[str, np.ndarray]],
+        new_data: Mapping[str, Tuple[Dict[str, np.ndarray], int]],
+        buffers: Optional[Dict[str, Dict[str, np.ndarray]]] = None
+) -> Tuple[Dict[str, Optional[int]],
+           Dict[str, int],
+           Dict[str, Dict[str, np.ndarray]]]:
+    """
+    Append the given new data to an already existing cache. This is the
+    part of :func:`append_shaped_parameter_data_to_existing_arrays` that
+    does not read from the database, such that data that is known
+    otherwise, e.g. because it has just been written, can be appended.
+
+    Args:
+        rundescriber: The rundescriber that describes the run
+        write_status: See :func:`append_shaped_parameter_data_to_existing_arrays`
+        read_status: See :func:`append_shaped_parameter_data_to_existing_arrays`
+        data: See :func:`append_shaped_parameter_data_to_existing_arrays`
+        new_data: Mapping from dependent parameter name to the new data of
+          the parameter tree, in the format returned by
+          :func:`get_parameter_data_for_one_paramtree`, and the number of
+          rows it has been read from. Parameter trees without new data may
+          be omitted.
+        buffers: See :func:`append_shaped_parameter_data_to_existing_arrays`
 
     Returns:
         Updated write and read status, and the updated ``data``
@@ -1839,34 +2473,45 @@ def append_shaped_parameter_data_to_existing_arrays(
         else:
             shape = None
 
-        start = read_status.get(meas_parameter, 0) + 1
-
-        new_data, n_rows_read = get_parameter_data_for_one_paramtree(
-            conn,
-            table_name,
-            rundescriber=rundescriber,
-            output_param=meas_parameter,
-            start=start,
-            end=None
-        )
+        tree_new_data, n_rows_read = new_data.get(meas_parameter, ({}, 0))
 
         existing_data = data.get(meas_parameter, {})
+        subtree_buffers = (None if buffers is None
+                           else buffers.setdefault(meas_parameter, {}))
 
         subtree_merged_data = {}
-        subtree_parameters = set(existing_data.keys()) | set(new_data.keys())
+        # the order of the parameters is kept, such that the dependent
+        # parameter remains the first parameter of the tree
+        subtree_parameters = dict.fromkeys(
+            itertools.chain(existing_data, tree_new_data))
         new_write_status: Optional[int]
 
         for subtree_param in subtree_parameters:
             existing_values = existing_data.get(subtree_param)
-            new_values = new_data.get(subtree_param)
+            new_values = tree_new_data.get(subtree_param)
             if existing_values is not None and new_values is not None:
-                (subtree_merged_data[subtree_param],
-                 new_write_status) = _insert_into_data_dict(
-                    existing_values,
-                    new_values,
-                    write_status.get(meas_parameter),
-                    shape=shape
-                )
+                meas_write_status = write_status.get(meas_parameter)
+                if (subtree_buffers is not None
+                        and (shape is None or meas_write_status is None)):
+                    (subtree_merged_data[subtree_param],
+                     buffer) = _append_to_buffer(
+                        existing_values,
+                        new_values,
+                        subtree_buffers.get(subtree_param)
+                    )
+                    if buffer is None:
+                        subtree_buffers.pop(subtree_param, None)
+                    else:
+                        subtree_buffers[subtree_param] = buffer
+                    new_write_status = None
+                else:
+                    (subtree_merged_data[subtree_param],
+                     new_write_status) = _insert_into_data_dict(
+                        existing_values,
+                        new_values,
+                        meas_write_status,
+                        shape=shape
+                    )
                 updated_write_status[meas_parameter] = new_write_status
             elif new_values is not None:
                 (subtree_merged_data[subtree_param],
@@ -1887,6 +2532,9 @@ def _create_new_data_dict(new_values: np.ndarray,
                           ) -> Tuple[np.ndarray, int]:
     if shape is None:
         return new_values, new_values.size
+    elif new_values.size == np.prod(shape):
+        # the data is complete, so it is reshaped rather than copied
+        return new_values.reshape(shape), new_values.size
     else:
         n_values = new_values.size
         data = np.zeros(shape, dtype=new_values.dtype)
@@ -1898,6 +2546,53 @@ def _create_new_data_dict(new_values: np.ndarray,
         return data, n_values
 
 
+#: the factor by which the capacity of cache buffers grows
+_BUFFER_GROWTH_FACTOR = 2
+
+
+def _append_to_buffer(
+        existing_values: np.ndarray,
+        new_values: np.ndarray,
+        buffer: Optional[np.ndarray]
+) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    Append the new values to the existing values along the first axis. If
+    the existing values are a view on the first rows of the given buffer and
+    the buffer has sufficient capacity, the new values are written into the
+    free rows of the buffer. Otherwise, the values are copied
+    into a new buffer with a capacity of at least
+    ``_BUFFER_GROWTH_FACTOR`` times the number of existing values, such that
+    the cost of appending is amortised over many appends.
+
+    Returns:
+        The appended values as a view on the first rows of the buffer and
+        the buffer. If the values can not be appended to a buffer, because
+        their shapes do not match, they are appended like by ``np.append``
+        and None is returned as buffer.
+    """
+    if existing_values.shape[1:] != new_values.shape[1:]:
+        return np.append(existing_values, new_values, axis=0), None
+
+    n_existing = existing_values.shape[0]
+    n_total = n_existing + new_values.shape[0]
+    dtype = np.result_type(existing_values, new_values)
+
+    if (buffer is None
+            or existing_values.base is not buffer
+            or existing_values.ctypes.data != buffer.ctypes.data
+            or existing_values.strides != buffer.strides
+            or existing_values.shape[1:] != buffer.shape[1:]
+            or buffer.dtype != dtype
+            or buffer.shape[0] < n_total):
+        capacity = max(n_total, _BUFFER_GROWTH_FACTOR * n_existing)
+        buffer = np.empty((capacity,) + existing_values.shape[1:],
+                          dtype=dtype)
+        buffer[:n_existing] = existing_values
+
+    buffer[n_existing:n_total] = new_values
+    return buffer[:n_total], buffer
+
+
 def _insert_into_data_dict(
         existing_values: np.ndarray,
         new_values: np.ndarray,
@@ -2,11 +2,13 @@
 This module provides a number of convenient general-purpose functions that
 are useful for building more database-specific queries out of them.
 """
+import functools
 import itertools
 import sqlite3
 from distutils.version import LooseVersion
 
-from typing import List, Any, Union, Dict, Tuple, Optional, Sequence
+from typing import (List, Any, Union, Dict, Tuple, Optional, Sequence,
+                    Iterable)
 
 import numpy as np
 from numpy import ndarray
@@ -19,6 +21,15 @@ from qcodes.dataset.sqlite.settings import SQLiteSettings
 # represent the type of  data we can/want map to sqlite column
 VALUE = Union[str, complex, List, ndarray, bool, None]
 VALUES = List[VALUE]
+# values as they are passed to sqlite, where the values of some parameters
+# may already have been encoded to bytes (e.g. compressed arrays)
+ENCODED_VALUE = Union[VALUE, bytes]
+
+# the available strategies for inserting many rows of values at once:
+# 'values' uses INSERT statements with as many rows of placeholders as the
+# sqlite limits allow, 'executemany' executes a prepared single-row INSERT
+# statement for each row
+INSERT_STRATEGIES = ('values', 'executemany')
 
 
 def one(curr: sqlite3.Cursor, column: Union[int, str]) -> Any:
@@ -151,7 +162,8 @@ def insert_values(conn: ConnectionPlus,
 def insert_many_values(conn: ConnectionPlus,
                        formatted_name: str,
                        columns: Sequence[str],
-                       values: Sequence[VALUES],
+                       values: Sequence[Sequence[ENCODED_VALUE]],
+                       strategy: str = 'values'
                        ) -> int:
     """
     Inserts many values for the specified columns.
@@ -161,7 +173,20 @@ def insert_many_values(conn: ConnectionPlus,
     values: [[x1, y1], [x2, y2], [x3, y3]]
 
     NOTE this need to be committed before closing the connection.
+
+    Args:
+        conn: the connection to the sqlite database
+        formatted_name: name of the table
+        columns: names of the columns to insert values into
+        values: the values to insert, one sequence of values per row
+        strategy: how to insert the values, one of ``INSERT_STRATEGIES``
+
+    Returns:
+        the id of the last row inserted by the first multi-row INSERT
+        statement (which inserts as many rows as the sqlite limits allow),
+        regardless of the strategy
     """
+    validate_insert_strategy(strategy)
     # We demand that all values have the same length
     lengths = [len(val) for val in values]
     if len(np.unique(lengths)) > 1:
@@ -171,6 +196,101 @@ def insert_many_values(conn: ConnectionPlus,
     no_of_rows = len(lengths)
     no_of_columns = lengths[0]
 
+    if strategy == 'executemany':
+        return _insert_rows_executemany(conn, formatted_name, columns, values,
+                                        no_of_columns)
+
+    # we need to make values a flat list from a list of list
+    flattened_values = list(itertools.chain.from_iterable(values))
+
+    return _insert_flattened_values(conn, formatted_name, columns,
+                                    flattened_values, no_of_rows,
+                                    no_of_columns)
+
+
+def insert_many_columns(conn: ConnectionPlus,
+                        formatted_name: str,
+                        columns: Sequence[str],
+                        values: Sequence[ndarray],
+                        strategy: str = 'values'
+                        ) -> int:
+    """
+    Inserts many values for the specified columns given column-wise, i.e.
+    as one (1D) array per column. This avoids building one Python
+    container per row as :func:`insert_many_values` requires.
+
+    Example input:
+    columns: ['xparam', 'yparam']
+    values: [np.array([x1, x2, x3]), np.array([y1, y2, y3])]
+
+    NOTE this need to be committed before closing the connection.
+
+    Args:
+        conn: the connection to the sqlite database
+        formatted_name: name of the table
+        columns: names of the columns to insert values into
+        values: the values to insert, one array of values per column
+        strategy: how to insert the values, one of ``INSERT_STRATEGIES``
+
+    Returns:
+        the id of the last row inserted by the first multi-row INSERT
+        statement, as returned by :func:`insert_many_values`
+    """
+    validate_insert_strategy(strategy)
+    lengths = [len(val) for val in values]
+    if len(np.unique(lengths)) > 1:
+        raise ValueError('Wrong input format for values. Must specify the '
+                         'same number of values for all columns. Received'
+                         f' lengths {lengths}.')
+    no_of_rows = lengths[0]
+    no_of_columns = len(columns)
+
+    if strategy == 'executemany':
+        rows = zip(*(_column_to_sql_values(column) for column in values))
+        return _insert_rows_executemany(conn, formatted_name, columns, rows,
+                                        no_of_columns)
+
+    # interleave the columns into the flat, row-major list of values that
+    # the multi-row INSERT statement expects by means of strided slice
+    # assignment; this is done column by column in C
+    flattened_values: List[Any] = [None] * (no_of_rows * no_of_columns)
+    for i, column in enumerate(values):
+        flattened_values[i::no_of_columns] = _column_to_sql_values(column)
+
+    return _insert_flattened_values(conn, formatted_name, columns,
+                                    flattened_values, no_of_rows,
+                                    no_of_columns)
+
+
+def _column_to_sql_values(column: ndarray) -> List[Any]:
+    """
+    Convert a 1D numpy array into a list of values that can be bound
+    directly to an SQL statement.
+
+    Integer, float and string arrays are converted to the corresponding
+    Python types in one go. NaN values in float arrays are replaced by the
+    string "nan", which is what the registered float adapter does for numpy
+    floats (sqlite would otherwise store them as NULL). Any other kind of
+    array (e.g. complex) is returned as a list of numpy scalars such that
+    the registered sqlite adapters are used.
+    """
+    kind = column.dtype.kind
+    if kind in 'iuUS':
+        return column.tolist()
+    elif kind == 'f':
+        sql_values = column.tolist()
+        for index in np.flatnonzero(np.isnan(column)).tolist():
+            sql_values[index] = "nan"
+        return sql_values
+    else:
+        return list(column)
+
+
+def _rows_per_transaction(no_of_columns: int) -> int:
+    """
+    The maximal number of rows that can be inserted with one multi-row
+    INSERT statement given the number of columns of each row.
+    """
     # The TOTAL number of inserted values in one query
     # must be less than the SQLITE_MAX_VARIABLE_NUMBER
 
@@ -186,10 +306,24 @@ def insert_many_values(conn: ConnectionPlus,
         max_var = SQLiteSettings.limits['MAX_COMPOUND_SELECT']
     else:
         max_var = SQLiteSettings.limits['MAX_VARIABLE_NUMBER']
-    rows_per_transaction = int(int(max_var)/no_of_columns)
+    return int(int(max_var)/no_of_columns)
+
+
+def _insert_flattened_values(conn: ConnectionPlus,
+                             formatted_name: str,
+                             columns: Sequence[str],
+                             flattened_values: List[Any],
+                             no_of_rows: int,
+                             no_of_columns: int) -> int:
+    """
+    Insert a flat, row-major list of values into the given columns using
+    as few multi-row INSERT statements as the sqlite limits allow.
+    Returns the id of the last row inserted by the first statement.
+    """
+    rows_per_transaction = _rows_per_transaction(no_of_columns)
 
     _columns = ",".join(columns)
-    _values = "(" + ",".join(["?"] * len(values[0])) + ")"
+    _values = "(" + ",".join(["?"] * no_of_columns) + ")"
 
     a, b = divmod(no_of_rows, rows_per_transaction)
     chunks = a*[rows_per_transaction] + [b]
@@ -209,11 +343,10 @@ def insert_many_values(conn: ConnectionPlus,
                         {_values_x_params}
                      """
             stop += chunk
-            # we need to make values a flat list from a list of list
-            flattened_values = list(
-                itertools.chain.from_iterable(values[start:stop]))
 
-            c = transaction(conn, query, *flattened_values)
+            c = transaction(conn, query,
+                            *flattened_values[start*no_of_columns:
+                                              stop*no_of_columns])
 
             if ii == 0:
                 return_value = c.lastrowid
@@ -222,6 +355,56 @@ def insert_many_values(conn: ConnectionPlus,
     return return_value
 
 
+def validate_insert_strategy(strategy: str) -> None:
+    """
+    Raise a ValueError if the given insert strategy is not one of
+    ``INSERT_STRATEGIES``
+    """
+    if strategy not in INSERT_STRATEGIES:
+        raise ValueError(f'Unknown insert strategy {strategy!r}. Must be '
+                         f'one of {INSERT_STRATEGIES}.')
+
+
+@functools.lru_cache(maxsize=128)
+def _single_row_insert_statement(formatted_name: str,
+                                 columns: Tuple[str, ...]) -> str:
+    """
+    The INSERT statement for one row of values of the given columns. The
+    statements are cached such that the very same string is passed to sqlite
+    for every insert into a given table which allows sqlite to reuse the
+    prepared statement from its statement cache.
+    """
+    _columns = ",".join(columns)
+    return (f'INSERT INTO "{formatted_name}" ({_columns}) '
+            f'VALUES {sql_placeholder_string(len(columns))}')
+
+
+def _insert_rows_executemany(conn: ConnectionPlus,
+                             formatted_name: str,
+                             columns: Sequence[str],
+                             rows: Iterable[Sequence[Any]],
+                             no_of_columns: int) -> int:
+    """
+    Insert the given rows of values by executing a prepared single-row
+    INSERT statement for each of them within one transaction. Returns the
+    id of the row that :func:`_insert_flattened_values` would return for
+    the same rows, i.e. of the last row of the first chunk of rows.
+    """
+    query = _single_row_insert_statement(formatted_name, tuple(columns))
+    rows = iter(rows)
+
+    with atomic(conn) as conn:
+        c = conn.cursor()
+        c.executemany(query, itertools.islice(
+            rows, _rows_per_transaction(no_of_columns)))
+        # lastrowid is not set by executemany
+        c.execute('SELECT last_insert_rowid()')
+        return_value = c.fetchone()[0]
+        c.executemany(query, rows)
+
+    return return_value
+
+
 def modify_values(conn: ConnectionPlus,
                   formatted_name: str,
                   index: int,
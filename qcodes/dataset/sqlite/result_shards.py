@@ -0,0 +1,253 @@
+"""
+This module provides the storage of the results tables of runs in database
+files of their own, the result shards, which are kept in a directory next to
+the database file. The runs, experiments and the rest of the catalogue stay
+in the database file, which records the shard of every sharded run in the
+``result_shards`` table.
+
+Writing results to a shard only locks the shard file, such that
+measurements that run concurrently do not contend for the lock of the
+database file, and the shards of completed runs can be backed up one by
+one.
+
+To read or write the results table of a sharded run, the shard is attached
+to the connection to the database file (as the schema
+``result_shard_<run_id>``), such that the results table can be queried by
+its name like the tables of the database file.
+"""
+import os
+import sqlite3
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from qcodes.dataset.sqlite.connection import (ConnectionPlus,
+                                              atomic_transaction)
+from qcodes.dataset.sqlite.database import (apply_pragma_profile,
+                                            set_journal_mode)
+
+#: the prefix of the schema names of attached shards
+_SCHEMA_PREFIX = 'result_shard_'
+
+#: the maximal number of shards that are attached to a connection at once,
+#: below the default limit of sqlite of 10 attached databases
+_MAX_ATTACHED_SHARDS = 8
+
+
+def result_shard_directory(path_to_db: str) -> str:
+    """
+    Get the directory of the result shards of a database file, which is
+    next to the database file and named after it, e.g. ``experiments_shards``
+    for ``experiments.db``
+    """
+    root, _ = os.path.splitext(path_to_db)
+    return f'{root}_shards'
+
+
+def new_result_shard_path(path_to_db: str, run_id: int, guid: str) -> str:
+    """
+    Get the path of the result shard of a new run, relative to the directory
+    of the database file, such that the database file and its shards can be
+    moved together
+    """
+    directory = os.path.basename(result_shard_directory(path_to_db))
+    return os.path.join(directory, f'{run_id}-{guid}.db')
+
+
+def _absolute_shard_path(path_to_db: str, shard_path: str) -> str:
+    return os.path.join(os.path.dirname(os.path.abspath(path_to_db)),
+                        shard_path)
+
+
+def _schema(run_id: int) -> str:
+    return f'{_SCHEMA_PREFIX}{run_id}'
+
+
+def create_result_shard(conn: ConnectionPlus,
+                        shard_path: str) -> ConnectionPlus:
+    """
+    Create the file of a result shard of the database of the given
+    connection, with the journal mode of the database
+
+    Args:
+        conn: connection to the database
+        shard_path: path of the shard relative to the directory of the
+            database file
+
+    Returns:
+        A connection to the new shard, for creating the results table
+    """
+    path = _absolute_shard_path(conn.path_to_dbfile, shard_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+    shard_conn = ConnectionPlus(sqlite3.connect(path))
+    set_journal_mode(shard_conn, journal_mode.upper())
+    return shard_conn
+
+
+def remove_result_shard(conn: ConnectionPlus, shard_path: str) -> None:
+    """
+    Remove the file of a result shard of the database of the given
+    connection (along with its journal, if any), e.g. when the transaction
+    that creates the run of the shard is rolled back
+
+    Args:
+        conn: connection to the database
+        shard_path: path of the shard relative to the directory of the
+            database file
+    """
+    path = _absolute_shard_path(conn.path_to_dbfile, shard_path)
+    for suffix in ('', '-journal', '-wal', '-shm'):
+        try:
+            os.remove(path + suffix)
+        except FileNotFoundError:
+            pass
+
+
+def add_result_shard(conn: ConnectionPlus, run_id: int,
+                     shard_path: str) -> None:
+    """
+    Record the result shard of a run in the database
+
+    Args:
+        conn: connection to the database
+        run_id: the run id of the run
+        shard_path: path of the shard relative to the directory of the
+            database file
+    """
+    sql = "INSERT INTO result_shards (run_id, path) VALUES (?, ?)"
+    atomic_transaction(conn, sql, run_id, shard_path)
+
+
+def get_result_shard(conn: ConnectionPlus, run_id: int) -> Optional[str]:
+    """
+    Get the path of the result shard of a run relative to the directory of
+    the database file, or None if the results table of the run is in the
+    database file
+    """
+    try:
+        row = conn.execute("SELECT path FROM result_shards WHERE run_id = ?",
+                           (run_id,)).fetchone()
+    except sqlite3.OperationalError:
+        # databases before version 11 have no result shards
+        return None
+    return None if row is None else row[0]
+
+
+def get_result_shard_of_table(conn: ConnectionPlus, table_name: str
+                              ) -> Optional[Tuple[int, str]]:
+    """
+    Get the run id and the path of the result shard of a results table, or
+    None if the results table is in the database file
+    """
+    sql = """
+    SELECT result_shards.run_id, result_shards.path
+    FROM result_shards
+    JOIN runs ON runs.run_id = result_shards.run_id
+    WHERE runs.result_table_name = ?
+    """
+    try:
+        row = conn.execute(sql, (table_name,)).fetchone()
+    except sqlite3.OperationalError:
+        # databases before version 11 have no result shards
+        return None
+    return None if row is None else (row[0], row[1])
+
+
+def get_result_shards_of_tables(conn: ConnectionPlus
+                                ) -> Dict[str, Tuple[int, str]]:
+    """
+    Get the run ids and paths of the result shards of all sharded runs in
+    the database by the names of their results tables
+    """
+    sql = """
+    SELECT runs.result_table_name, result_shards.run_id, result_shards.path
+    FROM result_shards
+    JOIN runs ON runs.run_id = result_shards.run_id
+    """
+    try:
+        rows = conn.execute(sql).fetchall()
+    except sqlite3.OperationalError:
+        # databases before version 11 have no result shards
+        return {}
+    return {row[0]: (row[1], row[2]) for row in rows}
+
+
+def attach_result_shard(conn: ConnectionPlus, run_id: int,
+                        shard_path: str) -> None:
+    """
+    Attach the result shard of a run to a connection to the database, and
+    set it up with the sqlite pragma profile of the config. This can not be
+    done within a transaction.
+    """
+    path = _absolute_shard_path(conn.path_to_dbfile, shard_path)
+    schema = _schema(run_id)
+    conn.execute(f"ATTACH DATABASE ? AS {schema}", (path,))
+    apply_pragma_profile(conn, schema=schema)
+
+
+def detach_result_shard(conn: ConnectionPlus, run_id: int) -> None:
+    """
+    Detach the result shard of a run from a connection to the database.
+    This can not be done within a transaction.
+    """
+    conn.execute(f"DETACH DATABASE {_schema(run_id)}")
+
+
+def result_shard_length(conn: ConnectionPlus, shard_path: str,
+                        table_name: str) -> int:
+    """
+    Get the length of a results table in a result shard, as given by
+    :func:`.query_helpers.length`, without attaching the shard to the
+    connection to the database
+    """
+    path = _absolute_shard_path(conn.path_to_dbfile, shard_path)
+    shard_conn = sqlite3.connect(f'{Path(path).as_uri()}?mode=ro', uri=True)
+    try:
+        row = shard_conn.execute(f'SELECT MAX(id) FROM "{table_name}"'
+                                 ).fetchone()
+    finally:
+        shard_conn.close()
+    return row[0] or 0
+
+
+class ResultShardAttacher:
+    """
+    Attaches the result shards of results tables on demand to a connection
+    that writes to the results tables of many runs, such as the connection
+    of the background writer. The least recently used shards are detached
+    to stay below the limit of sqlite on the number of attached databases.
+
+    Args:
+        conn: connection to the database
+    """
+
+    def __init__(self, conn: ConnectionPlus) -> None:
+        self._conn = conn
+        self._shards_by_table: Dict[str, Optional[Tuple[int, str]]] = {}
+        #: the run ids of the attached shards, least recently used first
+        self._attached: "OrderedDict[int, None]" = OrderedDict()
+        for row in conn.execute("PRAGMA database_list").fetchall():
+            if row[1].startswith(_SCHEMA_PREFIX):
+                self._attached[int(row[1][len(_SCHEMA_PREFIX):])] = None
+
+    def attach(self, table_name: str) -> None:
+        """
+        Make sure that the results table can be queried by its name with
+        the connection. This can not be done within a transaction.
+        """
+        if table_name not in self._shards_by_table:
+            self._shards_by_table[table_name] = get_result_shard_of_table(
+                self._conn, table_name)
+        shard = self._shards_by_table[table_name]
+        if shard is None:
+            return
+        run_id, shard_path = shard
+        if run_id in self._attached:
+            self._attached.move_to_end(run_id)
+            return
+        while len(self._attached) >= _MAX_ATTACHED_SHARDS:
+            detached_run_id, _ = self._attached.popitem(last=False)
+            detach_result_shard(self._conn, detached_run_id)
+        attach_result_shard(self._conn, run_id, shard_path)
+        self._attached[run_id] = None
@@ -343,6 +343,163 @@ def test_setting_write_in_background_from_config(write_in_background):
             assert datasaver.dataset._writer_status.write_in_background is write_in_background
 
 
+@pytest.mark.usefixtures("experiment")
+def test_write_in_background_process():
+    meas = Measurement()
+    meas.register_custom_parameter(name='x')
+    meas.register_custom_parameter(name='y', setpoints=('x',))
+    meas.register_custom_parameter(name='label', setpoints=('x',),
+                                   paramtype='text')
+
+    xs = np.linspace(0, 1, 101)
+    with meas.run(write_in_background='process') as datasaver:
+        assert datasaver.dataset._writer_status.write_in_background == 'process'
+        datasaver.add_result(('x', xs), ('y', 2 * xs))
+        datasaver.flush_data_to_database()
+        datasaver.add_result(('x', 2), ('label', 'last'))
+        datasaver.flush_data_to_database(block=True)
+        assert datasaver.writer_statistics.items_written == 2
+        assert datasaver.points_written == 102
+
+    data = datasaver.dataset.get_parameter_data()
+    np.testing.assert_allclose(data['y']['x'], xs)
+    np.testing.assert_allclose(data['y']['y'], 2 * xs)
+    np.testing.assert_array_equal(data['label']['label'], ['last'])
+    assert datasaver.dataset._writer_status.bg_writer is None
+
+
+@pytest.mark.parametrize("bg_writing", [True, 'process'])
+def test_write_in_background_failure_raises(experiment, bg_writing):
+    meas = Measurement()
+    meas.register_custom_parameter(name='x')
+
+    with pytest.raises(RuntimeError, match='no such table'):
+        with meas.run(write_in_background=bg_writing) as datasaver:
+            datasaver.add_result(('x', 0))
+            datasaver.flush_data_to_database(block=True)
+            table_name = datasaver.dataset.table_name
+            experiment.conn.execute(
+                f'ALTER TABLE "{table_name}" RENAME TO "renamed"')
+            experiment.conn.commit()
+            datasaver.add_result(('x', 1))
+            datasaver.flush_data_to_database(block=True)
+
+    assert datasaver.dataset.completed
+    assert datasaver.dataset._writer_status.bg_writer is None
+
+
+@pytest.mark.usefixtures("experiment")
+def test_write_in_background_process_exit_raises():
+    meas = Measurement()
+    meas.register_custom_parameter(name='x')
+
+    with meas.run(write_in_background='process') as datasaver:
+        datasaver.add_result(('x', 0))
+        datasaver.flush_data_to_database(block=True)
+        writer = datasaver.dataset._writer_status.bg_writer
+        writer.process.kill()
+        writer.process.join()
+        datasaver.add_result(('x', 1))
+        with pytest.raises(RuntimeError, match='writer process has exited'):
+            datasaver.flush_data_to_database(block=True)
+
+    assert datasaver.dataset.completed
+
+
+@pytest.mark.usefixtures("experiment")
+def test_write_in_background_invalid_value_raises():
+    meas = Measurement()
+    meas.register_custom_parameter(name='dummy')
+    with pytest.raises(ValueError, match='Invalid value'):
+        with meas.run(write_in_background='thread'):
+            pass
+
+
+@pytest.mark.parametrize("insert_strategy", ["values", "executemany"])
+@pytest.mark.usefixtures("experiment")
+def test_setting_insert_strategy_from_config(insert_strategy):
+    with reset_config_on_exit():
+        qc.config.dataset.insert_strategy = insert_strategy
+
+        meas = Measurement()
+        meas.register_custom_parameter(name='dummy')
+        with meas.run() as datasaver:
+            assert datasaver.dataset._insert_strategy == insert_strategy
+
+
+@pytest.mark.parametrize("bg_writing", [True, False])
+@pytest.mark.parametrize("insert_strategy", ["values", "executemany"])
+@pytest.mark.usefixtures("experiment")
+def test_datasaver_insert_strategy(bg_writing, insert_strategy):
+    meas = Measurement()
+    meas.register_custom_parameter(name='x')
+    meas.register_custom_parameter(name='y', setpoints=('x',))
+
+    xs = np.linspace(0, 1, 11)
+    with meas.run(write_in_background=bg_writing,
+                  insert_strategy=insert_strategy) as datasaver:
+        assert datasaver.dataset._insert_strategy == insert_strategy
+        for x in xs:
+            datasaver.add_result(('x', x), ('y', 2 * x))
+        datasaver.add_result(('x', xs), ('y', 2 * xs))
+
+    data = datasaver.dataset.get_parameter_data()['y']
+    np.testing.assert_allclose(data['x'], np.concatenate((xs, xs)))
+    np.testing.assert_allclose(data['y'], 2 * np.concatenate((xs, xs)))
+
+
+def test_unknown_insert_strategy_raises(experiment):
+    meas = Measurement()
+    meas.register_custom_parameter(name='dummy')
+    with pytest.raises(ValueError, match='Unknown insert strategy'):
+        with meas.run(insert_strategy='unknown'):
+            pass
+    # the strategy is validated before the run is created
+    assert experiment.last_counter == 0
+
+
+@pytest.mark.parametrize("bg_writing", [True, False, 'process'])
+@pytest.mark.usefixtures("experiment")
+def test_compressed_array_parameter(bg_writing):
+    meas = Measurement()
+    meas.register_custom_parameter(name='freq', paramtype='array')
+    meas.register_custom_parameter(name='spectrum', paramtype='array',
+                                   setpoints=('freq',),
+                                   codec='delta+shuffle+zlib')
+    freqs = np.linspace(1e9, 2e9, 1001)
+    spectra = [np.round(np.sin(freqs / 1e8 + i) * 1000) for i in range(3)]
+
+    with meas.run(write_in_background=bg_writing) as datasaver:
+        for spectrum in spectra:
+            datasaver.add_result(('freq', freqs), ('spectrum', spectrum))
+    dataset = datasaver.dataset
+
+    loaded = load_by_id(dataset.run_id)
+    interdeps = loaded.description.interdeps
+    assert interdeps['spectrum'].codec == 'delta+shuffle+zlib'
+    assert interdeps['freq'].codec is None
+
+    raw_sizes = atomic_transaction(
+        dataset.conn,
+        f'SELECT length(freq), length(spectrum) FROM "{dataset.table_name}"'
+    ).fetchall()
+    assert all(spectrum_size < freq_size / 2
+               for freq_size, spectrum_size in raw_sizes)
+
+    for data in (loaded.get_parameter_data(), dataset.cache.data()):
+        assert_array_equal(data['spectrum']['spectrum'], spectra)
+        assert_array_equal(data['spectrum']['freq'], [freqs] * 3)
+
+
+def test_register_parameter_with_invalid_codec_raises():
+    meas = Measurement()
+    with pytest.raises(ValueError, match='Only parameters of type array'):
+        meas.register_custom_parameter(name='x', codec='zlib')
+    with pytest.raises(ValueError, match="Unknown filter 'sort'"):
+        meas.register_custom_parameter(name='x', paramtype='array',
+                                       codec='sort+zlib')
+
+
 @pytest.mark.usefixtures("experiment")
 def test_method_chaining(DAC):
     meas = (
@@ -0,0 +1,105 @@
+import pytest
+
+import qcodes.dataset.catalogue
+import qcodes.dataset.experiment_container
+import qcodes.dataset.sqlite.queries
+from qcodes.dataset.catalogue import run_catalogue
+from qcodes.dataset.experiment_container import new_experiment
+from qcodes.dataset.measurements import Measurement
+
+
+def _make_runs(exp, n_runs):
+    meas = Measurement(exp)
+    meas.register_custom_parameter('x')
+    meas.register_custom_parameter('y', setpoints=('x',))
+    datasets = []
+    for i in range(n_runs):
+        with meas.run() as datasaver:
+            for x in range(i):
+                datasaver.add_result(('x', x), ('y', 2 * x))
+        datasets.append(datasaver.dataset)
+    return datasets
+
+
+@pytest.mark.usefixtures("empty_temp_db")
+def test_run_catalogue_matches_datasets():
+    exp_1 = new_experiment('exp_1', 'sample')
+    datasets = _make_runs(exp_1, 3)
+    pristine_dataset = exp_1.new_data_set('pristine')
+    exp_2 = new_experiment('exp_2', 'sample')
+    datasets += _make_runs(exp_2, 2)
+    datasets.insert(3, pristine_dataset)
+
+    records = run_catalogue()
+    assert [record.run_id for record in records] == [
+        dataset.run_id for dataset in datasets]
+    for record, dataset in zip(records, datasets):
+        assert record.exp_id == dataset.exp_id
+        assert record.name == dataset.name
+        assert record.guid == dataset.guid
+        assert record.counter == dataset.counter
+        assert record.captured_run_id == dataset.captured_run_id
+        assert record.captured_counter == dataset.captured_counter
+        assert record.parameters == dataset.parameters
+        assert record.run_timestamp_raw == dataset.run_timestamp_raw
+        assert record.run_timestamp() == dataset.run_timestamp()
+        assert (record.completed_timestamp_raw
+                == dataset.completed_timestamp_raw)
+        assert record.completed == dataset.completed
+        assert record.length == len(dataset)
+        assert record.dataset.guid == dataset.guid
+
+    assert [record.run_id for record in run_catalogue(exp_id=exp_2.exp_id)
+            ] == [dataset.run_id for dataset in datasets[4:]]
+    assert all(record.length is None
+               for record in run_catalogue(with_lengths=False))
+
+
+@pytest.mark.usefixtures("empty_temp_db")
+def test_run_catalogue_selects_runs_by_run_timestamp():
+    exp = new_experiment('exp', 'sample')
+    datasets = _make_runs(exp, 3)
+    exp.new_data_set('pristine')
+    timestamps = [dataset.run_timestamp_raw for dataset in datasets]
+
+    records = run_catalogue(started_after=timestamps[1])
+    assert [record.run_id for record in records] == [
+        dataset.run_id for dataset in datasets[1:]]
+    records = run_catalogue(started_after=timestamps[0],
+                            started_before=timestamps[1])
+    assert [record.run_id for record in records] == [
+        dataset.run_id for dataset in datasets[:2]]
+
+
+@pytest.mark.usefixtures("empty_temp_db")
+def test_run_catalogue_queries_lengths_in_batches(monkeypatch):
+    monkeypatch.setattr(qcodes.dataset.sqlite.queries,
+                        '_MAX_TABLES_PER_LENGTH_QUERY', 2)
+    exp = new_experiment('exp', 'sample')
+    datasets = _make_runs(exp, 5)
+    assert [record.length for record in run_catalogue()] == [
+        len(dataset) for dataset in datasets]
+
+
+@pytest.mark.usefixtures("empty_temp_db")
+def test_experiment_len_and_repr_do_not_load_datasets(monkeypatch):
+    exp = new_experiment('exp', 'sample')
+    _make_runs(exp, 3)
+    exp.new_data_set('pristine')
+    expected_repr = "\n".join(
+        [f"{exp.name}#{exp.sample_name}#{exp.exp_id}@{exp.path_to_db}",
+         "-" * len(f"{exp.name}#{exp.sample_name}#{exp.exp_id}"
+                   f"@{exp.path_to_db}")]
+        + [f"{d.run_id}-{d.name}-{d.counter}-{d.parameters}-{len(d)}"
+           for d in exp.data_sets()])
+
+    def load_by_id(*args, **kwargs):
+        raise AssertionError('A dataset has been loaded')
+
+    monkeypatch.setattr(qcodes.dataset.catalogue, 'load_by_id', load_by_id)
+    monkeypatch.setattr(qcodes.dataset.experiment_container, 'load_by_id',
+                        load_by_id)
+    assert len(exp) == 4
+    assert repr(exp) == expected_repr
+    assert [record.name for record in exp.runs()] == [
+        'results', 'results', 'results', 'pristine']
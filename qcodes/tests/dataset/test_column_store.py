@@ -0,0 +1,151 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+from numpy.testing import assert_array_equal
+
+from qcodes import load_by_id
+from qcodes.dataset.column_store import (columns_path, read_columns,
+                                         write_columns)
+from qcodes.dataset.measurements import Measurement
+
+
+@pytest.fixture
+def completed_dataset(experiment):
+    meas = Measurement(exp=experiment)
+    meas.register_custom_parameter('x')
+    meas.register_custom_parameter('label', paramtype='text')
+    meas.register_custom_parameter('y', setpoints=('x',))
+    meas.register_custom_parameter('z', paramtype='complex',
+                                   setpoints=('x', 'label'))
+    meas.register_custom_parameter('f', paramtype='array')
+    meas.register_custom_parameter('spectrum', paramtype='array',
+                                   setpoints=('f',))
+    meas.set_shapes({'y': (5,)})
+
+    with meas.run() as datasaver:
+        for x in range(5):
+            datasaver.add_result(('x', x), ('y', 2 * x))
+            datasaver.add_result(('x', x), ('label', f'{x}'),
+                                 ('z', x + 1j))
+        # arrays of varying length can not be memory mapped
+        datasaver.add_result(('f', np.arange(2)), ('spectrum', np.ones(2)))
+        datasaver.add_result(('f', np.arange(3)), ('spectrum', np.ones(3)))
+    yield datasaver.dataset
+
+
+def _assert_data_equal(data, expected):
+    assert data.keys() == expected.keys()
+    for tree_name, tree in expected.items():
+        assert data[tree_name].keys() == tree.keys()
+        for name, values in tree.items():
+            assert data[tree_name][name].dtype == values.dtype
+            if values.dtype.hasobject:
+                # the ragged arrays that are not materialised
+                for row, expected_row in zip(data[tree_name][name], values):
+                    assert_array_equal(row, expected_row)
+            else:
+                assert_array_equal(data[tree_name][name], values)
+
+
+def test_columns_path(tmp_path):
+    db_path = str(tmp_path / 'experiments.db')
+    assert columns_path(db_path, 'some-guid') == (
+        tmp_path / 'experiments_columns' / 'some-guid')
+    with pytest.raises(ValueError, match='in-memory database'):
+        columns_path(':memory:', 'some-guid')
+
+
+def test_write_and_read_columns(tmp_path):
+    data = {'y': {'y': np.arange(6.).reshape(2, 3),
+                  'x': np.array(['a', 'b'])},
+            'weird name/with slash': {'weird name/with slash': np.ones(2)},
+            'ragged': {'ragged': np.array([np.ones(1), None], dtype=object)}}
+    path = tmp_path / 'columns'
+    write_columns(path, data)
+
+    columns = read_columns(path)
+    del data['ragged']
+    _assert_data_equal(columns, data)
+    assert not columns['y']['y'].flags.writeable
+    assert isinstance(columns['y']['y'].base, np.memmap)
+
+    # writing the columns again replaces the old ones
+    write_columns(path, {'y': data['y']})
+    assert read_columns(path).keys() == {'y'}
+
+
+def test_read_columns_without_index(tmp_path):
+    assert read_columns(tmp_path / 'does_not_exist') is None
+    write_columns(tmp_path, {'y': {'y': np.ones(2)}})
+    (tmp_path / 'index.json').unlink()
+    assert read_columns(tmp_path) is None
+
+
+def test_read_columns_of_other_format_version(tmp_path):
+    write_columns(tmp_path, {'y': {'y': np.ones(2)}})
+    with open(tmp_path / 'index.json', 'w') as index_file:
+        json.dump({'format_version': 1000, 'trees': []}, index_file)
+    assert read_columns(tmp_path) is None
+
+
+def test_materialise_columns(completed_dataset):
+    expected = completed_dataset.get_parameter_data()
+
+    path = Path(completed_dataset.materialise_columns())
+    assert path == columns_path(completed_dataset.path_to_db,
+                                completed_dataset.guid)
+
+    loaded = load_by_id(completed_dataset.run_id)
+    data = loaded.get_parameter_data()
+    _assert_data_equal(data, expected)
+    assert isinstance(data['y']['y'].base, np.memmap)
+    assert isinstance(data['z']['label'].base, np.memmap)
+    assert not isinstance(data['spectrum']['spectrum'].base, np.memmap)
+
+    # selections of results are read from the database
+    data = loaded.get_parameter_data('y', start=2)
+    assert_array_equal(data['y']['y'], [2, 4, 6, 8])
+    assert not isinstance(data['y']['y'].base, np.memmap)
+
+    loaded.remove_materialised_columns()
+    assert not path.exists()
+    data = loaded.get_parameter_data()
+    _assert_data_equal(data, expected)
+    assert not isinstance(data['y']['y'].base, np.memmap)
+
+
+def test_cache_uses_materialised_columns(experiment, completed_dataset):
+    meas = Measurement(exp=experiment)
+    meas.register_custom_parameter('x')
+    meas.register_custom_parameter('y', setpoints=('x',))
+    with meas.run() as datasaver:
+        for x in range(3):
+            datasaver.add_result(('x', x), ('y', x))
+    other_dataset = datasaver.dataset
+
+    completed_dataset.materialise_columns()
+    other_dataset.materialise_columns()
+
+    # the tree of the parameter with the ragged arrays is not materialised
+    # so the cache is read from the database
+    loaded = load_by_id(completed_dataset.run_id)
+    data = loaded.cache.data()
+    _assert_data_equal(data, completed_dataset.cache.data())
+    assert not isinstance(data['y']['y'].base, np.memmap)
+
+    loaded = load_by_id(other_dataset.run_id)
+    data = loaded.cache.data()
+    _assert_data_equal(data, other_dataset.get_parameter_data())
+    assert isinstance(data['y']['y'].base, np.memmap)
+    assert loaded.cache.to_pandas()['y'].index.name == 'x'
+
+
+def test_materialise_columns_of_uncompleted_dataset_raises(experiment):
+    meas = Measurement(exp=experiment)
+    meas.register_custom_parameter('x')
+    with meas.run() as datasaver:
+        datasaver.add_result(('x', 1))
+        with pytest.raises(RuntimeError, match='has not been completed'):
+            datasaver.dataset.materialise_columns()
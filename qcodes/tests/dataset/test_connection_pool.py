@@ -0,0 +1,177 @@
+import os
+import sqlite3
+import threading
+
+import pytest
+
+from qcodes.dataset.data_set import load_by_id
+from qcodes.dataset.experiment_container import load_experiment
+from qcodes.dataset.measurements import Measurement
+from qcodes.dataset.sqlite.database import (_connect_to_pool, connect,
+                                            connection_pool)
+from qcodes.dataset.sqlite.connection import atomic
+from qcodes.dataset.sqlite.pool import ConnectionPool, PoolStatistics
+
+
+@pytest.fixture
+def pool():
+    pool = ConnectionPool(_connect_to_pool)
+    try:
+        yield pool
+    finally:
+        pool.close_all()
+
+
+def _same_connection(first, second):
+    return first.__wrapped__ is second.__wrapped__
+
+
+def test_connection_is_reused(pool, tmp_path):
+    path = str(tmp_path / 'pooled.db')
+    conn = pool.connection(path)
+    assert _same_connection(pool.connection(path), conn)
+    assert _same_connection(pool.connection(os.path.relpath(path)), conn)
+    assert pool.statistics == PoolStatistics(hits=2, misses=1)
+
+    debug_conn = pool.connection(path, debug=True)
+    assert not _same_connection(debug_conn, conn)
+    assert pool.statistics == PoolStatistics(hits=2, misses=2)
+
+    other_path = str(tmp_path / 'other.db')
+    assert not _same_connection(pool.connection(other_path), conn)
+    assert pool.statistics == PoolStatistics(hits=2, misses=3)
+
+
+def test_closing_a_handle_does_not_close_the_connection(pool, tmp_path):
+    path = str(tmp_path / 'pooled.db')
+    conn = pool.connection(path)
+    other_conn = pool.connection(path)
+    conn.close()
+    with pytest.raises(sqlite3.ProgrammingError, match='closed database'):
+        conn.execute('SELECT 1')
+    # closing a handle twice has no effect
+    conn.close()
+    other_conn.execute('SELECT 1')
+    assert _same_connection(pool.connection(path), other_conn)
+    assert pool.statistics == PoolStatistics(hits=2, misses=1)
+
+
+def test_atomic_blocks_span_handles(pool, tmp_path):
+    path = str(tmp_path / 'pooled.db')
+    conn = pool.connection(path)
+    other_conn = pool.connection(path)
+    with atomic(conn):
+        conn.execute('CREATE TABLE numbers (n INTEGER)')
+        with atomic(other_conn):
+            other_conn.execute('INSERT INTO numbers VALUES (1)')
+        assert other_conn.atomic_in_progress
+    assert not other_conn.atomic_in_progress
+    assert conn.execute('SELECT n FROM numbers').fetchall()[0][0] == 1
+
+
+def test_closed_connection_is_replaced(pool, tmp_path):
+    path = str(tmp_path / 'pooled.db')
+    conn = pool.connection(path)
+    # the handles that are garbage collected are released
+    pool.connection(path)
+    conn.close()
+    new_conn = pool.connection(path)
+    assert not _same_connection(new_conn, conn)
+    new_conn.execute('SELECT 1')
+    assert pool.statistics == PoolStatistics(hits=1, misses=2)
+
+
+def test_connection_to_replaced_file_is_replaced(pool, tmp_path):
+    path = str(tmp_path / 'pooled.db')
+    conn = pool.connection(path)
+    replacement_path = str(tmp_path / 'replacement.db')
+    connect(replacement_path).close()
+    os.replace(replacement_path, path)
+
+    new_conn = pool.connection(path)
+    assert not _same_connection(new_conn, conn)
+    assert pool.statistics == PoolStatistics(hits=0, misses=2)
+
+
+def test_in_memory_connections_are_not_pooled(pool):
+    conn = pool.connection(':memory:')
+    assert pool.connection(':memory:') is not conn
+    assert pool.statistics == PoolStatistics(hits=0, misses=2)
+
+
+def test_threads_get_their_own_connections(pool, tmp_path):
+    path = str(tmp_path / 'pooled.db')
+    conn = pool.connection(path)
+    thread_conns = []
+
+    def get_connections():
+        thread_conns.append(pool.connection(path))
+        thread_conns.append(pool.connection(path))
+        thread_conns[-1].execute('SELECT 1')
+
+    thread = threading.Thread(target=get_connections)
+    thread.start()
+    thread.join()
+
+    assert _same_connection(thread_conns[0], thread_conns[1])
+    assert not _same_connection(thread_conns[0], conn)
+    assert pool.statistics == PoolStatistics(hits=1, misses=2)
+
+
+def test_writer_is_checked_out_by_one_thread_at_a_time(pool, tmp_path):
+    path = str(tmp_path / 'pooled.db')
+    writer = pool.acquire_writer(path)
+    acquired = threading.Event()
+    thread_writers = []
+
+    def acquire_writer():
+        thread_writers.append(pool.acquire_writer(path))
+        acquired.set()
+        # the writer may be used in a thread other than the one it is made in
+        thread_writers[0].execute('SELECT 1')
+        pool.release_writer(thread_writers[0])
+
+    thread = threading.Thread(target=acquire_writer)
+    thread.start()
+    assert not acquired.wait(timeout=0.2)
+
+    pool.release_writer(writer)
+    thread.join()
+    assert thread_writers == [writer]
+    assert not _same_connection(writer, pool.connection(path))
+    assert pool.statistics == PoolStatistics(hits=1, misses=2)
+
+    pool.close_all()
+    assert pool.acquire_writer(path) is not writer
+
+
+@pytest.mark.usefixtures("experiment")
+def test_load_by_id_reuses_connection():
+    meas = Measurement()
+    meas.register_custom_parameter('x')
+    meas.register_custom_parameter('y', setpoints=('x',))
+    with meas.run(write_in_background=True) as datasaver:
+        datasaver.add_result(('x', 1), ('y', 2))
+    run_id = datasaver.run_id
+
+    hits = connection_pool.statistics.hits
+    dataset = load_by_id(run_id)
+    assert _same_connection(load_by_id(run_id).conn, dataset.conn)
+    assert connection_pool.statistics.hits == hits + 2
+    assert dataset.get_parameter_data()['y']['y'].tolist() == [2]
+
+
+def test_closing_the_connection_of_a_dataset_keeps_others_open(experiment):
+    meas = Measurement(experiment)
+    meas.register_custom_parameter('x')
+    meas.register_custom_parameter('y', setpoints=('x',))
+    with meas.run() as datasaver:
+        datasaver.add_result(('x', 1), ('y', 2))
+    run_id = datasaver.run_id
+
+    first = load_by_id(run_id)
+    second = load_by_id(run_id)
+    exp = load_experiment(experiment.exp_id)
+    first.conn.close()
+    assert second.get_parameter_data()['y']['y'].tolist() == [2]
+    assert len(exp) == 1
@@ -0,0 +1,122 @@
+import numpy as np
+import pandas as pd
+import pytest
+from numpy.testing import assert_array_equal
+
+from qcodes.dataset.data_conversion import (grid_coordinates,
+                                            to_pandas_dataframe,
+                                            to_pandas_index,
+                                            to_xarray_dataset)
+from qcodes.dataset.measurements import Measurement
+
+
+def _grid_data(x, y):
+    xx, yy = np.meshgrid(x, y, indexing='ij')
+    return {'z': xx + 10 * yy, 'x': xx, 'y': yy}
+
+
+def test_grid_coordinates():
+    x = np.array([3.0, 1.0, 2.0])
+    y = np.array([-1.0, 5.0])
+    data = _grid_data(x, y)
+    coordinates = grid_coordinates(data)
+    assert list(coordinates) == ['x', 'y']
+    assert_array_equal(coordinates['x'], x)
+    assert_array_equal(coordinates['y'], y)
+
+    # the order of the setpoints does not need to match the axes
+    coordinates = grid_coordinates({'z': data['z'], 'y': data['y'],
+                                    'x': data['x']})
+    assert list(coordinates) == ['x', 'y']
+
+
+def test_grid_coordinates_of_data_that_is_not_a_grid():
+    data = _grid_data(np.arange(3.0), np.arange(2.0))
+    data['y'][1, 1] = np.nan
+    assert grid_coordinates(data) is None
+
+    flat_data = {name: values.ravel() for name, values in
+                 _grid_data(np.arange(3.0), np.arange(2.0)).items()}
+    assert grid_coordinates(flat_data) is None
+
+
+def test_to_pandas_index_of_grid_equals_index_from_arrays():
+    data = _grid_data(np.array([3.0, 1.0, 2.0]), np.array([-1.0, 5.0]))
+    index = to_pandas_index(data)
+    expected = pd.MultiIndex.from_arrays([data['x'].ravel(),
+                                          data['y'].ravel()],
+                                         names=['x', 'y'])
+    assert index.equals(expected)
+    assert index.names == expected.names
+
+    data = {'z': data['z'], 'y': data['y'], 'x': data['x']}
+    index = to_pandas_index(data)
+    expected = pd.MultiIndex.from_arrays([data['y'].ravel(),
+                                          data['x'].ravel()],
+                                         names=['y', 'x'])
+    assert index.equals(expected)
+    assert index.names == expected.names
+
+
+def test_to_pandas_dataframe_does_not_copy_values():
+    data = _grid_data(np.arange(3.0), np.arange(2.0))
+    df = to_pandas_dataframe(data)
+    assert np.shares_memory(df['z'].to_numpy(), data['z'])
+    assert_array_equal(df['z'].to_numpy(), data['z'].ravel())
+
+
+@pytest.mark.usefixtures("experiment")
+def test_to_xarray_dataset_of_shaped_run():
+    xr = pytest.importorskip('xarray')
+    meas = Measurement()
+    meas.register_custom_parameter('x')
+    meas.register_custom_parameter('y')
+    meas.register_custom_parameter('z', setpoints=('x', 'y'))
+    meas.register_custom_parameter('standalone')
+    x = np.linspace(0, 1, 5)
+    y = np.linspace(-1, 1, 4)
+    meas.set_shapes({'z': (len(x), len(y))})
+
+    with meas.run() as datasaver:
+        for x_value in x:
+            datasaver.add_result(('x', x_value), ('y', y),
+                                 ('z', x_value + y))
+        datasaver.add_result(('standalone', [1.0, 2.0]))
+    dataset = datasaver.dataset
+
+    # the dependent parameter is the first parameter of the tree
+    assert list(dataset.cache.data()['z']) == ['z', 'x', 'y']
+
+    xr_dataset = dataset.cache.to_xarray_dataset()
+    assert isinstance(xr_dataset, xr.Dataset)
+    assert xr_dataset['z'].dims == ('x', 'y')
+    assert_array_equal(xr_dataset['x'], x)
+    assert_array_equal(xr_dataset['y'], y)
+    assert_array_equal(xr_dataset['z'], x[:, np.newaxis] + y)
+    assert np.shares_memory(xr_dataset['z'].values,
+                            dataset.cache.data()['z']['z'])
+    assert_array_equal(xr_dataset['standalone'], [1.0, 2.0])
+
+    expected = dataset.to_xarray_dataset()
+    assert xr_dataset.identical(expected)
+
+    dfs = dataset.cache.to_pandas()
+    assert dfs['z'].equals(dataset.get_data_as_pandas_dataframe()['z'])
+    assert_array_equal(dfs['z'].to_xarray()['z'], xr_dataset['z'])
+
+
+def test_to_xarray_dataset_of_data_that_is_not_a_grid():
+    xr = pytest.importorskip('xarray')
+    data = {'z': np.array([1.0, 2.0, 3.0]), 'x': np.array([0.0, 1.0, 0.0]),
+            'y': np.array([0.0, 0.0, 1.0])}
+    xr_dataset = to_xarray_dataset({'z': data})
+    assert xr_dataset['z'].dims == ('x', 'y')
+    assert_array_equal(xr_dataset['z'], [[1.0, 3.0], [2.0, np.nan]])
+
+    duplicated_data = {'z': np.array([1.0, 2.0, 3.0]),
+                       'x': np.array([0.0, 1.0, 0.0])}
+    xr_dataset = to_xarray_dataset({'z': duplicated_data})
+    assert isinstance(xr_dataset, xr.Dataset)
+    assert xr_dataset['z'].dims == ('z_index',)
+    assert_array_equal(xr_dataset['z'], [1.0, 2.0, 3.0])
+    assert_array_equal(xr_dataset['x'], [0.0, 1.0, 0.0])
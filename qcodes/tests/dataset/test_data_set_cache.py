@@ -1,3 +1,5 @@
+import threading
+import time
 from typing import Dict
 from math import ceil
 import hypothesis.strategies as hst
@@ -7,7 +9,12 @@ import pytest
 from hypothesis import given, settings
 from string import ascii_uppercase
 
+import qcodes.dataset.data_set
+import qcodes.dataset.data_set_cache
+from qcodes.dataset.data_set import (_BackgroundWriter, load_by_guid,
+                                     load_by_id)
 from qcodes.dataset.measurements import Measurement
+from qcodes.tests.common import reset_config_on_exit
 from qcodes.instrument.parameter import expand_setpoints_helper
 from qcodes.dataset.descriptions.detect_shapes import detect_shape_of_measurement
 
@@ -533,6 +540,365 @@ def test_cache_2d_shape(experiment,
                                            clip=cache_size == "too_large")
 
 
+@pytest.mark.usefixtures("experiment")
+def test_cache_appends_into_growing_buffers():
+    meas = Measurement()
+    meas.register_custom_parameter('x')
+    meas.register_custom_parameter('label', paramtype='text')
+    meas.register_custom_parameter('y', setpoints=('x', 'label'))
+
+    n_points = 100
+    labels = ['a' * (i // 10 + 1) for i in range(n_points)]
+    with meas.run() as datasaver:
+        dataset = datasaver.dataset
+        buffers_seen = set()
+        for i in range(n_points):
+            datasaver.add_result(('x', i), ('label', labels[i]), ('y', 2 * i))
+            datasaver.flush_data_to_database()
+            data = dataset.cache.data()['y']
+            assert_array_equal(data['x'], np.arange(i + 1))
+            assert_array_equal(data['label'], labels[:i + 1])
+            buffer = dataset.cache._buffers['y']['x'] if i else None
+            if buffer is not None:
+                assert data['x'].base is buffer
+                buffers_seen.add(id(buffer))
+        # the capacity of the buffers grows geometrically, so the data is
+        # only copied a logarithmic number of times
+        assert len(buffers_seen) <= 8
+
+    data = dataset.cache.data()['y']
+    assert dataset.cache._buffers == {}
+    assert data['y'].base is None
+    assert_array_equal(data['y'], 2 * np.arange(n_points))
+    assert_array_equal(data['label'], labels)
+
+
+@pytest.mark.parametrize("bg_writing", [True, False])
+@pytest.mark.usefixtures("experiment")
+def test_cache_is_pushed_to_by_writing_dataset(bg_writing, monkeypatch):
+    meas = Measurement()
+    meas.register_custom_parameter('x')
+    meas.register_custom_parameter('label', paramtype='text')
+    meas.register_custom_parameter('y', setpoints=('x',))
+    meas.register_custom_parameter('z', paramtype='complex',
+                                   setpoints=('x', 'label'))
+    meas.register_custom_parameter('f', paramtype='array')
+    meas.register_custom_parameter('spectrum', paramtype='array',
+                                   setpoints=('x', 'f'))
+    meas.register_custom_parameter('standalone')
+    meas.set_shapes({'y': (6,)})
+
+    # the cache of the dataset being written never reads from the db
+    def read_from_db(*args, **kwargs):
+        raise AssertionError('The db has been read')
+
+    monkeypatch.setattr(qcodes.dataset.data_set_cache,
+                        'append_shaped_parameter_data_to_existing_arrays',
+                        read_from_db)
+    monkeypatch.setattr(qcodes.dataset.data_set_cache, 'completed',
+                        read_from_db)
+
+    with meas.run(write_in_background=bg_writing) as datasaver:
+        dataset = datasaver.dataset
+        assert dataset.cache.data() == {'y': {}, 'z': {}, 'spectrum': {},
+                                        'standalone': {}}
+        for i in range(3):
+            x = i / 3
+            datasaver.add_result(('x', [x, x + 1]), ('y', [2 * x, 3 * x]))
+            datasaver.add_result(('x', x), ('label', f'label {i}'),
+                                 ('z', x + 1j))
+            datasaver.add_result(('x', x), ('f', np.arange(4)),
+                                 ('spectrum', np.full(4, x)))
+            datasaver.add_result(('standalone', [i, i + 0.5]))
+            datasaver.flush_data_to_database(block=True)
+            _assert_pushed_cache_is_as_read(dataset)
+
+    _assert_pushed_cache_is_as_read(dataset)
+    assert dataset.cache._loaded_from_completed_ds is True
+    assert dataset.cache._buffers == {}
+
+
+def _assert_pushed_cache_is_as_read(dataset):
+    data = dict(dataset.cache.data())
+    expected = dataset.get_parameter_data()
+    shaped_data = data.pop('y')
+    expected_shaped_data = expected.pop('y')
+    _assert_parameter_data_is_identical(expected, data)
+    assert shaped_data.keys() == expected_shaped_data.keys()
+    for name, values in shaped_data.items():
+        assert values.shape == (6,)
+        n_values = expected_shaped_data[name].size
+        assert_array_equal(values[:n_values], expected_shaped_data[name])
+        assert np.isnan(values[n_values:]).all()
+    for tree_name, tree in data.items():
+        for name, values in tree.items():
+            assert values.dtype == expected[tree_name][name].dtype
+
+
+@pytest.mark.usefixtures("experiment")
+def test_cache_is_pushed_to_once_results_are_written(monkeypatch):
+    resume_writing = threading.Event()
+    write_batch = _BackgroundWriter.write_batch
+
+    def blocked_write_batch(self, batch):
+        resume_writing.wait(timeout=10)
+        write_batch(self, batch)
+
+    monkeypatch.setattr(_BackgroundWriter, 'write_batch',
+                        blocked_write_batch)
+    meas = Measurement()
+    meas.register_custom_parameter('x')
+    meas.register_custom_parameter('y', setpoints=('x',))
+
+    with meas.run(write_in_background=True) as datasaver:
+        dataset = datasaver.dataset
+        datasaver.add_result(('x', 1), ('y', 2))
+        datasaver.flush_data_to_database()
+        assert dataset.cache.data()['y'] == {}
+        resume_writing.set()
+        datasaver.flush_data_to_database(block=True)
+        assert dataset.cache._receives_pushes
+        assert_array_equal(dataset.cache.data()['y']['y'], [2])
+
+
+@pytest.mark.usefixtures("experiment")
+def test_cache_reads_from_db_once_results_are_dropped(monkeypatch):
+    resume_writing = threading.Event()
+    write_batch = _BackgroundWriter.write_batch
+
+    def blocked_write_batch(self, batch):
+        resume_writing.wait(timeout=10)
+        write_batch(self, batch)
+
+    monkeypatch.setattr(_BackgroundWriter, 'write_batch',
+                        blocked_write_batch)
+
+    with reset_config_on_exit():
+        qcodes.config.dataset.write_queue_maxsize = 1
+        qcodes.config.dataset.write_queue_full_policy = 'drop'
+        meas = Measurement()
+        meas.register_custom_parameter('x')
+        with pytest.warns(UserWarning, match='1 batches of results'):
+            with meas.run(write_in_background=True) as datasaver:
+                dataset = datasaver.dataset
+                queue = dataset._writer_status.data_write_queue
+                datasaver.add_result(('x', 0))
+                datasaver.flush_data_to_database()
+                # wait for the writer to take the first result
+                while queue.qsize() > 0:
+                    time.sleep(0.001)
+                datasaver.add_result(('x', 1))
+                datasaver.flush_data_to_database()
+                datasaver.add_result(('x', 2))
+                datasaver.flush_data_to_database()
+                assert not dataset.cache._receives_pushes
+                resume_writing.set()
+
+    assert_array_equal(dataset.cache.data()['x']['x'], [0, 1])
+
+
+@pytest.mark.parametrize("bg_writing", [True, 'process'])
+def test_cache_reads_from_db_once_writing_has_failed(experiment, bg_writing):
+    meas = Measurement()
+    meas.register_custom_parameter('x')
+
+    with pytest.raises(RuntimeError, match='no such table'):
+        with meas.run(write_in_background=bg_writing) as datasaver:
+            dataset = datasaver.dataset
+            datasaver.add_result(('x', 0))
+            datasaver.flush_data_to_database(block=True)
+            assert_array_equal(dataset.cache.data()['x']['x'], [0])
+            experiment.conn.execute(
+                f'ALTER TABLE "{dataset.table_name}" RENAME TO "renamed"')
+            experiment.conn.commit()
+            datasaver.add_result(('x', 1))
+            datasaver.flush_data_to_database(block=True)
+
+    assert not dataset.cache._receives_pushes
+    assert dataset.cache._pending_results == []
+    experiment.conn.execute(
+        f'ALTER TABLE "renamed" RENAME TO "{dataset.table_name}"')
+    experiment.conn.commit()
+    assert_array_equal(dataset.cache.data()['x']['x'], [0])
+
+
+@pytest.mark.usefixtures("experiment")
+def test_cache_reads_from_db_once_results_are_added_directly():
+    meas = Measurement()
+    meas.register_custom_parameter('x')
+    meas.register_custom_parameter('y', setpoints=('x',))
+
+    with meas.run() as datasaver:
+        dataset = datasaver.dataset
+        datasaver.add_result(('x', 1), ('y', 2))
+        datasaver.flush_data_to_database()
+        assert dataset.cache._receives_pushes
+        # results that have been enqueued but not flushed yet are written
+        # to the db along with the ones that are added directly
+        datasaver.add_result(('x', 2), ('y', 3))
+        dataset.add_results([{'x': 3, 'y': 4}])
+        assert not dataset.cache._receives_pushes
+        datasaver.flush_data_to_database()
+        _assert_parameter_data_is_identical(dataset.get_parameter_data(),
+                                            dataset.cache.data())
+        assert_array_equal(dataset.cache.data()['y']['y'], [2, 4, 3])
+
+
+@pytest.mark.usefixtures("experiment")
+def test_cache_that_is_not_read_stops_receiving_pushes(monkeypatch):
+    monkeypatch.setattr(qcodes.dataset.data_set_cache, '_MAX_PENDING_ROWS', 6)
+    meas = Measurement()
+    meas.register_custom_parameter('x')
+    meas.register_custom_parameter('y', setpoints=('x',))
+
+    with meas.run() as datasaver:
+        dataset = datasaver.dataset
+        for x in range(3):
+            datasaver.add_result(('x', [x, x]), ('y', [x, -x]))
+            datasaver.flush_data_to_database()
+        assert dataset.cache._receives_pushes
+        dataset.cache.data()
+        assert dataset.cache._pending_results == []
+        for x in range(3, 7):
+            datasaver.add_result(('x', [x, x]), ('y', [x, -x]))
+            datasaver.flush_data_to_database()
+        assert not dataset.cache._receives_pushes
+        assert dataset.cache._pending_results == []
+        _assert_parameter_data_is_identical(dataset.get_parameter_data(),
+                                            dataset.cache.data())
+        assert_array_equal(dataset.cache.data()['y']['x'],
+                           np.repeat(np.arange(7), 2))
+
+
+@pytest.mark.usefixtures("experiment")
+def test_shared_cache_is_used_by_datasets_of_the_same_run(monkeypatch):
+    meas = Measurement()
+    meas.register_custom_parameter('x')
+    meas.register_custom_parameter('y', setpoints=('x',))
+    meas.register_custom_parameter('z', setpoints=('x',))
+    meas.set_shapes({'y': (5,)})
+
+    with meas.run() as datasaver:
+        for x in range(5):
+            datasaver.add_result(('x', x), ('y', 2 * x), ('z', -x))
+    guid = datasaver.dataset.guid
+    run_id = datasaver.run_id
+    shared_cache = qcodes.dataset.data_set_cache.shared_cache
+    assert guid not in shared_cache
+
+    expected = load_by_id(run_id).get_parameter_data('y')
+    assert guid in shared_cache
+
+    def read_from_db(*args, **kwargs):
+        raise AssertionError('The db has been read')
+
+    monkeypatch.setattr(qcodes.dataset.data_set,
+                        'get_parameter_data_for_one_paramtree', read_from_db)
+    dataset = load_by_guid(guid)
+    _assert_parameter_data_is_identical(expected,
+                                        dataset.get_parameter_data('y'))
+    # the trees that are not cached yet are read from the db
+    with pytest.raises(AssertionError, match='The db has been read'):
+        dataset.get_parameter_data('z')
+    monkeypatch.undo()
+
+    cached_data = dataset.cache.data()
+    assert cached_data['y']['y'].shape == (5,)
+    assert_array_equal(cached_data['y']['y'], expected['y']['y'])
+    assert not np.shares_memory(cached_data['y']['y'], expected['y']['y'])
+    assert_array_equal(cached_data['z']['z'], -np.arange(5))
+    source = (dataset.path_to_db, dataset.run_id)
+    assert set(shared_cache.get(guid, source, ['y', 'z'])) == {'y', 'z'}
+
+
+@pytest.mark.usefixtures("experiment")
+def test_data_of_shared_cache_can_be_modified():
+    meas = Measurement()
+    meas.register_custom_parameter('x')
+    meas.register_custom_parameter('y', setpoints=('x',))
+    meas.register_custom_parameter('spectrum', paramtype='array',
+                                   setpoints=('x',))
+
+    with meas.run() as datasaver:
+        for x in range(3):
+            datasaver.add_result(('x', x), ('y', 2 * x))
+        datasaver.add_result(('x', 0), ('spectrum', np.arange(2)))
+        datasaver.add_result(('x', 1), ('spectrum', np.arange(3)))
+    run_id = datasaver.run_id
+
+    first = load_by_id(run_id)
+    second = load_by_id(run_id)
+    data = first.get_parameter_data()
+    data['y']['y'] -= 1
+    data['spectrum']['spectrum'][1][0] = 10
+    first.cache.data()['y']['y'] *= 2
+    df = first.get_data_as_pandas_dataframe()['y']
+    df['y'] *= 2
+
+    # the data of other datasets of the run is not changed
+    assert_array_equal(second.get_parameter_data()['y']['y'], [0, 2, 4])
+    assert_array_equal(second.cache.data()['y']['y'], [0, 2, 4])
+    assert_array_equal(
+        second.get_parameter_data()['spectrum']['spectrum'][1], np.arange(3))
+
+
+@pytest.mark.usefixtures("experiment")
+def test_shared_cache_evicts_least_recently_used_runs(monkeypatch):
+    shared_cache = qcodes.dataset.data_set_cache.SharedParameterDataCache()
+    monkeypatch.setattr(qcodes.dataset.data_set, 'shared_cache',
+                        shared_cache)
+    meas = Measurement()
+    meas.register_custom_parameter('x')
+    meas.register_custom_parameter('y', setpoints=('x',))
+
+    guids = []
+    for _ in range(3):
+        with meas.run() as datasaver:
+            datasaver.add_result(('x', np.arange(100)),
+                                 ('y', np.arange(100)))
+        guids.append(datasaver.dataset.guid)
+    run_nbytes = 2 * 100 * 8
+
+    with reset_config_on_exit():
+        qcodes.config.dataset.shared_cache_max_bytes = 2 * run_nbytes
+        for guid in guids[:2]:
+            load_by_guid(guid).get_parameter_data()
+        assert shared_cache.nbytes == 2 * run_nbytes
+        # reading the first run makes the second run the least recently used
+        load_by_guid(guids[0]).cache.data()
+        load_by_guid(guids[2]).get_parameter_data()
+        assert guids[0] in shared_cache
+        assert guids[1] not in shared_cache
+        assert guids[2] in shared_cache
+        assert shared_cache.nbytes == 2 * run_nbytes
+
+        qcodes.config.dataset.shared_cache_max_bytes = 0
+        shared_cache.clear()
+        load_by_guid(guids[0]).get_parameter_data()
+        assert len(shared_cache) == 0
+
+
+def test_shared_cache_does_not_share_data_of_runs_with_the_same_guid():
+    shared_cache = qcodes.dataset.data_set_cache.SharedParameterDataCache()
+    guid = 'aaaaaaaa-0d00-000d-0000-017a3c2b4a1e'
+    first_tree = ({'y': np.arange(3.0)}, 3)
+    second_tree = ({'y': np.arange(4.0)}, 4)
+
+    shared_cache.put(guid, ('first.db', 1), {'y': first_tree})
+    cached_data, n_rows = shared_cache.get(guid, ('first.db', 1), ['y'])['y']
+    assert n_rows == 3
+    assert_array_equal(cached_data['y'], first_tree[0]['y'])
+    assert shared_cache.get(guid, ('first.db', 2), ['y']) == {}
+    assert shared_cache.get(guid, ('second.db', 1), ['y']) == {}
+
+    shared_cache.put(guid, ('second.db', 1), {'y': second_tree})
+    assert shared_cache.get(guid, ('first.db', 1), ['y']) == {}
+    cached_data, n_rows = shared_cache.get(guid, ('second.db', 1), ['y'])['y']
+    assert n_rows == 4
+    assert_array_equal(cached_data['y'], second_tree[0]['y'])
+    assert shared_cache.nbytes == 4 * 8
+
+
 def _assert_completed_cache_is_as_expected(
         cache_data_trees,
         param_data_trees,
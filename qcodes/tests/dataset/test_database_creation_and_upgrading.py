@@ -33,6 +33,9 @@ from qcodes.dataset.sqlite.db_upgrades import (_latest_available_version,
                                                perform_db_upgrade_6_to_7,
                                                perform_db_upgrade_7_to_8,
                                                perform_db_upgrade_8_to_9,
+                                               perform_db_upgrade_9_to_10,
+                                               perform_db_upgrade_10_to_11,
+                                               perform_db_upgrade_11_to_12,
                                                set_user_version)
 from qcodes.dataset.sqlite.queries import get_run_description, update_GUIDs
 from qcodes.dataset.sqlite.query_helpers import is_column_in_table, one
@@ -77,7 +80,8 @@ def test_tables_exist(empty_temp_db, version):
                    version=version)
     cursor = conn.execute("select sql from sqlite_master"
                           " where type = 'table'")
-    expected_tables = ['experiments', 'runs', 'layouts', 'dependencies']
+    expected_tables = ['experiments', 'runs', 'layouts', 'dependencies',
+                       'result_shards']
     rows = [row for row in cursor]
     assert len(rows) == len(expected_tables)
     for row, expected_table in zip(rows, expected_tables):
@@ -893,7 +897,7 @@ def test_cannot_connect_to_newer_db():
 
 
 def test_latest_available_version():
-    assert _latest_available_version() == 9
+    assert _latest_available_version() == 12
 
 
 @pytest.mark.parametrize('version', VERSIONS)
@@ -939,3 +943,51 @@ def test_perform_actual_upgrade_8_to_9(db_file):
 
         c = atomic_transaction(conn, index_query)
         assert len(c.fetchall()) == 3
+
+
+def test_perform_actual_upgrade_9_to_10():
+    conn = connect(':memory:', version=9)
+
+    index_query = "PRAGMA index_list(runs)"
+
+    c = atomic_transaction(conn, index_query)
+    assert len(c.fetchall()) == 3
+
+    perform_db_upgrade_9_to_10(conn)
+
+    c = atomic_transaction(conn, index_query)
+    assert {row['name'] for row in c.fetchall()} == {
+        'IX_runs_exp_id', 'IX_runs_guid', 'IX_runs_captured_run_id',
+        'IX_runs_run_timestamp', 'IX_runs_completed_timestamp'}
+    assert get_user_version(conn) == 10
+
+
+def test_perform_actual_upgrade_10_to_11():
+    conn = connect(':memory:', version=10)
+
+    table_query = ("SELECT name FROM sqlite_master WHERE type='table' "
+                   "AND name='result_shards'")
+
+    c = atomic_transaction(conn, table_query)
+    assert len(c.fetchall()) == 0
+
+    perform_db_upgrade_10_to_11(conn)
+
+    c = atomic_transaction(conn, table_query)
+    assert len(c.fetchall()) == 1
+    assert [row['name'] for row in atomic_transaction(
+        conn, "PRAGMA table_info(result_shards)").fetchall()] == [
+        'run_id', 'path']
+    assert get_user_version(conn) == 11
+
+
+def test_perform_actual_upgrade_11_to_12():
+    conn = connect(':memory:', version=11)
+    tables_query = "SELECT sql FROM sqlite_master"
+    tables = [row['sql'] for row in atomic_transaction(conn, tables_query)]
+
+    perform_db_upgrade_11_to_12(conn)
+
+    assert [row['sql'] for row in atomic_transaction(
+        conn, tables_query)] == tables
+    assert get_user_version(conn) == 12
@@ -4,12 +4,14 @@ import re
 import os
 from pathlib import Path
 import random
+import time
 import uuid
 
 import pytest
 import numpy as np
 
 import qcodes as qc
+import qcodes.dataset.database_extract_runs
 import qcodes.tests.dataset
 from qcodes.dataset.experiment_container import Experiment,\
     load_experiment_by_name
@@ -19,7 +21,8 @@ from qcodes.dataset.data_set import (DataSet, load_by_guid, load_by_counter,
 from qcodes.dataset.sqlite.database import get_db_version_and_newest_available_version
 from qcodes.dataset.sqlite.connection import path_to_dbfile
 from qcodes.dataset.database_extract_runs import extract_runs_into_db
-from qcodes.dataset.sqlite.queries import get_experiments
+from qcodes.dataset.sqlite.queries import (get_experiments,
+                                           get_guids_from_run_spec)
 from qcodes.tests.common import error_caused_by
 from qcodes.dataset.measurements import Measurement
 from qcodes import Station
@@ -828,3 +831,70 @@ def test_column_mismatch(two_empty_temp_db_connections, some_interdeps, inst):
     target_copied_ds = DataSet(conn=target_conn, run_id=2)
 
     assert target_copied_ds.the_same_dataset_as(source_ds)
+
+
+def test_extract_in_batches_resumes_after_failure(
+        two_empty_temp_db_connections, some_interdeps, monkeypatch, capsys):
+    source_conn, target_conn = two_empty_temp_db_connections
+    source_path = path_to_dbfile(source_conn)
+    target_path = path_to_dbfile(target_conn)
+
+    source_exp = Experiment(conn=source_conn)
+    source_datasets = []
+    for i in range(5):
+        # GUIDs are made from the time in ms, so runs must not be created
+        # in the same ms
+        time.sleep(0.002)
+        ds = DataSet(conn=source_conn, exp_id=source_exp.exp_id)
+        ds.set_interdependencies(some_interdeps[1])
+        ds.mark_started()
+        ds.add_results([{name: float(i + j)
+                         for name in some_interdeps[1].names}
+                        for j in range(3)])
+        ds.mark_completed()
+        source_datasets.append(ds)
+
+    extract_single_dataset = \
+        qcodes.dataset.database_extract_runs._extract_single_dataset_into_db
+
+    def fail_on_fourth_run(dataset, *args):
+        if dataset.run_id == 4:
+            raise RuntimeError("Interrupted")
+        extract_single_dataset(dataset, *args)
+
+    monkeypatch.setattr(qcodes.dataset.database_extract_runs,
+                        '_extract_single_dataset_into_db',
+                        fail_on_fourth_run)
+    run_ids = [ds.run_id for ds in source_datasets]
+    with pytest.raises(RuntimeError):
+        extract_runs_into_db(source_path, target_path, *run_ids,
+                             batch_size=2)
+
+    # the batch of the failing run is rolled back, the first batch is kept
+    assert get_guids_from_run_spec(target_conn) == [
+        ds.guid for ds in source_datasets[:2]]
+
+    monkeypatch.undo()
+    extract_runs_into_db(source_path, target_path, *run_ids, batch_size=2,
+                         show_progress=True)
+    assert 'Extracting runs' in capsys.readouterr().out
+
+    assert get_guids_from_run_spec(target_conn) == [
+        ds.guid for ds in source_datasets]
+    for source_ds in source_datasets:
+        target_ds = load_by_guid(source_ds.guid, conn=target_conn)
+        assert source_ds.the_same_dataset_as(target_ds)
+        source_data = source_ds.get_parameter_data()
+        target_data = target_ds.get_parameter_data()
+        for outkey, outval in source_data.items():
+            for inkey, inval in outval.items():
+                np.testing.assert_array_equal(inval,
+                                              target_data[outkey][inkey])
+
+
+def test_extract_with_invalid_batch_size_raises(
+        two_empty_temp_db_connections):
+    source_conn, target_conn = two_empty_temp_db_connections
+    with pytest.raises(ValueError, match='batch_size must be a positive'):
+        extract_runs_into_db(path_to_dbfile(source_conn),
+                             path_to_dbfile(target_conn), 1, batch_size=0)
@@ -1,13 +1,21 @@
+import json
 import re
+import sqlite3
+import threading
+import time
+from queue import Full, Queue
 
 import pytest
 import numpy as np
 from hypothesis import given, strategies as hst
 
 import qcodes as qc
-from qcodes.dataset.measurements import DataSaver
+from qcodes.dataset.data_set import _BackgroundWriter, _WriterStatus
+from qcodes.dataset.measurements import (AdaptiveWritePeriod, DataSaver,
+                                         Measurement)
 from qcodes.dataset.descriptions.param_spec import ParamSpecBase
 from qcodes.dataset.descriptions.dependencies import InterDependencies_
+from qcodes.tests.common import reset_config_on_exit
 
 CALLBACK_COUNT = 0
 CALLBACK_RUN_ID = None
@@ -128,3 +136,367 @@ def test_saving_numeric_values_as_text(numeric_type, bg_writing):
     finally:
         data_saver.dataset.mark_completed()
         data_saver.dataset.conn.close()
+
+
+@pytest.mark.usefixtures("experiment")
+@pytest.mark.parametrize("bg_writing", [True, False])
+def test_writer_statistics(bg_writing):
+    meas = Measurement()
+    meas.register_custom_parameter(name='x')
+    meas.register_custom_parameter(name='y', setpoints=('x',))
+
+    with meas.run(write_in_background=bg_writing) as datasaver:
+        for x in range(10):
+            datasaver.add_result(('x', x), ('y', 2 * x))
+            datasaver.flush_data_to_database()
+        datasaver.flush_data_to_database(block=True)
+        stats = datasaver.writer_statistics
+
+    assert stats.queue_depth == 0
+    if bg_writing:
+        assert stats.items_written == 10
+        assert 1 <= stats.transactions <= 10
+        assert stats.max_queue_depth >= 1
+        assert 0 < stats.mean_latency <= stats.max_latency
+    else:
+        assert stats.items_written == 0
+        assert stats.transactions == 0
+
+
+@pytest.mark.parametrize("policy, expected_dropped", [("block", 0),
+                                                      ("drop", 1)])
+def test_write_queue_full_policy(policy, expected_dropped):
+    queue = Queue(maxsize=1)
+    writer_status = _WriterStatus(bg_writer=None,
+                                  write_in_background=True,
+                                  data_write_queue=queue,
+                                  active_datasets=set(),
+                                  queue_full_policy=policy)
+    item = {'keys': ['x'], 'values': [[1]], 'table_name': 'results',
+            'insert_strategy': 'values'}
+
+    writer_status.put_results(dict(item))
+    if policy == 'block':
+        with pytest.raises(Full):
+            # a blocking put on a full queue would wait forever so we
+            # only check that there is no space left
+            queue.put_nowait(dict(item))
+    else:
+        writer_status.put_results(dict(item))
+
+    assert queue.qsize() == 1
+    assert writer_status.statistics.items_dropped == expected_dropped
+    assert writer_status.statistics.max_queue_depth == 1
+
+
+@pytest.mark.usefixtures("experiment")
+def test_write_queue_maxsize_from_config():
+    with reset_config_on_exit():
+        qc.config.dataset.write_queue_maxsize = 3
+        qc.config.dataset.write_queue_full_policy = 'drop'
+
+        meas = Measurement()
+        meas.register_custom_parameter(name='x')
+        with meas.run(write_in_background=True) as datasaver:
+            writer_status = datasaver.dataset._writer_status
+            assert writer_status.data_write_queue.maxsize == 3
+            assert writer_status.queue_full_policy == 'drop'
+
+        # the config is read again when the next background writer starts
+        qc.config.dataset.write_queue_maxsize = 5
+        qc.config.dataset.write_queue_full_policy = 'block'
+        with meas.run(write_in_background=True) as datasaver:
+            writer_status = datasaver.dataset._writer_status
+            assert writer_status.data_write_queue.maxsize == 5
+            assert writer_status.queue_full_policy == 'block'
+
+
+@pytest.mark.usefixtures("experiment")
+def test_dropped_results_are_recorded(monkeypatch):
+    resume_writing = threading.Event()
+    write_batch = _BackgroundWriter.write_batch
+
+    def blocked_write_batch(self, batch):
+        resume_writing.wait(timeout=10)
+        write_batch(self, batch)
+
+    monkeypatch.setattr(_BackgroundWriter, 'write_batch',
+                        blocked_write_batch)
+
+    with reset_config_on_exit():
+        qc.config.dataset.write_queue_maxsize = 1
+        qc.config.dataset.write_queue_full_policy = 'drop'
+
+        meas = Measurement()
+        meas.register_custom_parameter(name='x')
+        with pytest.warns(UserWarning, match='1 batches of results'):
+            with meas.run(write_in_background=True) as datasaver:
+                queue = datasaver.dataset._writer_status.data_write_queue
+                datasaver.add_result(('x', 0))
+                # wait for the writer to take the first result
+                while queue.qsize() > 0:
+                    time.sleep(0.001)
+                datasaver.add_result(('x', 1))
+                datasaver.add_result(('x', 2))
+                resume_writing.set()
+
+    dataset = datasaver.dataset
+    assert dataset.metadata['items_dropped'] == 1
+    assert dataset.get_parameter_data()['x']['x'].tolist() == [0, 1]
+
+
+@pytest.mark.usefixtures("experiment")
+@pytest.mark.parametrize("bg_writing", [True, False])
+def test_prepared_appender(bg_writing):
+    meas = Measurement()
+    meas.register_custom_parameter(name='x')
+    meas.register_custom_parameter(name='y', setpoints=('x',))
+    meas.register_custom_parameter(name='z', setpoints=('x',))
+
+    with meas.run(write_in_background=bg_writing) as datasaver:
+        append = datasaver.prepare('x', 'y')
+        assert [ps.name for ps in append.paramspecs] == ['x', 'y']
+        for x in range(5):
+            append(x, 2 * x)
+        append(np.arange(5, 10), 2 * np.arange(5, 10))
+        datasaver.add_result(('x', 10), ('z', 0))
+
+    assert datasaver.points_written == 11
+    data = datasaver.dataset.get_parameter_data()
+    np.testing.assert_array_equal(data['y']['x'], np.arange(10))
+    np.testing.assert_array_equal(data['y']['y'], 2 * np.arange(10))
+    np.testing.assert_array_equal(data['z']['z'], [0])
+
+
+@pytest.mark.usefixtures("experiment")
+def test_prepared_appender_validation():
+    meas = Measurement()
+    meas.register_custom_parameter(name='x')
+    meas.register_custom_parameter(name='y', setpoints=('x',))
+    meas.register_custom_parameter(name='label', paramtype='text')
+
+    with meas.run() as datasaver:
+        with pytest.raises(ValueError, match='no such parameter'):
+            datasaver.prepare('x', 'unknown')
+        with pytest.raises(ValueError, match='more than once'):
+            datasaver.prepare('x', 'x')
+        with pytest.raises(ValueError, match='some required parameters '
+                                             'are missing'):
+            datasaver.prepare('y')
+
+        append = datasaver.prepare('x', 'y')
+        with pytest.raises(ValueError, match='Expected 2 values'):
+            append(1)
+        append(1, 2)
+        # a change of shape or kind of the values is validated again
+        with pytest.raises(ValueError, match='Incompatible shapes'):
+            append(np.arange(2), np.arange(3))
+        with pytest.raises(ValueError, match='is of type "numeric"'):
+            append(1, 'a')
+
+        append_label = datasaver.prepare('label')
+        with pytest.raises(ValueError, match='is of type "text"'):
+            append_label(1)
+        append_label('a')
+
+    assert datasaver.points_written == 2
+
+
+def test_adaptive_write_period():
+    policy = AdaptiveWritePeriod(target_latency=1, max_pending_bytes=100,
+                                 initial_period=5)
+    assert policy.period == 1
+
+    policy.record_flush(0.1, rows=10)
+    assert policy.period == pytest.approx(0.9)
+    # flushing takes longer than half the target latency
+    for _ in range(20):
+        policy.record_flush(0.8, rows=10)
+    assert policy.period == pytest.approx(0.8, rel=1e-3)
+
+    assert not policy.should_flush(0.5)
+    assert policy.should_flush(0.9)
+    policy.add(101)
+    assert policy.should_flush(0)
+
+    stats = policy.to_dict()
+    assert stats['flushes'] == 21
+    assert stats['flushes_by_size'] == 1
+    assert stats['mean_rows_per_flush'] == 10
+    assert stats['max_flush_duration'] == 0.8
+
+    with pytest.raises(ValueError, match='target latency must be positive'):
+        AdaptiveWritePeriod(target_latency=0, max_pending_bytes=100,
+                            initial_period=1)
+
+
+@pytest.mark.usefixtures("experiment")
+@pytest.mark.parametrize("bg_writing", [True, False])
+def test_adaptive_write_period_from_config(bg_writing):
+    with reset_config_on_exit():
+        qc.config.dataset.adaptive_write_period = True
+        qc.config.dataset.write_latency_target = 10
+        # each result holds 16 bytes so every second result is flushed
+        qc.config.dataset.write_max_pending_bytes = 20
+
+        meas = Measurement()
+        meas.register_custom_parameter(name='x')
+        meas.register_custom_parameter(name='y', setpoints=('x',))
+        if bg_writing:
+            with pytest.warns(UserWarning,
+                              match='write period will not be adapted'):
+                runner = meas.run(write_in_background=bg_writing)
+        else:
+            runner = meas.run(write_in_background=bg_writing)
+        with runner as datasaver:
+            for x in range(10):
+                datasaver.add_result(('x', x), ('y', 2 * x))
+
+    metadata = datasaver.dataset.metadata
+    if bg_writing:
+        assert datasaver.write_policy is None
+        assert 'adaptive_write_period' not in metadata
+    else:
+        assert datasaver.write_policy is not None
+        stats = json.loads(metadata['adaptive_write_period'])
+        assert stats['target_latency'] == 10
+        assert stats['flushes'] == stats['flushes_by_size'] == 5
+        assert stats['rows_flushed'] == 10
+        assert stats['write_period'] == datasaver.write_period
+    np.testing.assert_array_equal(
+        datasaver.dataset.get_parameter_data()['y']['y'], 2 * np.arange(10))
+
+
+@pytest.mark.usefixtures("experiment")
+@pytest.mark.parametrize("bg_writing", [True, False])
+def test_shaped_results_are_buffered(bg_writing):
+    meas = Measurement()
+    meas.register_custom_parameter(name='x')
+    meas.register_custom_parameter(name='y')
+    meas.register_custom_parameter(name='z', setpoints=('x', 'y'))
+    meas.register_custom_parameter(name='c', paramtype='complex',
+                                   setpoints=('x',))
+    meas.register_custom_parameter(name='label', paramtype='text',
+                                   setpoints=('x',))
+    meas.set_shapes({'z': (3, 4), 'c': (3,), 'label': (3,)})
+    meas.write_period = 100
+
+    with meas.run(write_in_background=bg_writing) as datasaver:
+        dataset = datasaver.dataset
+        # no buffer is allocated for trees with text parameters
+        assert set(dataset._result_buffers) == {'z', 'c'}
+        for x in range(3):
+            datasaver.add_result(('x', x), ('y', np.arange(4)),
+                                 ('z', x * np.arange(4)))
+        for x in range(3):
+            datasaver.add_result(('x', x), ('c', x + 1j))
+        for x in range(3):
+            datasaver.add_result(('x', x), ('label', str(x)))
+        if not bg_writing:
+            assert len(dataset._results) == 2 + 3
+            assert dataset._number_of_enqueued_rows == 12 + 3 + 3
+        datasaver.flush_data_to_database(block=True)
+        assert dataset._number_of_enqueued_rows == 0
+        # results that do not fit into the buffer are enqueued as usual
+        datasaver.add_result(('x', 3), ('c', 3 + 1j))
+        assert dataset._result_buffers['c'].closed
+
+    data = datasaver.dataset.get_parameter_data()
+    np.testing.assert_array_equal(data['z']['x'].ravel(),
+                                  np.repeat(np.arange(3), 4))
+    np.testing.assert_array_equal(data['z']['y'].ravel(),
+                                  np.tile(np.arange(4), 3))
+    np.testing.assert_array_equal(data['z']['z'],
+                                  np.outer(np.arange(3), np.arange(4)))
+    np.testing.assert_array_equal(data['c']['c'], np.arange(4) + 1j)
+    np.testing.assert_array_equal(data['label']['label'], ['0', '1', '2'])
+
+
+@pytest.mark.usefixtures("experiment")
+@pytest.mark.parametrize("bg_writing", [True, False])
+def test_shaped_results_are_written_in_order(bg_writing):
+    meas = Measurement()
+    meas.register_custom_parameter(name='x')
+    meas.register_custom_parameter(name='y', setpoints=('x',))
+    meas.register_custom_parameter(name='z', setpoints=('x',))
+    meas.register_custom_parameter(name='label', paramtype='text')
+    meas.set_shapes({'y': (3,), 'z': (3,)})
+    meas.write_period = 100
+
+    with meas.run(write_in_background=bg_writing) as datasaver:
+        dataset = datasaver.dataset
+        datasaver.add_result(('x', 0), ('y', 0))
+        datasaver.add_result(('x', 1), ('y', 1))
+        datasaver.add_result(('x', 0), ('z', 10))
+        datasaver.add_result(('label', 'a'))
+        datasaver.add_result(('x', 2), ('y', 2))
+        if not bg_writing:
+            # the results of interleaved trees are not buffered
+            assert dataset._result_buffers['y'].closed
+            assert dataset._result_buffers['z'].closed
+
+    rows = dataset.conn.execute(
+        f'SELECT x, y, z, label FROM "{dataset.table_name}" '
+        'ORDER BY id').fetchall()
+    assert [tuple(row) for row in rows] == [
+        (0, 0, None, None), (1, 1, None, None), (0, None, 10, None),
+        (None, None, None, 'a'), (2, 2, None, None)]
+
+
+@pytest.mark.usefixtures("experiment")
+def test_shaped_results_keep_integers():
+    big = 2 ** 53 + 1
+    meas = Measurement()
+    meas.register_custom_parameter(name='x')
+    meas.register_custom_parameter(name='y', setpoints=('x',))
+    meas.register_custom_parameter(name='z', setpoints=('x',))
+    meas.set_shapes({'y': (3,), 'z': (2,)})
+
+    with meas.run() as datasaver:
+        dataset = datasaver.dataset
+        datasaver.add_result(('x', np.arange(3)),
+                             ('y', big + np.arange(3)))
+        assert dataset._result_buffers['y'].pending().columns[1].dtype == (
+            np.int64)
+        datasaver.add_result(('x', 0.5), ('z', 0.5))
+        # an integer that a double can not hold closes the buffer
+        datasaver.add_result(('x', np.array([1.5])), ('z', np.array([big])))
+        assert dataset._result_buffers['z'].closed
+
+    # the connections of qcodes read numeric values as floats
+    conn = sqlite3.connect(dataset.path_to_db)
+    rows = conn.execute(
+        f'SELECT y, z FROM "{dataset.table_name}" ORDER BY id').fetchall()
+    conn.close()
+    assert rows == [
+        (big, None), (big + 1, None), (big + 2, None), (None, 0.5),
+        (None, big)]
+
+
+@pytest.mark.usefixtures("experiment")
+@pytest.mark.parametrize("bg_writing", [True, False])
+def test_standalone_arrays_are_enqueued_as_columns(bg_writing):
+    meas = Measurement()
+    meas.register_custom_parameter(name='n')
+    meas.register_custom_parameter(name='c', paramtype='complex')
+    meas.register_custom_parameter(name='t', paramtype='text')
+    meas.write_period = 100
+
+    with meas.run(write_in_background=bg_writing) as datasaver:
+        datasaver.add_result(('n', np.arange(5)),
+                             ('c', np.arange(3) * 1j),
+                             ('t', np.array(['a', 'b'])))
+        if not bg_writing:
+            results = datasaver.dataset._results
+            assert len(results) == 3
+            columns = {res.names[0]: res.columns[0] for res in results}
+            # the values are passed on without converting them one by one
+            assert columns['n'].dtype == np.arange(5).dtype
+            assert columns['c'].dtype == np.complex128
+            assert columns['t'].dtype.kind == 'U'
+        datasaver.add_result(('n', 5.5))
+
+    data = datasaver.dataset.get_parameter_data()
+    np.testing.assert_array_equal(data['n']['n'], [0, 1, 2, 3, 4, 5.5])
+    np.testing.assert_array_equal(data['c']['c'], np.arange(3) * 1j)
+    np.testing.assert_array_equal(data['t']['t'], ['a', 'b'])
@@ -22,7 +22,7 @@ from qcodes.dataset.guids import parse_guid
 from qcodes.dataset.sqlite.connection import path_to_dbfile
 from qcodes.dataset.sqlite.database import get_DB_location
 from qcodes.dataset.sqlite.queries import _unicode_categories
-from qcodes.tests.common import error_caused_by
+from qcodes.tests.common import error_caused_by, reset_config_on_exit
 from qcodes.tests.dataset.test_links import generate_some_links
 from qcodes.utils.deprecate import QCoDeSDeprecationWarning
 
@@ -823,6 +823,105 @@ def test_get_parameter_data(scalar_dataset, start, end):
                           end)
 
 
+def test_get_parameter_data_ranges_and_stride(scalar_dataset):
+    param_0 = scalar_dataset.description.interdeps['param_0']
+    data = scalar_dataset.get_parameter_data(
+        'param_3', ranges={param_0: (100, 199), 'param_1': (10150, None)},
+        stride=10)['param_3']
+    np.testing.assert_array_equal(data['param_3'],
+                                  np.arange(30150, 30200, 10))
+    np.testing.assert_array_equal(data['param_0'], np.arange(150, 200, 10))
+
+
+def _concatenate_chunks(chunks, name):
+    chunks = [chunk[name] for chunk in chunks]
+    return {param_name: np.concatenate([chunk[param_name]
+                                        for chunk in chunks])
+            for param_name in chunks[0]}
+
+
+def test_iter_parameter_data(scalar_dataset):
+    chunks = list(scalar_dataset.iter_parameter_data(chunk_rows=300))
+    assert [len(chunk['param_3']['param_3']) for chunk in chunks] == [
+        300, 300, 300, 100]
+    expected = scalar_dataset.get_parameter_data()['param_3']
+    data = _concatenate_chunks(chunks, 'param_3')
+    assert data.keys() == expected.keys()
+    for name, values in expected.items():
+        assert data[name].dtype == values.dtype
+        np.testing.assert_array_equal(data[name], values)
+
+    chunks = list(scalar_dataset.iter_parameter_data(
+        'param_3', chunk_rows=4, ranges={'param_0': (100, 199)}, stride=10))
+    assert len(chunks) == 3
+    data = _concatenate_chunks(chunks, 'param_3')
+    np.testing.assert_array_equal(data['param_3'],
+                                  np.arange(30100, 30200, 10))
+
+    with pytest.raises(ValueError, match='Invalid chunk_rows'):
+        next(scalar_dataset.iter_parameter_data(chunk_rows=0))
+
+
+def test_iter_parameter_data_of_arrays(array_dataset):
+    expected = array_dataset.get_parameter_data()
+    for name, tree in expected.items():
+        chunks = list(array_dataset.iter_parameter_data(name, chunk_rows=1))
+        data = _concatenate_chunks(chunks, name)
+        for param_name, values in tree.items():
+            np.testing.assert_array_equal(data[param_name].ravel(),
+                                          values.ravel())
+
+
+@pytest.mark.parametrize('window_functions', [True, False])
+def test_iter_parameter_data_of_interleaved_trees(dataset, window_functions):
+    x = ParamSpecBase('x', 'numeric')
+    y = ParamSpecBase('y', 'numeric')
+    z = ParamSpecBase('z', 'numeric')
+    dataset.set_interdependencies(
+        InterDependencies_(dependencies={y: (x,), z: (x,)}))
+    dataset.mark_started()
+    for i in range(20):
+        dataset.add_results([{'x': i, 'y': 2 * i}, {'x': i, 'z': 3 * i}])
+    dataset.mark_completed()
+
+    with patch('qcodes.dataset.sqlite.queries._WINDOW_FUNCTIONS_SUPPORTED',
+               window_functions):
+        chunks = list(dataset.iter_parameter_data(
+            'z', chunk_rows=2, ranges={'x': (5, None)}, stride=3))
+    assert [len(chunk['z']['z']) for chunk in chunks] == [2, 2, 1]
+    data = _concatenate_chunks(chunks, 'z')
+    np.testing.assert_array_equal(data['x'], np.arange(5, 20, 3))
+    np.testing.assert_array_equal(data['z'], 3 * np.arange(5, 20, 3))
+
+
+def test_create_index(dataset, some_interdeps):
+    with pytest.raises(RuntimeError, match='has not been started'):
+        dataset.create_index('ps1')
+    dataset.set_interdependencies(some_interdeps[1])
+    dataset.mark_started()
+    dataset.create_index('ps1', 'ps2')
+
+    sql = "SELECT name FROM sqlite_master WHERE type='index' AND tbl_name=?"
+    cursor = dataset.conn.execute(sql, (dataset.table_name,))
+    assert [row['name'] for row in cursor] == [
+        f'IX_{dataset.table_name}_ps1_ps2']
+
+
+def test_index_setpoints_from_config(experiment, some_interdeps):
+    with reset_config_on_exit():
+        qc.config.dataset.index_setpoints = True
+        ds = new_data_set("test-dataset")
+        ds.set_interdependencies(some_interdeps[1])
+        ds.mark_started()
+
+    setpoints = {ps.name for deps in some_interdeps[1].dependencies.values()
+                 for ps in deps}
+    sql = "SELECT name FROM sqlite_master WHERE type='index' AND tbl_name=?"
+    cursor = ds.conn.execute(sql, (ds.table_name,))
+    assert {row['name'] for row in cursor} == {
+        f'IX_{ds.table_name}_{name}' for name in setpoints}
+
+
 def test_get_scalar_parameter_data_no_nulls(scalar_dataset_with_nulls):
 
     expected_names = {}
@@ -1321,6 +1420,43 @@ def test_write_data_to_text_file_length_exception(tmp_path):
     with pytest.raises(Exception, match='different length'):
         dataset.write_data_to_text_file(path=temp_dir, single_file=True,
                                         single_file_name='yz')
+    # the lengths are checked before the file name
+    with pytest.raises(Exception, match='different length'):
+        dataset.write_data_to_text_file(path=temp_dir, single_file=True,
+                                        single_file_name=None)
+
+
+@pytest.mark.usefixtures('experiment')
+@pytest.mark.parametrize('single_file', [True, False])
+def test_write_data_to_text_file_in_chunks(tmp_path, single_file):
+    dataset = new_data_set("dataset")
+    xparam = ParamSpecBase("x", 'numeric')
+    yparam = ParamSpecBase("y", 'numeric')
+    zparam = ParamSpecBase("z", 'numeric')
+    idps = InterDependencies_(dependencies={yparam: (xparam,),
+                                            zparam: (xparam,)})
+    dataset.set_interdependencies(idps)
+
+    dataset.mark_started()
+    dataset.add_results([{'x': x, 'y': 2 * x, 'z': 3 * x}
+                         for x in range(5)])
+    dataset.mark_completed()
+
+    iter_dataframes = DataSet.iter_data_as_pandas_dataframe
+    with patch.object(DataSet, 'iter_data_as_pandas_dataframe',
+                      lambda self, *params: iter_dataframes(self, *params,
+                                                            chunk_rows=2)):
+        dataset.write_data_to_text_file(path=str(tmp_path),
+                                        single_file=single_file,
+                                        single_file_name='yz')
+    if single_file:
+        with open(tmp_path / "yz.dat") as f:
+            assert f.readlines() == [f'{x}.0\t{2 * x}.0\t{3 * x}.0\n'
+                                     for x in range(5)]
+    else:
+        with open(tmp_path / "z.dat") as f:
+            assert f.readlines() == [f'{x}.0\t{3 * x}.0\n'
+                                     for x in range(5)]
 
 
 @pytest.mark.usefixtures('experiment')
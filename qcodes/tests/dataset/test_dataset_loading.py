@@ -1,6 +1,7 @@
 import time
 from math import floor
 
+import numpy as np
 import pytest
 
 from qcodes.dataset.data_set import (DataSet,
@@ -8,12 +9,14 @@ from qcodes.dataset.data_set import (DataSet,
                                      load_by_guid,
                                      load_by_id,
                                      load_by_counter,
-                                     load_by_run_spec)
+                                     load_by_run_spec,
+                                     load_many)
 from qcodes.dataset.descriptions.param_spec import ParamSpecBase
 from qcodes.dataset.descriptions.dependencies import InterDependencies_
 from qcodes.dataset.data_export import get_data_by_id
 from qcodes.dataset.sqlite.queries import get_guids_from_run_spec
 from qcodes.dataset.experiment_container import new_experiment
+from qcodes.dataset.sqlite.database import connect
 
 
 @pytest.mark.usefixtures("experiment")
@@ -316,3 +319,48 @@ def test_load_by_run_spec(empty_temp_db, some_interdeps):
     empty_guid_list = get_guids_from_run_spec(conn=conn,
                                               experiment_name='nosuchexp')
     assert empty_guid_list == []
+
+
+@pytest.mark.parametrize('max_workers', [None, 1, 3])
+def test_load_many(experiment, some_interdeps, max_workers):
+    datasets = []
+    for i in range(5):
+        ds = DataSet()
+        ds.set_interdependencies(some_interdeps[1])
+        ds.mark_started()
+        ds.add_results([{'ps1': i, 'ps2': 2 * i}, {'ps1': i + 1,
+                                                    'ps2': 3 * i}])
+        ds.mark_completed()
+        datasets.append(ds)
+    run_ids = [ds.run_id for ds in reversed(datasets)]
+
+    data = load_many(run_ids, max_workers=max_workers)
+    assert list(data) == run_ids
+    for ds in datasets:
+        expected = ds.get_parameter_data()
+        assert data[ds.run_id].keys() == expected.keys()
+        for name, tree in expected.items():
+            for param_name, values in tree.items():
+                np.testing.assert_array_equal(data[ds.run_id][name][param_name],
+                                              values)
+
+    data = load_many(run_ids[:2], 'ps2', conn=experiment.conn)
+    assert [list(tree) for tree in data.values()] == [['ps2']] * 2
+    np.testing.assert_array_equal(data[run_ids[0]]['ps2']['ps2'], [8, 12])
+
+
+def test_load_many_missing_run_raises(experiment):
+    with pytest.raises(ValueError, match='does not exist'):
+        load_many([1000])
+
+
+def test_load_many_from_in_memory_database(some_interdeps):
+    conn = connect(':memory:')
+    exp = new_experiment('test-experiment', 'test-sample', conn=conn)
+    ds = DataSet(conn=conn, exp_id=exp.exp_id)
+    ds.set_interdependencies(some_interdeps[1])
+    ds.mark_started()
+    ds.add_results([{'ps1': 1, 'ps2': 2}])
+    data = load_many([ds.run_id], conn=conn)
+    np.testing.assert_array_equal(data[ds.run_id]['ps2']['ps1'], [1])
+    conn.close()
@@ -345,3 +345,26 @@ def test_not_eq_non_paramspec():
                    depends_on=['a', 'b'])
     p2 = 1
     assert p1 != p2
+
+
+def test_paramspecbase_codec():
+    ps = ParamSpecBase('spectrum', 'array', codec='shuffle+zlib')
+    assert ps.codec == 'shuffle+zlib'
+    assert ps != ParamSpecBase('spectrum', 'array')
+    assert "codec='shuffle+zlib'" in repr(ps)
+
+    ser = ps._to_dict()
+    assert ser['codec'] == 'shuffle+zlib'
+    assert ParamSpecBase._from_dict(ser) == ps
+    # parameters without codec are serialized as before
+    assert 'codec' not in ParamSpecBase('spectrum', 'array')._to_dict()
+
+    with pytest.raises(ValueError, match='Only parameters of type array'):
+        ParamSpecBase('x', 'numeric', codec='zlib')
+    with pytest.raises(ValueError, match='must end with one of the '
+                                         'compressors'):
+        ParamSpecBase('spectrum', 'array', codec='zlib+shuffle')
+    with pytest.raises(ValueError, match="Unknown filter 'sort'"):
+        ParamSpecBase('spectrum', 'array', codec='sort+zlib')
+    with pytest.raises(ValueError, match='only be applied once'):
+        ParamSpecBase('spectrum', 'array', codec='delta+delta+lzma')
@@ -0,0 +1,173 @@
+import os
+
+import numpy as np
+import pytest
+from numpy.testing import assert_array_equal
+
+import qcodes
+from qcodes.dataset.catalogue import run_catalogue
+from qcodes.dataset.data_set import (DataSet, load_by_id, load_many,
+                                     new_data_set)
+from qcodes.dataset.database_extract_runs import extract_runs_into_db
+from qcodes.dataset.descriptions.param_spec import ParamSpec
+from qcodes.dataset.experiment_container import new_experiment
+from qcodes.dataset.measurements import Measurement
+from qcodes.dataset.sqlite import queries
+from qcodes.dataset.sqlite.database import connect
+from qcodes.dataset.sqlite.result_shards import (_MAX_ATTACHED_SHARDS,
+                                                 get_result_shard,
+                                                 result_shard_directory)
+from qcodes.tests.common import reset_config_on_exit
+
+
+@pytest.fixture
+def sharded_experiment(experiment):
+    with reset_config_on_exit():
+        qcodes.config.dataset.result_shards = True
+        yield experiment
+
+
+def _measure(exp, n_runs, write_in_background=False):
+    meas = Measurement(exp)
+    meas.register_custom_parameter('x')
+    meas.register_custom_parameter('y', setpoints=('x',))
+    datasets = []
+    for i in range(n_runs):
+        with meas.run(write_in_background=write_in_background) as datasaver:
+            for x in range(i + 3):
+                datasaver.add_result(('x', x), ('y', x + 10 * i))
+        datasets.append(datasaver.dataset)
+    return datasets
+
+
+def _table_names(conn):
+    return {row[0] for row in conn.execute(
+        "SELECT name FROM main.sqlite_master WHERE type='table'")}
+
+
+@pytest.mark.parametrize('write_in_background', [False, True])
+def test_results_of_sharded_runs_are_in_shards(sharded_experiment,
+                                               write_in_background):
+    datasets = _measure(sharded_experiment, 3, write_in_background)
+    path_to_db = sharded_experiment.path_to_db
+    shard_dir = result_shard_directory(path_to_db)
+
+    for ds in datasets:
+        shard = get_result_shard(sharded_experiment.conn, ds.run_id)
+        assert shard is not None
+        assert os.path.isfile(os.path.join(os.path.dirname(path_to_db),
+                                           shard))
+        assert os.path.dirname(os.path.join(os.path.dirname(path_to_db),
+                                            shard)) == shard_dir
+        assert ds.table_name not in _table_names(sharded_experiment.conn)
+
+    for i, ds in enumerate(datasets):
+        loaded_ds = load_by_id(ds.run_id)
+        assert loaded_ds.the_same_dataset_as(ds)
+        assert len(loaded_ds) == i + 3
+        data = loaded_ds.get_parameter_data()['y']
+        assert_array_equal(data['x'], np.arange(i + 3))
+        assert_array_equal(data['y'], np.arange(i + 3) + 10 * i)
+
+    assert [record.length for record in run_catalogue()] == [3, 4, 5]
+    assert {run_id: data['y']['y'].tolist() for run_id, data in
+            load_many([ds.run_id for ds in datasets]).items()} == {
+        ds.run_id: (np.arange(i + 3) + 10 * i).tolist()
+        for i, ds in enumerate(datasets)}
+
+
+def test_background_writer_detaches_shards(sharded_experiment):
+    n_runs = _MAX_ATTACHED_SHARDS + 3
+    meas = Measurement(sharded_experiment)
+    meas.register_custom_parameter('x')
+    meas.register_custom_parameter('y', setpoints=('x',))
+
+    runners = [meas.run(write_in_background=True) for _ in range(n_runs)]
+    datasavers = [runner.__enter__() for runner in runners]
+    try:
+        for x in range(3):
+            for i, datasaver in enumerate(datasavers):
+                datasaver.add_result(('x', x), ('y', x + 10 * i))
+                datasaver.flush_data_to_database(block=True)
+    finally:
+        for runner in reversed(runners):
+            runner.__exit__(None, None, None)
+
+    for i, datasaver in enumerate(datasavers):
+        data = load_by_id(datasaver.run_id).get_parameter_data()['y']
+        assert_array_equal(data['y'], np.arange(3) + 10 * i)
+
+
+def test_subscribe_to_sharded_run(sharded_experiment):
+    ds = new_data_set('subscribed', specs=[ParamSpec('a', 'numeric')])
+    assert ds._result_shard is not None
+    results = []
+    ds.mark_started()
+    ds.subscribe(lambda new_results, length, state: results.extend(
+        new_results), min_wait=0, min_count=1)
+    ds.add_results([{'a': 1.0}, {'a': 2.0}])
+    ds.mark_completed()
+    ds.unsubscribe_all()
+    assert results == [(1.0,), (2.0,)]
+
+
+def test_toggle_debug_of_sharded_run(sharded_experiment):
+    ds, = _measure(sharded_experiment, 1)
+    ds.toggle_debug()
+    ds.toggle_debug()
+    assert len(ds) == 3
+
+
+def test_failed_creation_of_sharded_run_removes_shard(sharded_experiment,
+                                                     monkeypatch):
+    shard_dir = result_shard_directory(sharded_experiment.path_to_db)
+    failed_shards = []
+
+    def failing_create_run_table(*args, **kwargs):
+        failed_shards.extend(os.listdir(shard_dir))
+        raise RuntimeError('failed to create the results table')
+
+    monkeypatch.setattr(queries, '_create_run_table',
+                        failing_create_run_table)
+    with pytest.raises(RuntimeError, match='Rolling back'):
+        new_data_set('failed', specs=[ParamSpec('a', 'numeric')])
+    assert len(failed_shards) == 1
+    assert os.listdir(shard_dir) == []
+    monkeypatch.undo()
+
+    # the run id of the failed run is reused, but not its shard
+    ds = new_data_set('created', specs=[ParamSpec('a', 'numeric')])
+    assert ds.run_id == 1
+    shard = os.path.basename(get_result_shard(ds.conn, ds.run_id))
+    assert shard != failed_shards[0]
+    assert shard in os.listdir(shard_dir)
+    assert failed_shards[0] not in os.listdir(shard_dir)
+
+
+def test_run_in_memory_database_is_not_sharded():
+    with reset_config_on_exit():
+        qcodes.config.dataset.result_shards = True
+        conn = connect(':memory:')
+        new_experiment('exp', 'sample', conn=conn)
+        ds = DataSet(conn=conn, specs=[ParamSpec('a', 'numeric')])
+        assert ds._result_shard is None
+        assert ds.conn is conn
+
+
+def test_extract_sharded_runs(sharded_experiment, tmp_path):
+    datasets = _measure(sharded_experiment, 3)
+    target_path = str(tmp_path / 'target.db')
+
+    extract_runs_into_db(sharded_experiment.path_to_db, target_path,
+                         *[ds.run_id for ds in datasets])
+
+    target_conn = connect(target_path)
+    for ds in datasets:
+        target_ds = load_by_id(ds.run_id, conn=target_conn)
+        assert target_ds._result_shard is None
+        assert target_ds.the_same_dataset_as(ds)
+        source_data = ds.get_parameter_data()['y']
+        target_data = target_ds.get_parameter_data()['y']
+        for name, values in source_data.items():
+            assert_array_equal(values, target_data[name])
+    target_conn.close()
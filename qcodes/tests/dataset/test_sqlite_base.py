@@ -12,7 +12,7 @@ import unicodedata
 import numpy as np
 from unittest.mock import patch
 
-from qcodes.dataset.descriptions.param_spec import ParamSpec
+from qcodes.dataset.descriptions.param_spec import ParamSpec, ParamSpecBase
 from qcodes.dataset.descriptions.rundescriber import RunDescriber
 from qcodes.dataset.descriptions.dependencies import InterDependencies_
 import qcodes.dataset.descriptions.versioning.serialization as serial
@@ -93,6 +93,157 @@ def test_insert_many_values_raises(experiment):
                                     values=[[1], [1, 3]])
 
 
+def test_insert_many_columns_raises(experiment):
+    conn = experiment.conn
+
+    with pytest.raises(ValueError):
+        mut_help.insert_many_columns(conn, 'some_string',
+                                     ['column1', 'column2'],
+                                     values=[np.array([1]),
+                                             np.array([1, 3])])
+
+
+@pytest.mark.parametrize('strategy', mut_help.INSERT_STRATEGIES)
+def test_insert_many_columns_matches_insert_many_values(experiment, strategy):
+    conn = experiment.conn
+    mut_conn.atomic_transaction(
+        conn, 'CREATE TABLE "rows" (id INTEGER PRIMARY KEY, '
+              'x numeric, y numeric, z complex, t text)')
+    mut_conn.atomic_transaction(
+        conn, 'CREATE TABLE "columns" (id INTEGER PRIMARY KEY, '
+              'x numeric, y numeric, z complex, t text)')
+
+    x = np.arange(10)
+    y = np.linspace(0, 1, 10)
+    y[3] = np.nan
+    z = y + 1j*x
+    t = np.array([str(val) for val in x])
+    names = ['x', 'y', 'z', 't']
+
+    last_id = mut_help.insert_many_values(
+        conn, 'rows', names, [list(row) for row in zip(x, y, z, t)],
+        strategy=strategy)
+    assert last_id == 10
+    last_id = mut_help.insert_many_columns(
+        conn, 'columns', names, [x, y, z, t], strategy=strategy)
+    assert last_id == 10
+    last_id = mut_help.insert_many_columns(
+        conn, 'columns', names, [x, y, z, t], strategy=strategy)
+    assert last_id == 20
+
+    rows = mut_conn.atomic_transaction(
+        conn, 'SELECT x, y, z, t FROM "rows"').fetchall()
+    columns = mut_conn.atomic_transaction(
+        conn, 'SELECT x, y, z, t FROM "columns"').fetchall()
+
+    assert len(columns) == 20
+    for name in names:
+        np.testing.assert_array_equal([row[name] for row in rows],
+                                      [row[name] for row in columns[:10]])
+    assert np.isnan(columns[3]['y'])
+
+
+@pytest.mark.parametrize('strategy', mut_help.INSERT_STRATEGIES)
+def test_insert_many_returns_last_id_of_first_chunk(experiment, monkeypatch,
+                                                    strategy):
+    monkeypatch.setattr(mut_help, '_rows_per_transaction',
+                        lambda no_of_columns: 3)
+    conn = experiment.conn
+    mut_conn.atomic_transaction(
+        conn, 'CREATE TABLE "rows" (id INTEGER PRIMARY KEY, x numeric)')
+    x = np.arange(10)
+
+    assert mut_help.insert_many_values(
+        conn, 'rows', ['x'], [[val] for val in x], strategy=strategy) == 3
+    assert mut_help.insert_many_columns(
+        conn, 'rows', ['x'], [x], strategy=strategy) == 13
+    assert [row['x'] for row in mut_conn.atomic_transaction(
+        conn, 'SELECT x FROM "rows"').fetchall()] == 2 * list(range(10))
+
+
+@pytest.mark.parametrize('array', [np.linspace(0, 1, 11),
+                                   np.arange(12, dtype=np.int32).reshape(3, 4),
+                                   np.arange(12).reshape(3, 4).T,
+                                   np.arange(3, dtype='>i8'),
+                                   np.array(['a', 'bc']),
+                                   np.array([1 + 1j, 2 - 1j]),
+                                   np.zeros((0, 2)),
+                                   np.array(1.5)])
+def test_array_adapter_roundtrip(array):
+    blob = bytes(mut_db._adapt_array(array))
+    assert blob.startswith(mut_db._ARRAY_MAGIC)
+
+    converted = mut_db._convert_array(blob)
+    assert converted.dtype == array.dtype
+    assert converted.shape == array.shape
+    np.testing.assert_array_equal(converted, array)
+
+
+@pytest.mark.parametrize('codec', ['zlib', 'lzma', 'shuffle+zlib',
+                                   'delta+shuffle+zlib', 'shuffle+delta+lzma'])
+@pytest.mark.parametrize('array', [np.linspace(0, 1, 101),
+                                   np.arange(12, dtype=np.int16).reshape(3, 4),
+                                   np.arange(3, dtype='>i8')[::-1],
+                                   np.array(['a', 'bc']),
+                                   np.array([1 + 1j, 2 - 1j]),
+                                   np.array([np.nan, np.inf, -0.0]),
+                                   np.zeros((0, 2))])
+def test_array_adapter_codec_roundtrip(array, codec):
+    blob = bytes(mut_db._adapt_array(array, codec))
+    assert blob.startswith(mut_db._ARRAY_MAGIC)
+
+    converted = mut_db._convert_array(blob)
+    assert converted.dtype == array.dtype
+    assert converted.shape == array.shape
+    np.testing.assert_array_equal(converted, array)
+
+
+def test_array_adapter_codec_compresses():
+    array = np.round(1000 * np.sin(np.linspace(0, 10, 10000)))
+
+    raw_size = len(mut_db._adapt_array(array))
+    for codec in ('zlib', 'shuffle+zlib', 'delta+shuffle+lzma'):
+        assert len(mut_db._adapt_array(array, codec)) < raw_size / 2
+
+
+@pytest.mark.parametrize('codec', [None, 'shuffle+zlib'])
+def test_array_converter_returns_writable_arrays(codec):
+    array = np.arange(12, dtype=np.int32).reshape(3, 4)
+    blob = bytes(mut_db._adapt_array(array, codec))
+
+    converted = mut_db._convert_array(blob)
+    assert converted.flags.writeable
+    converted += 1
+    np.testing.assert_array_equal(converted, array + 1)
+    np.testing.assert_array_equal(mut_db._convert_array(blob), array)
+
+
+def test_array_converter_reads_npy_blobs():
+    array = np.linspace(0, 1, 11)
+    npy_blob = mut_db._encode_array_npy(array)
+    assert not npy_blob.startswith(mut_db._ARRAY_MAGIC)
+
+    np.testing.assert_array_equal(mut_db._convert_array(npy_blob), array)
+    assert mut_db._convert_complex(
+        mut_db._encode_array_npy(np.array([1 + 2j]))) == 1 + 2j
+
+
+def test_array_converter_raises_on_unknown_version():
+    blob = bytearray(mut_db._adapt_array(np.arange(3)))
+    blob[len(mut_db._ARRAY_MAGIC)] = mut_db._ARRAY_FORMAT_VERSION + 1
+
+    with pytest.raises(ValueError, match='Unknown array format version'):
+        mut_db._convert_array(bytes(blob))
+
+
+def test_insert_many_values_unknown_strategy_raises(experiment):
+    conn = experiment.conn
+
+    with pytest.raises(ValueError, match='Unknown insert strategy'):
+        mut_help.insert_many_values(conn, 'some_string', ['column1'],
+                                    values=[[1]], strategy='unknown')
+
+
 def test_get_metadata_raises(experiment):
     with pytest.raises(RuntimeError) as excinfo:
         mut_queries.get_metadata(experiment.conn, 'something', 'results')
@@ -244,6 +395,217 @@ def test_get_parameter_data(scalar_dataset):
                      expected_shapes, expected_values)
 
 
+def test_get_parameter_data_typed_columns(dataset):
+    x = ParamSpecBase('x', 'numeric')
+    label = ParamSpecBase('label', 'text')
+    y = ParamSpecBase('y', 'numeric')
+    z = ParamSpecBase('z', 'complex')
+    w = ParamSpecBase('w', 'numeric')
+    idps = InterDependencies_(dependencies={y: (x, label), z: (x,),
+                                            w: (x,)})
+    dataset.set_interdependencies(idps)
+    dataset.mark_started()
+    dataset.add_results([{'x': 0, 'label': 'a', 'y': 1.5},
+                         {'x': 1, 'label': 'bc', 'y': np.nan},
+                         {'x': 2, 'y': np.inf},
+                         {'x': 3, 'z': 1 + 2j},
+                         {'x': 4, 'z': np.complex64(3j)},
+                         {'x': 5, 'w': 1},
+                         {'x': 6, 'w': 'not a number'}])
+    dataset.mark_completed()
+    interdeps = dataset.description.interdeps
+
+    def typed_columns(name, start=None, end=None):
+        return mut_queries._get_typed_columns_for_one_param_tree(
+            dataset.conn, dataset.table_name, interdeps, name, start, end)
+
+    columns, n_rows = typed_columns('y')
+    assert n_rows == 3
+    np.testing.assert_array_equal(columns['y'], [1.5, np.nan, np.inf])
+    np.testing.assert_array_equal(columns['x'], [0, 1, 2])
+    assert columns['x'].dtype == np.float64
+    assert columns['label'].tolist() == ['a', 'bc', None]
+
+    columns, n_rows = typed_columns('z')
+    np.testing.assert_array_equal(columns['z'], [1 + 2j, 3j])
+    assert columns['z'].dtype == np.complex128
+    columns, n_rows = typed_columns('z', start=2, end=2)
+    assert n_rows == 1
+    np.testing.assert_array_equal(columns['z'], [3j])
+    assert typed_columns('z', start=3) == ({}, 0)
+
+    # the text stored for the numeric parameter can not be converted to
+    # float so the values are converted like the sqlite converter would
+    columns, n_rows = typed_columns('w')
+    assert columns['w'].dtype == object
+    assert columns['w'].tolist() == [1, 'not a number']
+    data = mut_queries.get_parameter_data(dataset.conn, dataset.table_name,
+                                          ['w'])
+    assert data['w']['w'].tolist() == [1, 'not a number']
+
+
+def test_get_parameter_data_expands_scalars_of_array_trees(dataset):
+    x = ParamSpecBase('x', 'numeric')
+    label = ParamSpecBase('label', 'text')
+    phase = ParamSpecBase('phase', 'complex')
+    image = ParamSpecBase('image', 'array')
+    spectrum = ParamSpecBase('spectrum', 'array')
+    idps = InterDependencies_(dependencies={image: (x, label, phase),
+                                            spectrum: (x, label)})
+    dataset.set_interdependencies(idps)
+    dataset.mark_started()
+    dataset.add_results([
+        {'x': 0.1, 'label': 'a', 'phase': 1j, 'image': np.ones((2, 3))},
+        {'x': 2, 'label': 'bcd', 'phase': 2 + 1j, 'image': np.zeros((2, 3))},
+        {'x': 3, 'label': 'e', 'spectrum': np.arange(2)},
+        {'x': 4, 'label': 'fg', 'spectrum': np.arange(3)}])
+    dataset.mark_completed()
+
+    data = mut_queries.get_parameter_data(dataset.conn, dataset.table_name)
+
+    # the scalars are expanded to contiguous arrays of the shape of the
+    # array values
+    image_data = data['image']
+    assert image_data['image'].shape == (2, 2, 3)
+    for name, dtype in (('x', np.float64), ('label', np.dtype('<U3')),
+                        ('phase', np.complex128)):
+        assert image_data[name].shape == (2, 2, 3)
+        assert image_data[name].dtype == dtype
+        assert image_data[name].flags.c_contiguous
+    np.testing.assert_array_equal(image_data['x'][0], np.full((2, 3), 0.1))
+    np.testing.assert_array_equal(image_data['x'][1], np.full((2, 3), 2))
+    np.testing.assert_array_equal(image_data['label'][1],
+                                  np.full((2, 3), 'bcd'))
+    np.testing.assert_array_equal(image_data['phase'][1],
+                                  np.full((2, 3), 2 + 1j))
+
+    # the values of arrays of different shapes are expanded row by row
+    spectrum_data = data['spectrum']
+    assert spectrum_data['x'].dtype == object
+    np.testing.assert_array_equal(spectrum_data['x'][0], [3, 3])
+    np.testing.assert_array_equal(spectrum_data['x'][1], [4, 4, 4])
+    np.testing.assert_array_equal(spectrum_data['label'][1],
+                                  ['fg', 'fg', 'fg'])
+
+
+@pytest.mark.parametrize('window_functions', [True, False])
+@pytest.mark.parametrize('with_index', [True, False])
+def test_get_parameter_data_ranges_and_stride(dataset, window_functions,
+                                              with_index):
+    x = ParamSpecBase('x', 'numeric')
+    y = ParamSpecBase('y', 'numeric')
+    z = ParamSpecBase('z', 'numeric')
+    spectrum = ParamSpecBase('spectrum', 'array')
+    idps = InterDependencies_(dependencies={z: (x, y), spectrum: (x,)})
+    dataset.set_interdependencies(idps)
+    dataset.mark_started()
+    # x is stored in descending order such that the order of the rows of a
+    # query using an index on x differs from the order of insertion
+    results = [{'x': x_val, 'y': y_val, 'z': 10 * x_val + y_val}
+               for x_val in range(9, -1, -1) for y_val in range(3)]
+    results += [{'x': x_val, 'spectrum': np.full(2, x_val)}
+                for x_val in range(5)]
+    dataset.add_results(results)
+    dataset.mark_completed()
+    if with_index:
+        mut_queries.create_index_on_parameters(dataset.conn,
+                                               dataset.table_name, 'x')
+        # creating it again is a no-op
+        mut_queries.create_index_on_parameters(dataset.conn,
+                                               dataset.table_name, 'x')
+
+    def get_data(name, **kwargs):
+        with patch.object(mut_queries, '_WINDOW_FUNCTIONS_SUPPORTED',
+                          window_functions):
+            return mut_queries.get_parameter_data(
+                dataset.conn, dataset.table_name, [name], **kwargs)[name]
+
+    data = get_data('z', ranges={'x': (2, 4)})
+    assert data['x'].tolist() == [4, 4, 4, 3, 3, 3, 2, 2, 2]
+    assert data['y'].tolist() == [0, 1, 2] * 3
+    assert data['z'].tolist() == [40, 41, 42, 30, 31, 32, 20, 21, 22]
+
+    data = get_data('z', ranges={'x': (None, 1), 'y': (1, None)})
+    assert data['z'].tolist() == [11, 12, 1, 2]
+
+    data = get_data('z', stride=4)
+    assert data['z'].tolist() == [90, 81, 72, 50, 41, 32, 10, 1]
+
+    # start and end count the rows within the ranges and the stride is
+    # applied to the rows between start and end
+    data = get_data('z', ranges={'x': (2, 4)}, start=2, end=8, stride=3)
+    assert data['z'].tolist() == [41, 31, 21]
+
+    # the rows within ranges of the inner setpoint are not consecutive
+    data = get_data('z', ranges={'y': (1, 2)}, stride=2)
+    assert data['z'].tolist() == [91, 81, 71, 61, 51, 41, 31, 21, 11, 1]
+    data = get_data('z', ranges={'y': (1, 2)}, start=4, stride=5)
+    assert data['z'].tolist() == [82, 51, 32, 1]
+
+    # ranges of parameters outside of the tree are ignored
+    data = get_data('spectrum', ranges={'x': (3, None), 'y': (0, 0)})
+    assert data['x'].tolist() == [[3, 3], [4, 4]]
+    assert data['spectrum'].tolist() == [[3, 3], [4, 4]]
+    data = get_data('spectrum', stride=2)
+    assert data['spectrum'].tolist() == [[0, 0], [2, 2], [4, 4]]
+
+    assert get_data('z', ranges={'x': (20, 30)}) == {}
+
+
+@pytest.mark.parametrize('with_index', [True, False])
+def test_get_parameter_data_ranges_exclude_nan(dataset, with_index):
+    x = ParamSpecBase('x', 'numeric')
+    y = ParamSpecBase('y', 'numeric')
+    idps = InterDependencies_(dependencies={y: (x,)})
+    dataset.set_interdependencies(idps)
+    dataset.mark_started()
+    dataset.add_results([{'x': x_val, 'y': y_val} for x_val, y_val in
+                         ((0.0, 1.0), (np.nan, 2.0), (2.0, 3.0),
+                          (3.0, np.nan))])
+    dataset.mark_completed()
+    if with_index:
+        mut_queries.create_index_on_parameters(dataset.conn,
+                                               dataset.table_name, 'x')
+
+    def get_data(**kwargs):
+        return mut_queries.get_parameter_data(
+            dataset.conn, dataset.table_name, ['y'], **kwargs)['y']
+
+    assert get_data(ranges={'x': (1, None)})['x'].tolist() == [2.0, 3.0]
+    assert get_data(ranges={'x': (None, 2)})['y'].tolist() == [1.0, 3.0]
+    assert get_data(ranges={'y': (2.5, None)})['x'].tolist() == [2.0]
+    # without ranges, NaN is returned as usual
+    assert np.isnan(get_data()['x'][1])
+
+
+@pytest.mark.parametrize('stride', [0, -1, 1.5])
+def test_get_parameter_data_invalid_stride_raises(scalar_dataset, stride):
+    with pytest.raises(ValueError, match='Invalid stride'):
+        mut_queries.get_parameter_data(scalar_dataset.conn,
+                                       scalar_dataset.table_name,
+                                       stride=stride)
+
+
+def test_create_index_on_parameters(dataset):
+    x = ParamSpecBase('x', 'numeric')
+    y = ParamSpecBase('y', 'numeric')
+    dataset.set_interdependencies(InterDependencies_(dependencies={y: (x,)}))
+    dataset.mark_started()
+
+    mut_queries.create_index_on_parameters(dataset.conn, dataset.table_name,
+                                           'x', 'y')
+    sql = ("SELECT name FROM sqlite_master WHERE type='index' "
+           "AND tbl_name=?")
+    indices = mut_help.many_many(
+        mut_conn.atomic_transaction(dataset.conn, sql, dataset.table_name),
+        'name')
+    assert indices == [[f'IX_{dataset.table_name}_x_y']]
+
+    with pytest.raises(ValueError, match='At least one parameter'):
+        mut_queries.create_index_on_parameters(dataset.conn,
+                                               dataset.table_name)
+
+
 def test_get_parameter_data_independent_parameters(
         standalone_parameters_dataset):
     ds = standalone_parameters_dataset
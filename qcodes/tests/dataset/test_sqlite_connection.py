@@ -5,8 +5,9 @@ import pytest
 
 from qcodes.dataset.sqlite.connection import ConnectionPlus, \
     make_connection_plus_from, atomic, atomic_transaction
-from qcodes.dataset.sqlite.database import connect
-from qcodes.tests.common import error_caused_by
+import qcodes
+from qcodes.dataset.sqlite.database import connect, connect_read_only
+from qcodes.tests.common import error_caused_by, reset_config_on_exit
 
 
 def sqlite_conn_in_transaction(conn: sqlite3.Connection):
@@ -330,3 +331,77 @@ def test_connect():
     assert False is conn.atomic_in_progress
 
     assert sqlite3.Row is conn.row_factory
+
+
+def test_connect_read_only(tmp_path):
+    dbfile = str(tmp_path / 'temp.db')
+    connect(dbfile).close()
+
+    conn = connect_read_only(dbfile)
+    assert isinstance(conn, ConnectionPlus)
+    assert sqlite3.Row is conn.row_factory
+    assert conn.path_to_dbfile == dbfile
+    assert conn.execute('SELECT COUNT(*) FROM runs').fetchone()[0] == 0
+    with pytest.raises(sqlite3.OperationalError, match='readonly'):
+        conn.execute('CREATE TABLE smth (name TEXT)')
+    conn.close()
+
+
+def test_connect_read_only_to_old_database_raises(tmp_path):
+    dbfile = str(tmp_path / 'temp.db')
+    connect(dbfile, version=0).close()
+
+    with pytest.raises(RuntimeError, match='is version 0'):
+        connect_read_only(dbfile)
+
+
+def _pragmas(conn, names):
+    return {name: conn.execute(f'PRAGMA {name}').fetchone()[0]
+            for name in names}
+
+
+def test_connect_applies_pragma_profile(tmp_path):
+    default_conn = connect(str(tmp_path / 'default.db'))
+    assert _pragmas(default_conn, ['synchronous', 'page_size']) == {
+        'synchronous': 2, 'page_size': 4096}
+
+    conn = connect(str(tmp_path / 'acquisition.db'), profile='acquisition')
+    assert _pragmas(conn, ['synchronous', 'cache_size', 'temp_store',
+                           'wal_autocheckpoint']) == {
+        'synchronous': 1, 'cache_size': -65536, 'temp_store': 2,
+        'wal_autocheckpoint': 10000}
+
+    # the page size is only set on new databases
+    conn = connect(str(tmp_path / 'archive.db'), profile='archive')
+    assert _pragmas(conn, ['page_size', 'synchronous']) == {
+        'page_size': 65536, 'synchronous': 2}
+    conn = connect(str(tmp_path / 'default.db'), profile='archive')
+    assert _pragmas(conn, ['page_size']) == {'page_size': 4096}
+
+
+def test_connect_uses_pragma_profile_from_config(tmp_path):
+    dbfile = str(tmp_path / 'temp.db')
+    with reset_config_on_exit():
+        qcodes.config.dataset.sqlite_profiles['custom'] = {
+            'mmap_size': 2**20, 'synchronous': 'off'}
+        qcodes.config.dataset.sqlite_profile = 'custom'
+        conn = connect(dbfile)
+        assert _pragmas(conn, ['mmap_size', 'synchronous']) == {
+            'mmap_size': 2**20, 'synchronous': 0}
+        conn = connect_read_only(dbfile)
+        assert _pragmas(conn, ['mmap_size', 'synchronous']) == {
+            'mmap_size': 2**20, 'synchronous': 0}
+
+
+@pytest.mark.parametrize('profile, match', [
+    ({'journal_mode': 'OFF'}, 'Invalid pragma journal_mode'),
+    ({'synchronous': 'SOMETIMES'}, "Invalid value 'SOMETIMES'"),
+    ({'cache_size': '1; DROP TABLE runs'}, 'Invalid value'),
+])
+def test_connect_with_invalid_pragma_profile_raises(profile, match):
+    with reset_config_on_exit():
+        qcodes.config.dataset.sqlite_profiles['invalid'] = profile
+        with pytest.raises(RuntimeError, match=match):
+            connect(':memory:', profile='invalid')
+    with pytest.raises(RuntimeError, match='Invalid sqlite profile'):
+        connect(':memory:', profile='not_a_profile')
@@ -15,7 +15,8 @@ extras = {
     'QtPlot': ('pyqtgraph', '0.11.0'),
     'coverage tests': ('coverage', '4.0'),
     'Slack': ('slacker', '0.9.42'),
-    'ZurichInstruments': ('zhinst-qcodes', '0.1.1')
+    'ZurichInstruments': ('zhinst-qcodes', '0.1.1'),
+    'xarray': ('xarray', '0.16.0')
 }
 extras_require = {k: '>='.join(v) for k, v in extras.items()}
 